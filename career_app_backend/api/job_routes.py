@@ -0,0 +1,35 @@
+from flask import Blueprint, request, jsonify
+from config.settings import Config
+from api.resume_routes import job_registry, resume_service
+
+# Create blueprint
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+@jobs_bp.route('', methods=['POST'])
+def register_job_description():
+    """Store a job description and precompute its keywords and requirements"""
+    try:
+        data = request.get_json()
+        
+        if not data or not str(data.get('description', '')).strip():
+            return jsonify({"error": "Job description is required"}), 400
+        
+        extract_requirements = bool(data.get('extract_requirements', Config.JOB_REQUIREMENTS_EXTRACTION))
+        job = job_registry.register(
+            description=str(data['description']),
+            title=str(data.get('title', '')).strip(),
+            extract_requirements=extract_requirements and resume_service.transport is not None
+        )
+        
+        return jsonify(job), 201 if job["created"] else 200
+        
+    except Exception as e:
+        return jsonify({"error": f"Job registration failed: {str(e)}"}), 500
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+def get_job_description(job_id):
+    """Get a registered job description with its precomputed analysis"""
+    job = job_registry.get(job_id, count_use=False)
+    if job is None:
+        return jsonify({"error": "Job description not found"}), 404
+    return jsonify(job), 200
@@ -1,16 +1,100 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from werkzeug.utils import secure_filename
+from config.settings import Config
+from src.services.analysis_history import AnalysisHistory
 from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+from src.services.job_queue import AnalysisJobQueue
+from src.services.job_registry import JobDescriptionRegistry
+from src.utils import metrics
+from src.utils.extraction_cache import ExtractionCache
+from src.utils.extraction_sandbox import ExtractionError
 from src.utils.file_handler import FileHandler
+from src.utils.text_normalizer import TextNormalizer
 from src.utils.validators import validate_file
+from contextlib import ExitStack
+import json
 import os
 
 # Create blueprint
 resume_bp = Blueprint('resume', __name__, url_prefix='/api/resume')
 
 # Initialize services
-resume_service = AutoGenResumeAnalysisService()
-file_handler = FileHandler()
+resume_service = AutoGenResumeAnalysisService(
+    history=AnalysisHistory(
+        db_path=Config.ANALYSIS_HISTORY_DB_PATH,
+        retention_seconds=Config.ANALYSIS_HISTORY_RETENTION_SECONDS
+    )
+)
+text_normalizer = TextNormalizer(
+    max_tokens=Config.MAX_RESUME_TOKENS,
+    repeated_line_threshold=Config.REPEATED_LINE_THRESHOLD
+)
+# Re-uploads of the same PDF skip extraction and normalization
+file_handler = FileHandler(
+    cache=ExtractionCache(
+        max_entries=Config.PDF_TEXT_CACHE_MAX_ENTRIES,
+        db_path=Config.PDF_TEXT_CACHE_DB_PATH,
+        max_disk_entries=Config.PDF_TEXT_CACHE_MAX_DISK_ENTRIES
+    ),
+    normalizer=text_normalizer
+)
+
+job_registry = JobDescriptionRegistry(
+    db_path=Config.JOB_REGISTRY_DB_PATH,
+    keyword_extractor=resume_service.rule_based_service._extract_keywords_from_text,
+    requirement_extractor=resume_service.extract_job_requirements,
+    normalizer=text_normalizer
+)
+# Agents are prompted with the compact text of registered job descriptions
+resume_service.use_job_registry(job_registry)
+
+def _resolve_job_description(source) -> tuple:
+    """Return (job_description, error response) from a registered `job_id` or a raw `job_description`"""
+    job_id = (source.get('job_id') or '').strip()
+    if not job_id:
+        return source.get('job_description', ''), None
+    
+    job = job_registry.get(job_id)
+    if job is None:
+        return None, (jsonify({"error": f"Job description {job_id} not found"}), 404)
+    # Rule-based scoring needs the full posting; the service swaps in the compact prompt text for the agents
+    return job["description"], None
+
+def _normalize_resume_text(resume_text: str) -> tuple:
+    """Clean extracted text and enforce the token budget; returns (text, token report)"""
+    normalized = text_normalizer.normalize(resume_text)
+    report = {key: value for key, value in normalized.items() if key != "text"}
+    print(f"🧹 Resume text normalized: {report['tokens_before']} -> {report['tokens_after']} tokens")
+    return normalized["text"], report
+
+def _extract_resume_text(source) -> tuple:
+    """Extract and normalize a PDF resume (cached by content hash); returns (text, token report)"""
+    document = file_handler.extract_document(source)
+    report = document["text_normalization"]
+    print(f"🧹 Resume text normalized: {report['tokens_before']} -> {report['tokens_after']} tokens "
+          f"({document['page_count']} pages, cache {document['cache']})")
+    return document["text"], report
+
+def _process_analysis_job(pdf_bytes: bytes, filename: str, job_description: str) -> dict:
+    """Run PDF extraction and the analysis agents for a background job"""
+    with file_handler.open_upload(pdf_bytes, filename) as source:
+        resume_text, normalization = _extract_resume_text(source)
+    analysis_result = resume_service.analyze_resume(
+        resume_text=resume_text,
+        job_description=job_description
+    )
+    analysis_result["text_normalization"] = normalization
+    return analysis_result
+
+analysis_jobs = AnalysisJobQueue(
+    db_path=Config.JOB_DB_PATH,
+    processor=_process_analysis_job,
+    max_workers=Config.JOB_MAX_WORKERS,
+    retention_seconds=Config.JOB_RETENTION_SECONDS,
+    lease_seconds=Config.JOB_LEASE_SECONDS
+)
+# The queue lives in SQLite, so any worker can report it for all of them
+metrics.register_collector(metrics.StatsCollector("analysis_queue", analysis_jobs.stats, "Analysis job queue"))
 
 @resume_bp.route('/analyze', methods=['POST'])
 def analyze_resume():
@@ -21,35 +105,209 @@ def analyze_resume():
             return jsonify({"error": "No resume file provided"}), 400
         
         file = request.files['resume']
-        job_description = request.form.get('job_description', '')
+        job_description, error_response = _resolve_job_description(request.form)
+        if error_response:
+            return error_response
         
         # Validate file
         validation_result = validate_file(file)
         if not validation_result['valid']:
             return jsonify({"error": validation_result['message']}), 400
         
-        # Save file temporarily
-        filename = secure_filename(file.filename)
-        file_path = file_handler.save_temp_file(file, filename)
+        # Extract text from PDF (in memory unless the upload is large) and compact it before prompting
+        with file_handler.open_upload(file, secure_filename(file.filename)) as source:
+            resume_text, normalization = _extract_resume_text(source)
         
+        # Analyze resume; re-submissions of a document only re-run the affected agents
+        analysis_result = resume_service.analyze_resume(
+            resume_text=resume_text,
+            job_description=job_description,
+            document_id=request.form.get('document_id', '').strip()
+        )
+        analysis_result["text_normalization"] = normalization
+        
+        return jsonify(analysis_result), 200
+            
+    except ExtractionError as e:
+        # Refused, timed-out or memory-capped PDFs; the sandbox already stopped the parser
+        return jsonify({"error": str(e)}), 422
+    except Exception as e:
+        return jsonify({"error": f"Analysis failed: {str(e)}"}), 500
+
+@resume_bp.route('/analyze/stream', methods=['POST'])
+def analyze_resume_stream():
+    """Analyze uploaded resume, streaming each section as a Server-Sent Event when ready"""
+    # Owns the upload (spilled to a temp file only if large) until the response is closed
+    upload = ExitStack()
+    try:
+        # Check if file is present
+        if 'resume' not in request.files:
+            return jsonify({"error": "No resume file provided"}), 400
+        
+        file = request.files['resume']
+        job_description, error_response = _resolve_job_description(request.form)
+        if error_response:
+            return error_response
+        
+        # Validate file
+        validation_result = validate_file(file)
+        if not validation_result['valid']:
+            return jsonify({"error": validation_result['message']}), 400
+        
+        source = upload.enter_context(file_handler.open_upload(file, secure_filename(file.filename)))
+        document_id = request.form.get('document_id', '').strip()
+        
+    except Exception as e:
+        upload.close()
+        return jsonify({"error": f"Analysis failed: {str(e)}"}), 500
+    
+    def generate():
         try:
-            # Extract text from PDF
-            resume_text = file_handler.extract_text_from_pdf(file_path)
+            # The temp file is not needed while the agents run
+            with upload:
+                resume_text, normalization = _extract_resume_text(source)
+            yield _sse_event("text_extracted", {
+                "character_count": len(resume_text),
+                "text_normalization": normalization
+            })
             
-            # Analyze resume
-            analysis_result = resume_service.analyze_resume(
+            for section, section_result in resume_service.stream_analysis(
                 resume_text=resume_text,
-                job_description=job_description
-            )
-            
-            return jsonify(analysis_result), 200
+                job_description=job_description,
+                document_id=document_id
+            ):
+                yield _sse_event(section, section_result)
+                
+        except Exception as e:
+            yield _sse_event("error", {"error": f"Analysis failed: {str(e)}"})
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    # The server closes the response even when the client disconnects before the
+    # generator first runs, so the upload is always released
+    response.call_on_close(upload.close)
+    # Disable proxy buffering so each event is flushed to the client immediately;
+    # the stream always ends after the "complete" or "error" event
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@resume_bp.route('/analyze-batch', methods=['POST'])
+def analyze_resume_batch():
+    """Score one resume (PDF upload or text) against several job descriptions and rank them"""
+    try:
+        if request.is_json:
+            data = request.get_json() or {}
+            resume_text = data.get('resume_text', '')
+            job_descriptions = data.get('job_descriptions') or []
+            job_ids = data.get('job_ids') or []
+        else:
+            resume_text = request.form.get('resume_text', '')
+            job_descriptions = request.form.getlist('job_descriptions')
+            job_ids = request.form.getlist('job_ids')
+            # A single form field may also carry a JSON array
+            if len(job_descriptions) == 1 and job_descriptions[0].lstrip().startswith('['):
+                try:
+                    job_descriptions = json.loads(job_descriptions[0])
+                except json.JSONDecodeError:
+                    job_descriptions = None
+                if not isinstance(job_descriptions, list) or \
+                        not all(isinstance(job_description, str) for job_description in job_descriptions):
+                    return jsonify({"error": "job_descriptions must be a JSON array of strings"}), 400
+        
+        # Registered job descriptions are resolved to their stored postings
+        if not isinstance(job_descriptions, list) or not isinstance(job_ids, list):
+            return jsonify({"error": "job_descriptions and job_ids must be lists"}), 400
+        for job_id in job_ids:
+            job_description, error_response = _resolve_job_description({"job_id": str(job_id)})
+            if error_response:
+                return error_response
+            job_descriptions.append(job_description)
+        
+        if not job_descriptions:
+            return jsonify({"error": "At least one job description is required"}), 400
+        job_descriptions = [str(job_description).strip() for job_description in job_descriptions]
+        if not all(job_descriptions):
+            return jsonify({"error": "Job descriptions must not be empty"}), 400
+        if len(job_descriptions) > Config.BATCH_MAX_JOB_DESCRIPTIONS:
+            return jsonify({"error": f"At most {Config.BATCH_MAX_JOB_DESCRIPTIONS} job descriptions are allowed per batch"}), 400
+        
+        if 'resume' in request.files:
+            file = request.files['resume']
             
-        finally:
-            # Clean up temporary file
-            file_handler.cleanup_temp_file(file_path)
+            # Validate file
+            validation_result = validate_file(file)
+            if not validation_result['valid']:
+                return jsonify({"error": validation_result['message']}), 400
             
+            with file_handler.open_upload(file, secure_filename(file.filename)) as source:
+                resume_text, normalization = _extract_resume_text(source)
+        else:
+            normalization = None
+        
+        if not resume_text:
+            return jsonify({"error": "A resume file or resume text is required"}), 400
+        
+        # Extract and normalize the resume once for every job description
+        if normalization is None:
+            resume_text, normalization = _normalize_resume_text(resume_text)
+        batch_result = resume_service.analyze_batch(
+            resume_text=resume_text,
+            job_descriptions=job_descriptions
+        )
+        batch_result["text_normalization"] = normalization
+        
+        return jsonify(batch_result), 200
+        
+    except ExtractionError as e:
+        return jsonify({"error": str(e)}), 422
     except Exception as e:
-        return jsonify({"error": f"Analysis failed: {str(e)}"}), 500
+        return jsonify({"error": f"Batch analysis failed: {str(e)}"}), 500
+
+@resume_bp.route('/jobs', methods=['POST'])
+def submit_analysis_job():
+    """Queue a resume analysis and return its job id immediately"""
+    try:
+        # Check if file is present
+        if 'resume' not in request.files:
+            return jsonify({"error": "No resume file provided"}), 400
+        
+        file = request.files['resume']
+        job_description, error_response = _resolve_job_description(request.form)
+        if error_response:
+            return error_response
+        
+        # Validate file
+        validation_result = validate_file(file)
+        if not validation_result['valid']:
+            return jsonify({"error": validation_result['message']}), 400
+        
+        job = analysis_jobs.submit(
+            pdf_bytes=file.read(),
+            filename=secure_filename(file.filename),
+            job_description=job_description
+        )
+        job["status_url"] = f"{resume_bp.url_prefix}/jobs/{job['job_id']}"
+        return jsonify(job), 202
+        
+    except Exception as e:
+        return jsonify({"error": f"Job submission failed: {str(e)}"}), 500
+
+@resume_bp.route('/jobs/stats', methods=['GET'])
+def get_analysis_job_stats():
+    """Get queue depth and wait/run time statistics"""
+    return jsonify(analysis_jobs.stats()), 200
+
+@resume_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_analysis_job(job_id):
+    """Get the status and, once finished, the result of an analysis job"""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 @resume_bp.route('/score', methods=['POST'])
 def get_ats_score():
@@ -60,8 +318,10 @@ def get_ats_score():
         if not data or 'resume_text' not in data:
             return jsonify({"error": "Resume text is required"}), 400
         
-        resume_text = data['resume_text']
-        job_description = data.get('job_description', '')
+        job_description, error_response = _resolve_job_description(data)
+        if error_response:
+            return error_response
+        resume_text, _ = _normalize_resume_text(data['resume_text'])
         
         # Get ATS score
         score_result = resume_service.calculate_ats_score(
@@ -83,8 +343,10 @@ def get_suggestions():
         if not data or 'resume_text' not in data:
             return jsonify({"error": "Resume text is required"}), 400
         
-        resume_text = data['resume_text']
-        job_description = data.get('job_description', '')
+        job_description, error_response = _resolve_job_description(data)
+        if error_response:
+            return error_response
+        resume_text, _ = _normalize_resume_text(data['resume_text'])
         
         # Get suggestions
         suggestions = resume_service.get_improvement_suggestions(
@@ -103,11 +365,13 @@ def extract_keywords():
     try:
         data = request.get_json()
         
-        if not data or 'job_description' not in data:
+        if not data or ('job_description' not in data and 'job_id' not in data):
             return jsonify({"error": "Job description is required"}), 400
         
-        job_description = data['job_description']
-        resume_text = data.get('resume_text', '')
+        job_description, error_response = _resolve_job_description(data)
+        if error_response:
+            return error_response
+        resume_text, _ = _normalize_resume_text(data.get('resume_text', ''))
         
         # Extract keywords
         keywords_result = resume_service.extract_keywords(
@@ -119,3 +383,20 @@ def extract_keywords():
         
     except Exception as e:
         return jsonify({"error": f"Keyword extraction failed: {str(e)}"}), 500
+
+@resume_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get analysis cache and PDF text cache hit/miss statistics"""
+    stats = resume_service.get_cache_stats()
+    stats["pdf_text"] = file_handler.cache.stats()
+    return jsonify(stats), 200
+
+@resume_bp.route('/extraction/stats', methods=['GET'])
+def get_extraction_stats():
+    """Get sandboxed PDF extraction worker timeouts and restarts"""
+    return jsonify(file_handler.sandbox.stats()), 200
+
+@resume_bp.route('/llm/stats', methods=['GET'])
+def get_llm_stats():
+    """Get circuit breaker state and structured-output failure/retry rates"""
+    return jsonify(resume_service.get_llm_stats()), 200
@@ -1,4 +1,4 @@
-from flask import Flask
+from flask import Flask, Response
 from flask_cors import CORS
 from config.settings import Config
 import os
@@ -14,9 +14,15 @@ def create_app(config_class=Config):
     # Create upload directory if it doesn't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
+    # Record per-route request latency
+    from src.utils import metrics
+    metrics.init_app(app)
+    
     # Register blueprints
     from api.resume_routes import resume_bp
     app.register_blueprint(resume_bp)
+    from api.job_routes import jobs_bp
+    app.register_blueprint(jobs_bp)
     # Note: Payment routes not needed since Razorpay is configured in frontend
     
     # Health check route
@@ -24,6 +30,12 @@ def create_app(config_class=Config):
     def health_check():
         return {"status": "healthy", "service": "Resume AI Backend"}, 200
     
+    # Prometheus scrape endpoint, aggregated across Gunicorn workers
+    @app.route('/metrics', methods=['GET'])
+    def prometheus_metrics():
+        body, content_type = metrics.render_metrics()
+        return Response(body, content_type=content_type)
+    
     return app
 
 # Create app instance for Gunicorn
@@ -0,0 +1,88 @@
+"""Compare adaptive (PyPDF2 first, pdfplumber for poor pages) and pdfplumber-only extraction.
+
+Usage:
+    python benchmarks/benchmark_adaptive_extraction.py [CORPUS_DIR] [--runs N]
+
+CORPUS_DIR should hold real resume .pdf files; without it a small generated corpus is used,
+whose pages PyPDF2 always reads well, so only a real corpus shows how often pages are
+re-extracted. Both strategies run in-process. Reports the time saved, the share of pages
+re-extracted with pdfplumber and how often the adaptive text equals the pdfplumber text,
+exactly and after collapsing whitespace.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.samples import SAMPLE_RESUME, build_pdf
+from src.utils.cache import normalize_for_key
+from src.utils.extraction_sandbox import ExtractionSandbox
+from src.utils.file_handler import FileHandler
+
+
+def load_corpus(corpus_dir):
+    """(filename, PDF bytes) for every PDF in the directory, or generated resumes of 1-4 pages"""
+    if not corpus_dir:
+        return [(f"generated_{pages}_pages.pdf", build_pdf([SAMPLE_RESUME] * pages)) for pages in range(1, 5)]
+    corpus = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.lower().endswith(".pdf"):
+            with open(os.path.join(corpus_dir, name), "rb") as f:
+                corpus.append((name, f.read()))
+    return corpus
+
+
+def timed(file_handler, pdf, runs):
+    """(document, average milliseconds) of extracting one PDF"""
+    started = time.perf_counter()
+    for _ in range(runs):
+        document = file_handler.extract_document(pdf)
+    return document, (time.perf_counter() - started) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus_dir", nargs="?")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus_dir)
+    if not corpus:
+        sys.exit("No .pdf resumes found")
+    adaptive = FileHandler(sandbox=ExtractionSandbox(processes=0), strategy="adaptive", max_pages=0)
+    layout = FileHandler(sandbox=ExtractionSandbox(processes=0), strategy="pdfplumber", max_pages=0)
+
+    print(f"{'file':<40} {'pages':>5} {'redone':>6} {'pdfplumber ms':>14} {'adaptive ms':>12}  equal")
+    totals = {"pages": 0, "redone": 0, "layout_ms": 0.0, "adaptive_ms": 0.0, "exact": 0, "normalized": 0, "files": 0}
+    for name, pdf in corpus:
+        try:
+            layout_document, layout_ms = timed(layout, pdf, args.runs)
+            adaptive_document, adaptive_ms = timed(adaptive, pdf, args.runs)
+        except Exception as e:
+            print(f"skipping {name}: {e}")
+            continue
+
+        exact = adaptive_document["text"] == layout_document["text"]
+        normalized = normalize_for_key(adaptive_document["text"]) == normalize_for_key(layout_document["text"])
+        redone = len(adaptive_document.get("reextracted_pages", []))
+        print(f"{name[:40]:<40} {adaptive_document['page_count']:>5} {redone:>6} {layout_ms:>14.1f} "
+              f"{adaptive_ms:>12.1f}  {'exact' if exact else 'whitespace' if normalized else 'no'}")
+        for key, value in (("pages", adaptive_document["page_count"]), ("redone", redone), ("layout_ms", layout_ms),
+                           ("adaptive_ms", adaptive_ms), ("exact", exact), ("normalized", normalized), ("files", 1)):
+            totals[key] += value
+
+    if not totals["files"]:
+        sys.exit("No PDF could be extracted")
+    files = totals["files"]
+    print(f"\n{files} files, {totals['pages']} pages, {totals['redone']} re-extracted with pdfplumber "
+          f"({totals['redone'] / max(totals['pages'], 1):.1%})")
+    print(f"time: {totals['layout_ms']:.0f} ms -> {totals['adaptive_ms']:.0f} ms "
+          f"({1 - totals['adaptive_ms'] / totals['layout_ms']:.1%} saved)")
+    print(f"text equal to pdfplumber: {totals['exact'] / files:.1%} exact, "
+          f"{totals['normalized'] / files:.1%} ignoring whitespace")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Compare token usage and latency of the multi-agent and combined analysis modes.
+
+Usage:
+    python benchmarks/benchmark_analysis_modes.py [resume.txt] [job_description.txt] [--runs N]
+
+Uses the configured LLM transport (OPENAI_API_KEY, or LLM_TRANSPORT=replay with
+recorded cassettes). Every run bypasses the analysis cache.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+from benchmarks.samples import SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME
+
+class UsageRecorder:
+    """Wrap an LLM transport to record token usage per call"""
+
+    def __init__(self, transport):
+        self._transport = transport
+        self._lock = threading.Lock()
+        self.calls = []
+
+    def complete(self, *args, **kwargs):
+        response = self._transport.complete(*args, **kwargs)
+        with self._lock:
+            self.calls.append({
+                "prompt_tokens": response.usage.get("prompt_tokens", 0),
+                "completion_tokens": response.usage.get("completion_tokens", 0)
+            })
+        return response
+
+    def reset(self):
+        with self._lock:
+            self.calls = []
+
+
+def run_mode(service, recorder, mode, resume_text, job_description, runs):
+    """Run the analysis `runs` times in the given mode and summarize the measurements"""
+    service.analysis_mode = mode
+    latencies, prompt_tokens, completion_tokens, requests = [], [], [], []
+
+    for _ in range(runs):
+        service.cache.clear()
+        recorder.reset()
+        started = time.perf_counter()
+        result = service.analyze_resume(resume_text, job_description)
+        latencies.append(time.perf_counter() - started)
+
+        if result.get("error"):
+            print(f"  {mode}: analysis failed - {result['error']}")
+        prompt_tokens.append(sum(call["prompt_tokens"] for call in recorder.calls))
+        completion_tokens.append(sum(call["completion_tokens"] for call in recorder.calls))
+        requests.append(len(recorder.calls))
+
+    return {
+        "mode": mode,
+        "requests": statistics.mean(requests),
+        "prompt_tokens": statistics.mean(prompt_tokens),
+        "completion_tokens": statistics.mean(completion_tokens),
+        "latency_mean": statistics.mean(latencies),
+        "latency_max": max(latencies)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("resume", nargs="?", help="Path to a plain-text resume")
+    parser.add_argument("job_description", nargs="?", help="Path to a plain-text job description")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    resume_text = open(args.resume, encoding="utf-8").read() if args.resume else SAMPLE_RESUME
+    job_description = (open(args.job_description, encoding="utf-8").read()
+                       if args.job_description else SAMPLE_JOB_DESCRIPTION)
+
+    service = AutoGenResumeAnalysisService()
+    if not service.transport:
+        sys.exit("OPENAI_API_KEY (or LLM_TRANSPORT=replay) is required to run this benchmark")
+
+    recorder = UsageRecorder(service.transport)
+    service.transport = recorder
+
+    rows = [run_mode(service, recorder, mode, resume_text, job_description, args.runs)
+            for mode in ("multi_agent", "combined")]
+
+    print()
+    print(f"{'mode':<12} {'requests':>8} {'prompt tok':>11} {'compl tok':>10} {'mean s':>8} {'max s':>8}")
+    for row in rows:
+        print(f"{row['mode']:<12} {row['requests']:>8.1f} {row['prompt_tokens']:>11.0f} "
+              f"{row['completion_tokens']:>10.0f} {row['latency_mean']:>8.2f} {row['latency_max']:>8.2f}")
+
+    multi, combined = rows
+    if multi["prompt_tokens"]:
+        saved = 1 - combined["prompt_tokens"] / multi["prompt_tokens"]
+        print(f"\nCombined mode uses {saved:.0%} fewer prompt tokens than multi-agent mode")
+
+
+if __name__ == "__main__":
+    main()
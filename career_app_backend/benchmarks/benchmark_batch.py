@@ -0,0 +1,99 @@
+"""Compare scoring one resume against N job descriptions per-JD versus with analyze_batch.
+
+Usage:
+    python benchmarks/benchmark_batch.py [--sizes 1,5,10,20] [--latency fixed:0.5] [--live]
+
+The per-JD baseline is what clients did before the batch endpoint: one ATS score and
+one keyword analysis request per job description, each re-sending the resume. By
+default the agents talk to the in-process stand-in OpenAI server; --live uses the
+configured transport instead. Every run bypasses the analysis cache.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai
+
+from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+from src.services.llm_transport import OpenAITransport
+from benchmarks.benchmark_analysis_modes import UsageRecorder
+from benchmarks.fake_openai_server import serve
+from benchmarks.samples import SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME
+
+FAKE_SERVER_PORT = 8090
+
+
+def job_descriptions(count):
+    """Distinct job descriptions so no request is served from the cache"""
+    return [f"Position {index + 1}\n{SAMPLE_JOB_DESCRIPTION}" for index in range(count)]
+
+
+def measure(service, recorder, run):
+    """Run one scenario and return (seconds, LLM requests, prompt tokens)"""
+    service.cache.clear()
+    recorder.reset()
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    return elapsed, len(recorder.calls), sum(call["prompt_tokens"] for call in recorder.calls)
+
+
+def growth_exponent(sizes, values):
+    """Slope of log(value) over log(N); 1.0 is linear growth"""
+    if len(sizes) < 2 or min(values) <= 0:
+        return float("nan")
+    return math.log(values[-1] / values[0]) / math.log(sizes[-1] / sizes[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,5,10,20")
+    parser.add_argument("--latency", default="fixed:0.5", help="Stand-in server latency distribution")
+    parser.add_argument("--live", action="store_true", help="Use the configured LLM transport")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    transport = None
+    if not args.live:
+        serve(port=FAKE_SERVER_PORT, latency=args.latency, seed=1)
+        transport = OpenAITransport(openai.OpenAI(api_key="fake", base_url=f"http://127.0.0.1:{FAKE_SERVER_PORT}/v1",
+                                                  max_retries=0))
+
+    service = AutoGenResumeAnalysisService(transport=transport)
+    if not service.transport:
+        sys.exit("OPENAI_API_KEY (or LLM_TRANSPORT=replay) is required for --live")
+    recorder = UsageRecorder(service.transport)
+    service.transport = recorder
+
+    def per_job(descriptions):
+        for job_description in descriptions:
+            service.calculate_ats_score(SAMPLE_RESUME, job_description)
+            service.extract_keywords(job_description, SAMPLE_RESUME)
+
+    rows = []
+    for size in sizes:
+        descriptions = job_descriptions(size)
+        rows.append((size,
+                     measure(service, recorder, lambda: per_job(descriptions)),
+                     measure(service, recorder, lambda: service.analyze_batch(SAMPLE_RESUME, descriptions))))
+
+    print()
+    print(f"{'N':>4} | {'per-JD s':>9} {'reqs':>5} {'prompt tok':>10} | {'batch s':>8} {'reqs':>5} {'prompt tok':>10}")
+    for size, (single_s, single_reqs, single_tok), (batch_s, batch_reqs, batch_tok) in rows:
+        print(f"{size:>4} | {single_s:>9.2f} {single_reqs:>5} {single_tok:>10} | "
+              f"{batch_s:>8.2f} {batch_reqs:>5} {batch_tok:>10}")
+
+    print()
+    for label, column in (("per-JD", 1), ("batch", 2)):
+        times = [row[column][0] for row in rows]
+        tokens = [row[column][2] for row in rows]
+        print(f"{label:<7} growth exponent: time {growth_exponent(sizes, times):.2f}, "
+              f"prompt tokens {growth_exponent(sizes, tokens):.2f}  (1.00 = linear in N)")
+
+
+if __name__ == "__main__":
+    main()
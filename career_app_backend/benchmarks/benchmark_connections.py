@@ -0,0 +1,108 @@
+"""Measure how much per-agent latency the pooled LLM transport saves by reusing connections.
+
+Usage:
+    python benchmarks/benchmark_connections.py [--rounds 20] [--agents 5] [--latency fixed:0.05] [--no-tls]
+
+Each round fans out --agents concurrent agent calls, like one multi-agent analysis,
+against the in-process stand-in OpenAI server (HTTPS with a throwaway self-signed
+certificate unless --no-tls). The "fresh" scenario disables keepalive, so every call
+pays TCP and TLS setup; the "pooled" scenario uses the transport built from Config.
+Overhead is the per-call latency above the server's simulated model latency.
+"""
+import argparse
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai
+
+from config.settings import Config
+from src.services.llm_transport import OpenAITransport, create_http_client, http2_available
+from benchmarks.fake_openai_server import LatencyModel, serve
+from benchmarks.load_test import percentile
+
+FAKE_SERVER_PORT = 8091
+MESSAGES = [
+    {"role": "system", "content": "You are ATS Specialist, a highly specialized AI agent. Always return valid JSON responses as requested."},
+    {"role": "user", "content": "Score this resume."}
+]
+
+
+def self_signed_certificate(directory):
+    """Write a certificate for 127.0.0.1 with the openssl CLI; returns (certfile, keyfile)"""
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+         "-keyout", keyfile, "-out", certfile],
+        check=True, capture_output=True
+    )
+    return certfile, keyfile
+
+
+def build_transport(base_url, keepalive, certfile):
+    """Transport built exactly like create_transport, optionally with keepalive disabled"""
+    config = type("BenchmarkConfig", (Config,), {"LLM_POOL_MAX_KEEPALIVE": Config.LLM_POOL_MAX_KEEPALIVE if keepalive else 0})
+    client_options = {"verify": ssl.create_default_context(cafile=certfile)} if certfile else {}
+    http_client = create_http_client(config, **client_options)
+    return OpenAITransport(
+        openai.OpenAI(api_key="fake", base_url=base_url, max_retries=0, http_client=http_client),
+        connect_timeout=Config.LLM_CONNECT_TIMEOUT_SECONDS
+    )
+
+
+def run_scenario(server, transport, rounds, agents):
+    """Run the fan-out rounds; returns (sorted per-call seconds, connections opened)"""
+    connections_before = server.connections_opened
+    latencies = []
+
+    def call():
+        started = time.perf_counter()
+        transport.complete(model="gpt-4o-mini", messages=MESSAGES, temperature=0.3, max_tokens=200, timeout=30)
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=agents) as pool:
+        for _ in range(rounds):
+            latencies.extend(pool.map(lambda _: call(), range(agents)))
+    return sorted(latencies), server.connections_opened - connections_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--agents", type=int, default=5, help="Concurrent agent calls per round")
+    parser.add_argument("--latency", default="fixed:0.05", help="Stand-in server latency distribution")
+    parser.add_argument("--no-tls", action="store_true", help="Plain HTTP (connection setup without TLS)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        certfile = keyfile = None
+        if not args.no_tls:
+            certfile, keyfile = self_signed_certificate(directory)
+        server = serve(port=FAKE_SERVER_PORT, latency=args.latency, seed=1, certfile=certfile, keyfile=keyfile)
+        scheme = "https" if certfile else "http"
+        base_url = f"{scheme}://127.0.0.1:{FAKE_SERVER_PORT}/v1"
+        model_latency = LatencyModel(args.latency, seed=1).sample()
+
+        print(f"{args.rounds} rounds x {args.agents} concurrent agents over {scheme.upper()} "
+              f"(HTTP/2 {'available' if http2_available() else 'unavailable - h2 not installed'})")
+        print(f"{'scenario':<8} | {'p50 ms':>7} {'p90 ms':>7} {'mean ms':>8} {'overhead ms':>11} | {'connections':>11}")
+        for label, keepalive in (("fresh", False), ("pooled", True)):
+            transport = build_transport(base_url, keepalive, certfile)
+            latencies, connections = run_scenario(server, transport, args.rounds, args.agents)
+            mean = sum(latencies) / len(latencies)
+            print(f"{label:<8} | {percentile(latencies, 0.5) * 1000:>7.1f} {percentile(latencies, 0.9) * 1000:>7.1f} "
+                  f"{mean * 1000:>8.1f} {(mean - model_latency) * 1000:>11.1f} | {connections:>11}")
+            transport.client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare per-pair and vectorized TF-IDF keyword similarity for resume x job description grids.
+
+Usage:
+    python benchmarks/benchmark_keyword_similarity.py [--resumes N] [--jobs N]
+
+Resumes and job descriptions are variations of the shared samples, so vocabularies overlap
+the way a real candidate pool does. Both paths must return identical scores.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.samples import SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME
+from src.services.keyword_similarity import KeywordSimilarity, terms
+
+EXTRA_TERMS = ["kafka", "spark", "terraform", "java", "golang", "redis", "graphql", "tableau", "pandas",
+               "leadership", "mentoring", "fastapi", "django", "react", "typescript", "azure", "gcp", "airflow"]
+
+
+def variants(text, count, seed):
+    """`count` variations of a text with shuffled lines and a few extra terms"""
+    rng = random.Random(seed)
+    lines = text.splitlines()
+    documents = []
+    for _ in range(count):
+        rng.shuffle(lines)
+        documents.append("\n".join(lines) + "\n" + " ".join(rng.sample(EXTRA_TERMS, 5)))
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=50)
+    args = parser.parse_args()
+
+    resumes = variants(SAMPLE_RESUME, args.resumes, seed=1)
+    jobs = variants(SAMPLE_JOB_DESCRIPTION, args.jobs, seed=2)
+    engine = KeywordSimilarity.fit(resumes + jobs)
+    pairs = args.resumes * args.jobs
+
+    started = time.perf_counter()
+    single = [[engine.score(resume, job)["match_percentage"] for job in jobs] for resume in resumes]
+    single_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = engine.score_matrix(resumes, jobs)["match_percentage"]
+    batch_seconds = time.perf_counter() - started
+
+    identical = all(single[row][column] == batch[row, column]
+                    for row in range(args.resumes) for column in range(args.jobs))
+    vocabulary = len(set().union(*(terms(text) for text in resumes + jobs)))
+    print(f"{args.resumes} resumes x {args.jobs} job descriptions = {pairs} pairs, {vocabulary} terms")
+    print(f"{'mode':<12} {'seconds':>9} {'pairs/sec':>12}")
+    print(f"{'per-pair':<12} {single_seconds:>9.3f} {pairs / single_seconds:>12.0f}")
+    print(f"{'vectorized':<12} {batch_seconds:>9.3f} {pairs / batch_seconds:>12.0f}")
+    print(f"\nspeedup {single_seconds / batch_seconds:.0f}x, identical scores: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measure the prompt-token reduction of resume text normalization over a corpus.
+
+Usage:
+    python benchmarks/benchmark_normalization.py CORPUS_DIR [--max-tokens N]
+
+CORPUS_DIR may contain .pdf files (extracted with FileHandler) and/or .txt files.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from src.utils.file_handler import FileHandler
+from src.utils.text_normalizer import TextNormalizer
+
+
+def load_corpus(corpus_dir, file_handler):
+    """Yield (filename, raw text) for every resume in the directory"""
+    for name in sorted(os.listdir(corpus_dir)):
+        path = os.path.join(corpus_dir, name)
+        if name.lower().endswith(".pdf"):
+            try:
+                yield name, file_handler.extract_text_from_pdf(path)
+            except Exception as e:
+                print(f"skipping {name}: {e}")
+        elif name.lower().endswith(".txt"):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                yield name, f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus_dir")
+    parser.add_argument("--max-tokens", type=int, default=Config.MAX_RESUME_TOKENS)
+    args = parser.parse_args()
+
+    normalizer = TextNormalizer(max_tokens=args.max_tokens, repeated_line_threshold=Config.REPEATED_LINE_THRESHOLD)
+    rows = []
+    for name, text in load_corpus(args.corpus_dir, FileHandler()):
+        started = time.perf_counter()
+        result = normalizer.normalize(text)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        rows.append((name, result, elapsed_ms))
+
+    if not rows:
+        sys.exit("No .pdf or .txt resumes found")
+
+    print(f"{'file':<40} {'before':>8} {'after':>8} {'saved':>7} {'ms':>7}  truncated")
+    for name, result, elapsed_ms in rows:
+        saved = result["tokens_saved"] / result["tokens_before"] if result["tokens_before"] else 0
+        print(f"{name[:40]:<40} {result['tokens_before']:>8} {result['tokens_after']:>8} "
+              f"{saved:>7.1%} {elapsed_ms:>7.2f}  {', '.join(result['truncated_sections'])}")
+
+    before = sum(result["tokens_before"] for _, result, _ in rows)
+    after = sum(result["tokens_after"] for _, result, _ in rows)
+    print(f"\n{len(rows)} resumes: {before} -> {after} tokens per agent prompt "
+          f"({1 - after / before:.1%} fewer input tokens)")
+
+
+if __name__ == "__main__":
+    main()
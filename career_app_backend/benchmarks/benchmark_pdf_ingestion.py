@@ -0,0 +1,65 @@
+"""Compare temp-file and in-memory PDF ingestion under concurrent uploads.
+
+Usage:
+    python benchmarks/benchmark_pdf_ingestion.py [--uploads N] [--concurrency 1,4,16] [--pages N]
+
+"temp file" writes every upload to disk, parses it from the path and unlinks it (the previous
+request path); "memory" parses the upload stream directly through FileHandler.open_upload.
+Both must extract the same text.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.datastructures import FileStorage
+
+from benchmarks.samples import SAMPLE_RESUME, build_pdf
+from src.utils.file_handler import FileHandler
+
+
+def via_temp_file(file_handler, pdf):
+    file_path = file_handler.save_temp_file(FileStorage(io.BytesIO(pdf), "resume.pdf"), "resume.pdf")
+    try:
+        return file_handler.extract_text_from_pdf(file_path)
+    finally:
+        file_handler.cleanup_temp_file(file_path)
+
+
+def in_memory(file_handler, pdf):
+    with file_handler.open_upload(FileStorage(io.BytesIO(pdf), "resume.pdf"), "resume.pdf") as source:
+        return file_handler.extract_text_from_pdf(source)
+
+
+def run(ingest, file_handler, pdf, uploads, concurrency):
+    """Seconds to ingest `uploads` copies of the PDF with `concurrency` request threads"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        texts = list(pool.map(lambda _: ingest(file_handler, pdf), range(uploads)))
+    return time.perf_counter() - started, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=100)
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--pages", type=int, default=2)
+    args = parser.parse_args()
+
+    pdf = build_pdf([SAMPLE_RESUME] * args.pages)
+    file_handler = FileHandler()
+    print(f"{args.uploads} uploads of a {len(pdf)} byte, {args.pages} page PDF")
+    print(f"{'threads':>7} {'temp file/s':>12} {'memory/s':>9} {'speedup':>8} {'same text':>10}")
+    for concurrency in (int(value) for value in args.concurrency.split(",")):
+        temp_seconds, temp_texts = run(via_temp_file, file_handler, pdf, args.uploads, concurrency)
+        memory_seconds, memory_texts = run(in_memory, file_handler, pdf, args.uploads, concurrency)
+        print(f"{concurrency:>7} {args.uploads / temp_seconds:>12.0f} {args.uploads / memory_seconds:>9.0f} "
+              f"{temp_seconds / memory_seconds:>7.2f}x {str(temp_texts == memory_texts):>10}")
+
+
+if __name__ == "__main__":
+    main()
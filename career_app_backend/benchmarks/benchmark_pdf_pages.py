@@ -0,0 +1,53 @@
+"""Measure pdfplumber pages/sec with page ranges fanned out across sandboxed worker processes.
+
+Usage:
+    python benchmarks/benchmark_pdf_pages.py [--pages 12] [--documents 10] [--processes 0,1,2,4]
+
+Every document is a --pages page PDF of the sample resume. "0" extracts in-process; higher
+values use that many sandboxed worker processes, each opening the document for one page range
+(the workers are started before timing). Scaling is bounded by the cores of this machine,
+which are printed with the results; every setting must extract the same text.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.samples import SAMPLE_RESUME, build_pdf
+from src.utils.extraction_sandbox import ExtractionSandbox
+from src.utils.file_handler import FileHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--documents", type=int, default=10)
+    parser.add_argument("--processes", default="0,1,2,4")
+    args = parser.parse_args()
+
+    pdf = build_pdf([f"Page {page + 1}\n{SAMPLE_RESUME}" for page in range(args.pages)])
+    print(f"{args.documents} documents x {args.pages} pages, {os.cpu_count()} cores")
+    print(f"{'processes':>9} {'seconds':>8} {'pages/sec':>10} {'speedup':>8} {'same text':>10}")
+
+    baseline_seconds = baseline_text = None
+    for processes in (int(value) for value in args.processes.split(",")):
+        file_handler = FileHandler(sandbox=ExtractionSandbox(processes=processes), parallel_min_pages=2)
+        try:
+            text = file_handler.extract_text_from_pdf(pdf)  # Warm-up: starts the workers and imports
+            started = time.perf_counter()
+            for _ in range(args.documents):
+                file_handler.extract_text_from_pdf(pdf)
+            seconds = time.perf_counter() - started
+        finally:
+            file_handler.shutdown()
+
+        if baseline_seconds is None:
+            baseline_seconds, baseline_text = seconds, text
+        print(f"{processes:>9} {seconds:>8.2f} {args.documents * args.pages / seconds:>10.1f} "
+              f"{baseline_seconds / seconds:>7.2f}x {str(text == baseline_text):>10}")
+
+
+if __name__ == "__main__":
+    main()
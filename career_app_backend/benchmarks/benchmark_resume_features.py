@@ -0,0 +1,61 @@
+"""Measure the single-pass ResumeFeatures extraction behind the rule-based scorers.
+
+Usage:
+    python benchmarks/benchmark_resume_features.py [--sizes 1,10,50]
+
+Each size repeats the sample resume that many times. "shared" runs the full rule-based
+analysis with one feature extraction per request; "per scorer" drops the extracted features
+before every scorer, i.e. every scorer re-scans the text as it did before.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.samples import SAMPLE_RESUME
+from src.services.resume_service import ResumeAnalysisService
+from src.utils.resume_features import ResumeFeatures, extract_features
+
+
+def per_request_ms(function, runs):
+    """Average milliseconds of one call, starting every call without cached features"""
+    started = time.perf_counter()
+    for _ in range(runs):
+        extract_features.cache_clear()
+        function()
+    return (time.perf_counter() - started) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,10,50")
+    args = parser.parse_args()
+
+    service = ResumeAnalysisService()
+    scorers = (
+        lambda text: service._analyze_text_content(text),
+        lambda text: service.calculate_ats_score(text),
+        lambda text: service.get_improvement_suggestions(text),
+        lambda text: service.extract_keywords("", text)
+    )
+
+    def each_scorer_rescans(text):
+        for scorer in scorers:
+            extract_features.cache_clear()
+            scorer(text)
+
+    print(f"{'words':>7} {'features ms':>12} {'shared ms':>10} {'per scorer ms':>14} {'speedup':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        text = "\n".join([SAMPLE_RESUME] * size)
+        runs = max(20, 2000 // size)
+        features_ms = per_request_ms(lambda: ResumeFeatures(text), runs)
+        shared_ms = per_request_ms(lambda: service.analyze_resume(text), runs)
+        rescan_ms = per_request_ms(lambda: each_scorer_rescans(text), runs)
+        print(f"{len(text.split()):>7} {features_ms:>12.3f} {shared_ms:>10.3f} {rescan_ms:>14.3f} "
+              f"{rescan_ms / shared_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Local stand-in for the OpenAI chat-completions API, for offline benchmarks and load tests.
+
+Usage:
+    python benchmarks/fake_openai_server.py [--port 8089] [--latency lognormal:0.7,0.4]
+                                            [--cassette-dir DIR] [--seed 42]
+                                            [--certfile CERT --keyfile KEY]
+
+Point the backend at it with:
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8089/v1 gunicorn app:app
+
+Latency specs (seconds):
+    fixed:S            always S
+    uniform:A,B        uniformly distributed between A and B
+    normal:MU,SIGMA    normal distribution, clipped at 0
+    lognormal:MU,SIGMA median MU with log-space spread SIGMA (heavy tail)
+
+Responses are canned JSON per agent (detected from the system prompt). With
+--cassette-dir, requests recorded by LLM_TRANSPORT=record are answered with the
+recorded response instead, falling back to the canned one. With --certfile and
+--keyfile the server speaks HTTPS, so TLS handshake costs show up in benchmarks.
+The server counts the TCP connections it accepts (`server.connections_opened`).
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import ssl
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.llm_transport import request_fingerprint
+
+CANNED_RESPONSES = {
+    "ATS Specialist": {
+        "overall_score": 78,
+        "max_score": 100,
+        "grade": "C+",
+        "interpretation": "Fair ATS compatibility - several improvements recommended",
+        "detailed_scores": {"format_score": 24, "keywords_score": 17, "content_score": 21, "sections_score": 16},
+        "recommendations": ["Add more industry-specific keywords", "Include quantifiable achievements"],
+        "strengths": ["Well-structured format", "Complete contact information"],
+        "areas_for_improvement": ["Missing technical keywords"],
+        "content_quality": "Professional with room for improvement",
+        "key_observations": ["Clear section headers throughout", "Good use of action verbs"]
+    },
+    "Career Counselor": {
+        "priority_improvements": ["Add quantifiable achievements with specific numbers and percentages"],
+        "content_suggestions": ["Add specific project outcomes and business impact metrics"],
+        "formatting_tips": ["Use consistent bullet point style throughout the document"],
+        "keyword_recommendations": ["Incorporate keywords from the job description naturally"],
+        "strengths": ["Clear professional experience section with relevant roles"],
+        "missing_elements": ["Professional summary section at the top"]
+    },
+    "Keyword Optimization Agent": {
+        "job_description_keywords": ["python", "flask", "postgresql", "aws", "kafka"],
+        "resume_keywords": ["python", "flask", "postgresql", "aws", "react"],
+        "matching_keywords": ["python", "flask", "postgresql", "aws"],
+        "missing_keywords": ["kafka"],
+        "keyword_density": 4.2,
+        "match_percentage": 80.0,
+        "critical_missing_keywords": ["kafka"],
+        "keyword_suggestions": ["Mention any Kafka or event-streaming experience"],
+        "industry_keywords": ["microservices", "rest api"]
+    },
+    "Skills Extraction Agent": {
+        "technical_skills": [{"name": "Python", "level": "Advanced", "years": 6, "category": "Programming"}],
+        "professional_skills": [{"name": "Team Leadership", "level": "Intermediate", "years": 3, "category": "Leadership"}],
+        "soft_skills": [{"name": "Communication", "level": "Advanced", "years": 6, "category": "Interpersonal"}],
+        "certifications": [],
+        "all_skills": [{"name": "Python", "level": "Advanced", "years": 6, "category": "Programming"}],
+        "skills_summary": {
+            "total_skills": 3, "technical_count": 1, "professional_count": 1, "soft_skills_count": 1,
+            "certifications_count": 0, "average_experience_years": 5.0,
+            "skill_level_distribution": {"Expert": 0, "Advanced": 2, "Intermediate": 1, "Beginner": 0, "Certified": 0}
+        }
+    }
+}
+CANNED_RESPONSES["Requirements Extraction Agent"] = {
+    "title": "Backend Engineer",
+    "required_skills": ["python", "rest apis", "flask", "postgresql", "aws", "docker"],
+    "preferred_skills": ["kafka", "kubernetes", "machine learning pipelines"],
+    "experience": "Backend development with Python",
+    "education": "",
+    "certifications": [],
+    "responsibilities": ["Design REST APIs", "Mentor junior engineers"]
+}
+CANNED_RESPONSES["Combined Resume Analyst"] = {
+    "ats_score": CANNED_RESPONSES["ATS Specialist"],
+    "analysis_details": {
+        "content_quality": CANNED_RESPONSES["ATS Specialist"]["content_quality"],
+        "key_observations": CANNED_RESPONSES["ATS Specialist"]["key_observations"]
+    },
+    "suggestions": CANNED_RESPONSES["Career Counselor"],
+    "keywords_analysis": CANNED_RESPONSES["Keyword Optimization Agent"],
+    "skills_analysis": CANNED_RESPONSES["Skills Extraction Agent"]
+}
+JOB_MATCH = {
+    "grade": "B",
+    "interpretation": "Good match with minor gaps",
+    "detailed_scores": {"format_score": 25, "keywords_score": 20, "content_score": 22, "sections_score": 18},
+    "matching_keywords": ["python", "flask", "postgresql"],
+    "missing_keywords": ["kafka"],
+    "critical_missing_keywords": ["kafka"],
+    "match_percentage": 75.0,
+    "keyword_suggestions": ["Mention any Kafka or event-streaming experience"]
+}
+
+
+class LatencyModel:
+    """Sample response latencies from a configurable distribution"""
+
+    def __init__(self, spec: str, seed=None):
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.kind == "fixed":
+                return self.params[0] if self.params else 0.0
+            if self.kind == "uniform":
+                return self._random.uniform(self.params[0], self.params[1])
+            if self.kind == "normal":
+                return max(0.0, self._random.gauss(self.params[0], self.params[1]))
+            return self._random.lognormvariate(math.log(self.params[0]), self.params[1])
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used for the usage block"""
+    return max(1, len(text) // 4)
+
+
+def make_handler(latency: LatencyModel, cassette_dir=None):
+    """Build the request handler class bound to a latency model and optional cassettes"""
+
+    connection_lock = threading.Lock()
+
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; without this, Nagle's algorithm and the
+        # client's delayed ACK stall every response on a kept-alive connection by ~40ms
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with connection_lock:
+                self.server.connections_opened = getattr(self.server, "connections_opened", 0) + 1
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            content = self._response_content(request)
+
+            time.sleep(latency.sample())
+
+            prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in request.get("messages", []))
+            completion_tokens = estimate_tokens(content)
+            self._send_json(200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "gpt-4o-mini"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            })
+
+        def _response_content(self, request) -> str:
+            if cassette_dir:
+                options = {k: v for k, v in request.items()
+                           if k not in ("model", "messages", "temperature", "max_tokens", "stream")}
+                key = request_fingerprint(request.get("model"), request.get("messages", []),
+                                          request.get("temperature"), request.get("max_tokens"), **options)
+                path = os.path.join(cassette_dir, f"{key}.json")
+                if os.path.exists(path):
+                    with open(path, encoding="utf-8") as f:
+                        return json.load(f)["response"]["content"]
+
+            system_prompt = next((m.get("content", "") for m in request.get("messages", [])
+                                  if m.get("role") == "system"), "")
+            match = re.match(r"You are (.+?), a highly specialized AI agent", system_prompt)
+            agent_name = match.group(1) if match else ""
+            if agent_name == "Job Match Analyst":
+                # One match per numbered job description in the prompt
+                user_prompt = request.get("messages", [{}])[-1].get("content", "")
+                job_count = len(re.findall(r"^\s*JOB DESCRIPTION \d+:", user_prompt, re.MULTILINE))
+                return json.dumps({"job_matches": [dict(JOB_MATCH, job_index=index, overall_score=90 - 2 * index)
+                                                   for index in range(1, job_count + 1)]})
+            return json.dumps(CANNED_RESPONSES.get(agent_name, {}))
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client gave up (e.g. its deadline passed) before the response was ready
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return FakeOpenAIHandler
+
+
+def create_server(host, port, latency, cassette_dir=None, seed=None, certfile=None, keyfile=None) -> ThreadingHTTPServer:
+    """Build the server, wrapping its socket in TLS when a certificate is given"""
+    server = ThreadingHTTPServer((host, port), make_handler(LatencyModel(latency, seed), cassette_dir))
+    server.daemon_threads = True
+    server.connections_opened = 0
+    if certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    return server
+
+
+def serve(host="127.0.0.1", port=8089, latency="fixed:0", cassette_dir=None, seed=None,
+          certfile=None, keyfile=None) -> ThreadingHTTPServer:
+    """Start the server on a background thread and return it (call .shutdown() to stop)"""
+    server = create_server(host, port, latency, cassette_dir, seed, certfile, keyfile)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="lognormal:0.7,0.4")
+    parser.add_argument("--cassette-dir")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--certfile", help="Serve HTTPS with this certificate")
+    parser.add_argument("--keyfile")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.latency, args.cassette_dir, args.seed,
+                           args.certfile, args.keyfile)
+    scheme = "https" if args.certfile else "http"
+    print(f"Fake OpenAI server on {scheme}://{args.host}:{args.port}/v1 (latency {args.latency})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
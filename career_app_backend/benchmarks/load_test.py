@@ -0,0 +1,119 @@
+"""Throughput and tail-latency load test of the running backend.
+
+Usage:
+    python benchmarks/load_test.py [--url http://127.0.0.1:5000] [--endpoint score|suggestions|keywords|analyze]
+                                   [--pdf resume.pdf] [--concurrency 8] [--requests 200]
+
+For deterministic offline runs, start the stand-in OpenAI server and point the
+backend at it (disable the analysis cache so every request reaches the agents):
+
+    python benchmarks/fake_openai_server.py --latency lognormal:0.7,0.4 --seed 1
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8089/v1 ANALYSIS_CACHE_MAX_ENTRIES=0 \\
+        gunicorn -w 4 -b 127.0.0.1:5000 app:app
+
+or replay recorded cassettes with LLM_TRANSPORT=replay.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.samples import SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME
+
+
+def build_request(base_url, endpoint, index, pdf_bytes=None, unique=False):
+    """Build the HTTP request for one call; `unique` varies the text to defeat the analysis cache"""
+    resume_text = SAMPLE_RESUME + (f"\nReference: {index}" if unique else "")
+
+    if endpoint == "analyze":
+        boundary = uuid.uuid4().hex
+        body = b"".join([
+            f"--{boundary}\r\n".encode(),
+            b'Content-Disposition: form-data; name="file"; filename="resume.pdf"\r\n',
+            b"Content-Type: application/pdf\r\n\r\n",
+            pdf_bytes,
+            f"\r\n--{boundary}\r\n".encode(),
+            b'Content-Disposition: form-data; name="job_description"\r\n\r\n',
+            SAMPLE_JOB_DESCRIPTION.encode("utf-8"),
+            f"\r\n--{boundary}--\r\n".encode()
+        ])
+        content_type = f"multipart/form-data; boundary={boundary}"
+    else:
+        body = json.dumps({"resume_text": resume_text, "job_description": SAMPLE_JOB_DESCRIPTION}).encode("utf-8")
+        content_type = "application/json"
+
+    return urllib.request.Request(
+        f"{base_url.rstrip('/')}/api/resume/{endpoint}",
+        data=body,
+        headers={"Content-Type": content_type},
+        method="POST"
+    )
+
+
+def timed_call(request, timeout):
+    """Send one request and return (latency seconds, HTTP status)"""
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 0
+    return time.perf_counter() - started, status
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--endpoint", default="score", choices=["score", "suggestions", "keywords", "analyze"])
+    parser.add_argument("--pdf", help="PDF to upload (required for --endpoint analyze)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--unique", action="store_true", help="Vary each resume so no request hits the cache")
+    args = parser.parse_args()
+
+    if args.endpoint == "analyze" and not args.pdf:
+        sys.exit("--pdf is required for the analyze endpoint")
+    pdf_bytes = open(args.pdf, "rb").read() if args.pdf else None
+
+    requests = [build_request(args.url, args.endpoint, i, pdf_bytes, args.unique) for i in range(args.requests)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        outcomes = list(executor.map(lambda req: timed_call(req, args.timeout), requests))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, status in outcomes if status == 200)
+    failures = sum(1 for _, status in outcomes if status != 200)
+
+    print(f"Endpoint:    /api/resume/{args.endpoint}")
+    print(f"Requests:    {len(outcomes)} ({failures} failed) at concurrency {args.concurrency}")
+    print(f"Wall time:   {elapsed:.2f}s")
+    print(f"Throughput:  {len(latencies) / elapsed:.2f} req/s")
+    if latencies:
+        print(f"Latency:     mean {statistics.mean(latencies):.3f}s  p50 {percentile(latencies, 0.50):.3f}s  "
+              f"p90 {percentile(latencies, 0.90):.3f}s  p99 {percentile(latencies, 0.99):.3f}s  "
+              f"max {latencies[-1]:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
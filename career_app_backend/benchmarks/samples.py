@@ -0,0 +1,64 @@
+"""Sample inputs shared by the benchmark scripts"""
+
+SAMPLE_RESUME = """John Doe
+Senior Software Engineer | john.doe@example.com | (555) 123-4567
+
+SUMMARY
+Software engineer with 6 years of experience building data-intensive web services in Python.
+
+EXPERIENCE
+Acme Corp - Senior Software Engineer (2020 - Present)
+- Led a team of 5 engineers to rebuild the billing platform, cutting invoice errors by 40%
+- Developed Flask and PostgreSQL microservices handling 2M requests per day
+- Implemented CI/CD pipelines on AWS, reducing deployment time from 2 hours to 15 minutes
+
+Globex - Software Engineer (2017 - 2020)
+- Created React dashboards used by 300+ internal analysts
+- Optimized SQL queries, improving report generation speed by 3x
+
+EDUCATION
+BS Computer Science, State University, 2017
+
+SKILLS
+Python, Flask, Django, React, PostgreSQL, AWS, Docker, Kubernetes, Communication, Leadership
+
+CERTIFICATIONS
+AWS Certified Solutions Architect - Associate
+"""
+
+SAMPLE_JOB_DESCRIPTION = """We are hiring a Backend Engineer with strong Python experience.
+You will design REST APIs with Flask or FastAPI, work with PostgreSQL and Redis, and deploy
+to AWS using Docker and Kubernetes. Experience with machine learning pipelines, Kafka and
+mentoring junior engineers is a plus."""
+
+
+def build_pdf(pages):
+    """Minimal text PDF with one page per string in `pages` (Helvetica, one text line per line)"""
+    def escape(line):
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    page_count = len(pages)
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{4 + 2 * index} 0 R" for index in range(page_count)), page_count)).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    for index, text in enumerate(pages):
+        lines = "".join(f"({escape(line)}) '\n" for line in text.splitlines())
+        content = f"BT\n/F1 10 Tf\n14 TL\n50 780 Td\n{lines}ET".encode("latin-1", "replace")
+        objects.append(("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources "
+                        f"<< /Font << /F1 3 0 R >> >> /Contents {5 + 2 * index} 0 R >>").encode())
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
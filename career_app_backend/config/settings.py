@@ -13,10 +13,47 @@ class Config:
     # File upload settings
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'uploads')
+    # Uploaded PDFs up to this size are parsed from memory; larger ones are spilled to a temp file
+    PDF_SPILL_THRESHOLD_BYTES = int(os.environ.get('PDF_SPILL_THRESHOLD_BYTES', 4 * 1024 * 1024))
     ALLOWED_EXTENSIONS = {'pdf'}
+    # Extracted PDF text cache keyed by content hash: per-worker memory tier plus an optional
+    # SQLite tier shared by all workers (empty path disables it)
+    PDF_TEXT_CACHE_MAX_ENTRIES = int(os.environ.get('PDF_TEXT_CACHE_MAX_ENTRIES', 256))
+    PDF_TEXT_CACHE_DB_PATH = os.environ.get('PDF_TEXT_CACHE_DB_PATH', '')
+    PDF_TEXT_CACHE_MAX_DISK_ENTRIES = int(os.environ.get('PDF_TEXT_CACHE_MAX_DISK_ENTRIES', 10000))
+    # PDFs are parsed in PDF_WORKER_PROCESSES sandboxed processes per web worker (0 parses
+    # in-process without limits); documents with at least PDF_PARALLEL_MIN_PAGES pages are
+    # split into one page range per process
+    PDF_WORKER_PROCESSES = int(os.environ.get('PDF_WORKER_PROCESSES', min(4, os.cpu_count() or 1)))
+    PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 4))
+    # Per-document limits: wall-clock time, worker resident memory and page count (0 = unlimited);
+    # workers are replaced after PDF_WORKER_MAX_TASKS tasks
+    PDF_EXTRACTION_TIMEOUT_SECONDS = float(os.environ.get('PDF_EXTRACTION_TIMEOUT_SECONDS', 20))
+    PDF_WORKER_MAX_RSS_MB = int(os.environ.get('PDF_WORKER_MAX_RSS_MB', 512))
+    PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 40))
+    PDF_WORKER_MAX_TASKS = int(os.environ.get('PDF_WORKER_MAX_TASKS', 200))
+    # adaptive: PyPDF2 for every page, pdfplumber only for pages whose text scores poorly;
+    # pdfplumber: pdfplumber for every page (PyPDF2 only if it finds no text)
+    PDF_EXTRACTION_STRATEGY = os.environ.get('PDF_EXTRACTION_STRATEGY', 'adaptive')
     
     # OpenAI settings
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+    OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL')
+    
+    # LLM transport: 'openai' (live), 'record' (live + save cassettes) or 'replay' (cassettes only)
+    LLM_TRANSPORT = os.environ.get('LLM_TRANSPORT', 'openai')
+    LLM_CASSETTE_DIR = os.environ.get('LLM_CASSETTE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cassettes')
+    
+    # LLM HTTP connection pool: one per worker process, shared by every agent.
+    # LLM_HTTP2: 'auto' (when the h2 package is installed), 'true' or 'false'
+    LLM_POOL_MAX_CONNECTIONS = int(os.environ.get('LLM_POOL_MAX_CONNECTIONS', 20))
+    LLM_POOL_MAX_KEEPALIVE = int(os.environ.get('LLM_POOL_MAX_KEEPALIVE', 10))
+    LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get('LLM_KEEPALIVE_EXPIRY_SECONDS', 60))
+    LLM_HTTP2 = os.environ.get('LLM_HTTP2', 'auto')
+    LLM_CONNECT_TIMEOUT_SECONDS = float(os.environ.get('LLM_CONNECT_TIMEOUT_SECONDS', 5))
+    # Per-agent read timeouts, e.g. "Combined Resume Analyst=40,Job Match Analyst=30"
+    # (other agents use AGENT_TIMEOUT_SECONDS)
+    LLM_AGENT_READ_TIMEOUTS = os.environ.get('LLM_AGENT_READ_TIMEOUTS', '')
     
     # AutoGen settings
     AUTOGEN_CONFIG = {
@@ -25,6 +62,61 @@ class Config:
         'max_tokens': 2000
     }
     
+    # Resume text normalization settings
+    MAX_RESUME_TOKENS = int(os.environ.get('MAX_RESUME_TOKENS', 3000))
+    REPEATED_LINE_THRESHOLD = int(os.environ.get('REPEATED_LINE_THRESHOLD', 3))
+    
+    # Agent fan-out settings
+    AGENT_MAX_WORKERS = int(os.environ.get('AGENT_MAX_WORKERS', 10))
+    AGENT_TIMEOUT_SECONDS = float(os.environ.get('AGENT_TIMEOUT_SECONDS', 45))
+    
+    # Latency budget and LLM resilience: agents still pending at the deadline, or failing
+    # after bounded retries, are replaced by the rule-based analysis
+    ANALYSIS_DEADLINE_SECONDS = float(os.environ.get('ANALYSIS_DEADLINE_SECONDS', 25))
+    LLM_MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', 2))
+    LLM_RETRY_BACKOFF_SECONDS = float(os.environ.get('LLM_RETRY_BACKOFF_SECONDS', 0.5))
+    LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('LLM_CIRCUIT_FAILURE_THRESHOLD', 5))
+    LLM_CIRCUIT_RESET_SECONDS = float(os.environ.get('LLM_CIRCUIT_RESET_SECONDS', 30))
+    
+    # Structured output: 'true' requests schema-constrained JSON (json_schema, strict), 'false' plain
+    # JSON mode; unusable responses are re-asked from the failing agent only
+    LLM_STRICT_OUTPUT = os.environ.get('LLM_STRICT_OUTPUT', 'true').lower() == 'true'
+    LLM_OUTPUT_RETRIES = int(os.environ.get('LLM_OUTPUT_RETRIES', 1))
+    
+    # Skills are extracted locally from the skills ontology; the model only adds proficiency estimates
+    SKILLS_LLM_ENRICHMENT = os.environ.get('SKILLS_LLM_ENRICHMENT', 'false').lower() == 'true'
+    
+    # IDF table for keyword match_percentage, built from a reference corpus with
+    # `python -m src.services.keyword_similarity`; without it every term weighs the same
+    KEYWORD_IDF_PATH = os.environ.get('KEYWORD_IDF_PATH', '')
+    
+    # Job description registry: stored postings with precomputed keywords and requirements
+    JOB_REGISTRY_DB_PATH = os.environ.get('JOB_REGISTRY_DB_PATH') or os.path.join(UPLOAD_FOLDER, 'job_descriptions.db')
+    JOB_REQUIREMENTS_EXTRACTION = os.environ.get('JOB_REQUIREMENTS_EXTRACTION', 'true').lower() == 'true'
+    
+    # Incremental re-analysis: latest analysis per document_id with per-section input hashes
+    ANALYSIS_HISTORY_DB_PATH = os.environ.get('ANALYSIS_HISTORY_DB_PATH') or os.path.join(UPLOAD_FOLDER, 'analysis_history.db')
+    ANALYSIS_HISTORY_RETENTION_SECONDS = float(os.environ.get('ANALYSIS_HISTORY_RETENTION_SECONDS', 7 * 24 * 60 * 60))
+    
+    # Multi-job-description batch settings
+    BATCH_MAX_JOB_DESCRIPTIONS = int(os.environ.get('BATCH_MAX_JOB_DESCRIPTIONS', 20))
+    BATCH_JOBS_PER_REQUEST = int(os.environ.get('BATCH_JOBS_PER_REQUEST', 5))
+    
+    # Analysis mode: 'multi_agent' (one request per agent) or 'combined' (single request)
+    ANALYSIS_MODE = os.environ.get('ANALYSIS_MODE', 'multi_agent')
+    COMBINED_AGENT_MAX_TOKENS = int(os.environ.get('COMBINED_AGENT_MAX_TOKENS', 4000))
+    
+    # Background analysis job settings
+    JOB_DB_PATH = os.environ.get('JOB_DB_PATH') or os.path.join(UPLOAD_FOLDER, 'analysis_jobs.db')
+    JOB_MAX_WORKERS = int(os.environ.get('JOB_MAX_WORKERS', 2))
+    JOB_RETENTION_SECONDS = float(os.environ.get('JOB_RETENTION_SECONDS', 24 * 60 * 60))
+    # Unfinished jobs whose worker has not renewed their lease for this long are re-queued
+    JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', 30))
+    
+    # Analysis result cache settings
+    ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get('ANALYSIS_CACHE_MAX_ENTRIES', 512))
+    ANALYSIS_CACHE_TTL_SECONDS = float(os.environ.get('ANALYSIS_CACHE_TTL_SECONDS', 6 * 60 * 60))
+    
     @staticmethod
     def init_app(app):
         pass
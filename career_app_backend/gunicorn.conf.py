@@ -0,0 +1,22 @@
+"""Gunicorn settings loaded automatically from the working directory.
+
+When PROMETHEUS_MULTIPROC_DIR is set, every worker writes its metrics to that
+directory and /metrics aggregates them, whichever worker serves the scrape.
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    """Start each deployment with an empty metrics directory"""
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of a worker that exited"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
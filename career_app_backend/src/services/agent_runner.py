@@ -0,0 +1,87 @@
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import threading
+import time
+
+
+class AgentRunner:
+    """Run independent analysis agents concurrently on a shared, bounded thread pool"""
+
+    def __init__(self, max_workers: int = 5, default_timeout: float = 60.0):
+        """Initialize the runner; the pool is created lazily on first use"""
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def run(self, tasks: Dict[str, Callable[[], Dict]], timeout: Optional[float] = None) -> Dict:
+        """Run every task in parallel and wait at most `timeout` seconds for all of them.
+
+        Returns a dict with the per-agent `results`, the per-agent `errors`
+        (exceptions and timeouts) and the per-agent `durations` in seconds.
+        Agents that finish in time are always merged, even if others fail.
+        """
+        started = time.monotonic()
+        outcome = {"results": {}, "errors": {}, "durations": {}}
+        for name, result, error, duration in self.iter_completed(tasks, timeout):
+            if error is None:
+                outcome["results"][name] = result
+            else:
+                outcome["errors"][name] = error
+            outcome["durations"][name] = duration
+
+        outcome["wall_time"] = round(time.monotonic() - started, 3)
+        return outcome
+
+    def iter_completed(self, tasks: Dict[str, Callable[[], Dict]],
+                       timeout: Optional[float] = None) -> Iterator[Tuple[str, Optional[Dict], Optional[str], float]]:
+        """Yield `(name, result, error, duration)` for each task as soon as it finishes.
+
+        Tasks still running when `timeout` expires are yielded last with a timeout error,
+        so every task is reported exactly once.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        started = time.monotonic()
+        executor = self._get_executor()
+
+        names = {executor.submit(self._timed, task): name for name, task in tasks.items()}
+        pending = set(names)
+        while pending:
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result, duration = future.result()
+                    yield names[future], result, None, round(duration, 3)
+                except Exception as e:
+                    yield names[future], None, str(e), round(time.monotonic() - started, 3)
+
+        for future in pending:
+            future.cancel()
+            yield names[future], None, f"{names[future]} timed out after {timeout:g}s", round(time.monotonic() - started, 3)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (used on process shutdown and in tests)"""
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the shared pool on demand"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="resume-agent"
+                )
+            return self._executor
+
+    @staticmethod
+    def _timed(task: Callable[[], Dict]):
+        """Run a task and return its result together with its duration"""
+        started = time.monotonic()
+        result = task()
+        return result, time.monotonic() - started
@@ -0,0 +1,63 @@
+from typing import Dict, Optional
+import json
+import os
+import time
+from src.utils.sqlite import connect, initialize
+
+
+class AnalysisHistory:
+    """Latest analysis per document with the input fingerprints each section was computed from"""
+
+    def __init__(self, db_path: str, retention_seconds: float = 7 * 24 * 60 * 60):
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_db()
+
+    def get(self, document_id: str) -> Optional[Dict]:
+        """Return the stored analysis of a document, or None"""
+        with connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT * FROM analysis_history WHERE document_id = ? AND updated_at > ?",
+                (document_id, time.time() - self.retention_seconds)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return {
+            "document_id": row["document_id"],
+            "section_hashes": json.loads(row["section_hashes"]),
+            "job_description_hash": row["job_description_hash"],
+            "fingerprints": json.loads(row["fingerprints"]),
+            "sections": json.loads(row["sections"]),
+            "updated_at": row["updated_at"]
+        }
+
+    def save(self, document_id: str, section_hashes: Dict[str, str], job_description_hash: str,
+             fingerprints: Dict[str, str], sections: Dict[str, Dict]) -> None:
+        """Replace the stored analysis of a document and drop expired documents"""
+        now = time.time()
+        with connect(self.db_path) as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO analysis_history
+                       (document_id, section_hashes, job_description_hash, fingerprints, sections, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (document_id, json.dumps(section_hashes), job_description_hash, json.dumps(fingerprints),
+                 json.dumps(sections), now)
+            )
+            conn.execute("DELETE FROM analysis_history WHERE updated_at < ?", (now - self.retention_seconds,))
+
+    def _init_db(self) -> None:
+        """Create the history table if needed"""
+        with initialize(self.db_path) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS analysis_history (
+                       document_id TEXT PRIMARY KEY,
+                       section_hashes TEXT NOT NULL,
+                       job_description_hash TEXT NOT NULL,
+                       fingerprints TEXT NOT NULL,
+                       sections TEXT NOT NULL,
+                       updated_at REAL NOT NULL
+                   )"""
+            )
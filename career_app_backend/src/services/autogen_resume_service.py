@@ -1,81 +1,841 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import itertools
 import json
 import os
+import queue
+import random
+import threading
+import time
 from datetime import datetime
 import sys
-import openai
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config.settings import Config
+from src.services.agent_runner import AgentRunner
+from src.services.llm_transport import create_transport, is_retryable_error, is_transport_failure, parse_agent_timeouts
+from src.services.resume_service import ResumeAnalysisService
+from src.services.skills_extractor import SkillsExtractor
+from src.utils.cache import LRUTTLCache, make_cache_key, normalize_for_key
+from src.utils import metrics, structured_output
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.resume_sections import HEADER_SECTION, section_hashes
+from src.utils.single_flight import SingleFlight
 
 class AutoGenResumeAnalysisService:
     """Service for analyzing resumes using OpenAI's GPT models as AutoGen-style agents"""
     
-    def __init__(self):
-        """Initialize the AutoGen resume analysis service with OpenAI"""
-        # Set up OpenAI client
+    # Sections of the combined analysis response, one per agent
+    ANALYSIS_SECTIONS = ("ats_score", "analysis_details", "suggestions", "keywords_analysis", "skills_analysis")
+    
+    # Bump whenever a prompt changes so cached results from older prompts are not reused
+    PROMPT_VERSION = "2024.3"
+    
+    # analysis_details fields that need the model; every other field is computed locally
+    QUALITATIVE_CONTENT_FIELDS = ("content_quality", "key_observations")
+    
+    # Inputs of each agent for incremental re-analysis: whether it reads the resume header
+    # (contact lines) and the job description; every agent reads all other sections. The
+    # keyword match is a TF-IDF similarity over the whole text, contact lines included.
+    AGENT_INPUTS = {
+        "ats_score": {"header": True, "job_description": True},
+        "suggestions": {"header": True, "job_description": True},
+        "keywords_analysis": {"header": True, "job_description": True},
+        "skills_analysis": {"header": False, "job_description": False}
+    }
+    
+    # Sections computed locally (the model only enriches them), so they never miss the deadline
+    LOCAL_SECTIONS = ("skills_analysis",)
+    
+    def __init__(self, transport=None, history=None):
+        """Initialize the AutoGen resume analysis service with OpenAI.
+        
+        `transport` overrides the LLM transport selected by LLM_TRANSPORT (live OpenAI,
+        cassette record or cassette replay), e.g. for offline benchmarks.
+        `history` (an AnalysisHistory) enables incremental re-analysis of documents.
+        """
         self.api_key = Config.OPENAI_API_KEY
-        self.client = None
+        self.transport = transport
+        self.history = history
         self.model = "gpt-4o-mini"
         self.temperature = 0.3
         
-        # Initialize client only if API key is available
-        if self.api_key:
+        # Agents run concurrently on a bounded pool with a per-agent timeout
+        self.agent_timeout = Config.AGENT_TIMEOUT_SECONDS
+        self.agent_runner = AgentRunner(
+            max_workers=Config.AGENT_MAX_WORKERS,
+            default_timeout=self.agent_timeout
+        )
+        # Read timeout of each LLM call, overridable per agent (e.g. for the long combined prompt)
+        self.agent_read_timeouts = parse_agent_timeouts(Config.LLM_AGENT_READ_TIMEOUTS)
+        
+        # Rule-based analysis used for exact, locally computable metrics and as the
+        # fallback for sections the model cannot deliver within the request deadline
+        self.rule_based_service = ResumeAnalysisService()
+        # Skills come from the local ontology matcher; the model optionally adds proficiency
+        self.skills_extractor = SkillsExtractor()
+        self.skills_llm_enrichment = Config.SKILLS_LLM_ENRICHMENT
+        self.analysis_deadline = Config.ANALYSIS_DEADLINE_SECONDS
+        self.max_retries = Config.LLM_MAX_RETRIES
+        self.retry_backoff = Config.LLM_RETRY_BACKOFF_SECONDS
+        self.circuit_breaker = CircuitBreaker(
+            "openai",
+            failure_threshold=Config.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=Config.LLM_CIRCUIT_RESET_SECONDS
+        )
+        # Deadline of the request an agent thread is currently working for
+        self._request_context = threading.local()
+        
+        # Agents request schema-constrained JSON; output that still fails parsing or
+        # validation is re-asked from that agent alone
+        self.strict_output = Config.LLM_STRICT_OUTPUT
+        self.output_retries = Config.LLM_OUTPUT_RETRIES
+        self._output_stats = dict.fromkeys(
+            ("responses", "direct", "repaired", "invalid", "unparseable", "retries", "retries_recovered"), 0
+        )
+        self._output_stats_lock = threading.Lock()
+        
+        # "multi_agent" runs one request per agent, "combined" sends the resume once
+        self.analysis_mode = Config.ANALYSIS_MODE
+        self.combined_max_tokens = Config.COMBINED_AGENT_MAX_TOKENS
+        
+        # Batches send the resume once per group of job descriptions
+        self.batch_jobs_per_request = max(1, Config.BATCH_JOBS_PER_REQUEST)
+        
+        # Content-addressed cache of analysis results
+        self.cache = LRUTTLCache(
+            max_entries=Config.ANALYSIS_CACHE_MAX_ENTRIES,
+            ttl_seconds=Config.ANALYSIS_CACHE_TTL_SECONDS
+        )
+        # Identical requests arriving while one is still running share its computation
+        self.single_flight = SingleFlight()
+        
+        # Registered job descriptions are prompted with their compact prompt text (see use_job_registry)
+        self.job_registry = None
+        
+        # Initialize the LLM transport (the live client only if an API key is available)
+        if self.transport is None:
             try:
-                openai.api_key = self.api_key
-                self.client = openai.OpenAI(api_key=self.api_key)
-                print("✅ OpenAI client initialized successfully")
+                self.transport = create_transport(Config)
             except Exception as e:
-                print(f"⚠️ OpenAI client initialization failed: {e}")
-                self.client = None
+                print(f"⚠️ LLM transport initialization failed: {e}")
+                self.transport = None
+        
+        if self.transport is not None:
+            print(f"✅ LLM transport initialized successfully ({type(self.transport).__name__})")
+        else:
+            print("⚠️ OpenAI API key not found - service will return rule-based analysis until configured")
+    
+    def analyze_resume(self, resume_text: str, job_description: str = "", document_id: str = "") -> Dict:
+        """Complete resume analysis using OpenAI GPT-4o-mini as multiple specialized agents.
+        
+        With a `document_id`, only the agents whose inputs changed since that document's
+        previous analysis are re-run.
+        """
+        if self._incremental_enabled(document_id):
+            return self._run_incremental_analysis(resume_text, job_description, document_id)
+        return self._cached("analyze", resume_text, job_description,
+                            lambda: self._run_analysis(resume_text, job_description))
+    
+    def calculate_ats_score(self, resume_text: str, job_description: str = "") -> Dict:
+        """ATS Specialist Agent - Calculate ATS compatibility score (cached, rule-based fallback)"""
+        return self._run_agent_with_fallback("ats_score", resume_text, job_description)
+    
+    def get_improvement_suggestions(self, resume_text: str, job_description: str = "") -> Dict:
+        """Career Counselor Agent - Get improvement suggestions (cached, rule-based fallback)"""
+        return self._run_agent_with_fallback("suggestions", resume_text, job_description)
+    
+    def extract_keywords(self, job_description: str, resume_text: str = "") -> Dict:
+        """Keyword Optimization Agent - Analyze keywords (cached, rule-based fallback)"""
+        return self._run_agent_with_fallback("keywords_analysis", resume_text, job_description)
+    
+    def analyze_batch(self, resume_text: str, job_descriptions: List[str]) -> Dict:
+        """Score one resume against several job descriptions and rank them.
+        
+        Resume-side work (text statistics, rule-based features and skills) runs once. Job
+        descriptions are sent to the Job Match Analyst in groups together with a single copy
+        of the resume, and the groups run in parallel. Groups that fail or miss the deadline
+        fall back to the rule-based scores.
+        """
+        started = time.monotonic()
+        deadline = started + self.analysis_deadline
+        print(f"🤖 Starting batch analysis of resume against {len(job_descriptions)} job descriptions")
+        
+        # Resume-side work, shared by every job description
+        local_results = self.rule_based_service.score_job_descriptions(resume_text, job_descriptions)
+        analysis_details = self._analyze_text_content(resume_text)
+        
+        # Group the job descriptions; every group is one request carrying one copy of the resume
+        groups = {}
+        for start in range(0, len(job_descriptions), self.batch_jobs_per_request):
+            indices = list(range(start, min(start + self.batch_jobs_per_request, len(job_descriptions))))
+            groups[f"jobs_{indices[0] + 1}-{indices[-1] + 1}"] = indices
+        
+        tasks = {"skills_analysis": self._agent_tasks(resume_text, "", deadline)["skills_analysis"]}
+        for name, indices in groups.items():
+            group_descriptions = [job_descriptions[index] for index in indices]
+            tasks[name] = self._with_deadline(
+                lambda group=group_descriptions: self._cached(
+                    "job_match", resume_text, json.dumps(group),
+                    lambda: self._job_match_agent(resume_text, group)),
+                deadline
+            )
+        
+        if not self.transport:
+            print("🔑 OpenAI API key not configured - using rule-based analysis for every job description")
+            outcomes = self._skipped_model_outcomes(tasks, "OpenAI API key not configured")
+        elif self.circuit_breaker.state == CircuitBreaker.OPEN:
+            print("🔌 LLM circuit open - using rule-based analysis for every job description")
+            outcomes = self._skipped_model_outcomes(tasks, "LLM circuit open - model skipped")
         else:
-            print("⚠️ OpenAI API key not found - service will return error responses until configured")
+            outcomes = self.agent_runner.iter_completed(tasks, timeout=self.analysis_deadline)
+        
+        skills_analysis = None
+        results = [None] * len(job_descriptions)
+        agent_errors = {}
+        agent_timings = {}
+        for name, task_result, error, duration in outcomes:
+            agent_timings[name] = duration
+            if error is None and isinstance(task_result, dict) and task_result.get("error"):
+                error = task_result["error"]
+            if error is not None:
+                print(f"🛟 {name} degraded to rule-based analysis: {error}")
+                metrics.LLM_DEGRADED_SECTIONS.labels(
+                    section="skills_analysis" if name == "skills_analysis" else "job_match"
+                ).inc()
+                agent_errors[name] = error
+            
+            if name == "skills_analysis":
+                skills_analysis = task_result if error is None else self.skills_extractor.extract(resume_text)
+                continue
+            
+            matches = {}
+            if error is None:
+                matches = {match.get("job_index"): match for match in task_result.get("job_matches", [])
+                           if isinstance(match, dict)}
+            for position, index in enumerate(groups[name], start=1):
+                results[index] = self._merge_job_match(local_results[index], matches.get(position))
+        
+        for index, result in enumerate(results):
+            result["job_index"] = index
+            result["job_title"] = self._job_title(job_descriptions[index])
+        ranking = sorted(results, key=lambda result: (result["ats_score"].get("overall_score", 0),
+                                                      result["keywords_analysis"].get("match_percentage", 0)),
+                         reverse=True)
+        for rank, result in enumerate(ranking, start=1):
+            result["rank"] = rank
+        
+        degraded_jobs = [result["job_index"] for result in ranking if result["degraded_sections"]]
+        print(f"✅ Batch analysis completed for {len(job_descriptions)} job descriptions "
+              f"({len(groups)} requests, {len(degraded_jobs)} degraded)")
+        return {
+            "resume": {
+                "analysis_details": analysis_details,
+                "skills_analysis": skills_analysis,
+                "degraded_sections": ["skills_analysis"] if "skills_analysis" in agent_errors else []
+            },
+            "results": ranking,
+            "job_count": len(job_descriptions),
+            "degraded_jobs": sorted(degraded_jobs),
+            "agent_errors": agent_errors,
+            "agent_timings": agent_timings,
+            "batch_time": round(time.monotonic() - started, 3),
+            "analysis_timestamp": self._get_timestamp(),
+            "analysis_method": "AutoGen GPT-4o-mini Job Match Agents"
+        }
+    
+    def extract_job_requirements(self, job_description: str) -> Dict:
+        """Requirements Extraction Agent - Summarize a job posting into structured requirements (cached)"""
+        if not self.transport:
+            return {"error": "OpenAI API key not configured. Please set OPENAI_API_KEY environment variable."}
+        deadline = time.monotonic() + self.analysis_deadline
+        return self._with_deadline(
+            lambda: self._cached("job_requirements", "", job_description,
+                                 lambda: self._requirements_extraction_agent(job_description)),
+            deadline
+        )()
     
-    def analyze_resume(self, resume_text: str, job_description: str = "") -> Dict:
-        """Complete resume analysis using OpenAI GPT-4o-mini as multiple specialized agents"""
+    def use_job_registry(self, job_registry) -> None:
+        """Prompt the agents with the compact text of registered job descriptions.
         
-        # Check if OpenAI client is properly initialized
-        if not self.client:
+        Requests still pass the full posting: rule-based scoring and TF-IDF similarity use it
+        (with the registry's stored keywords), only the LLM prompts use the prompt text.
+        """
+        self.job_registry = job_registry
+        self.rule_based_service.stored_keywords = job_registry.stored_keywords
+    
+    def get_cache_stats(self) -> Dict:
+        """Return hit/miss counters of the analysis result cache and coalesced request counts"""
+        stats = self.cache.stats()
+        stats["prompt_version"] = self.PROMPT_VERSION
+        stats["single_flight"] = self.single_flight.stats()
+        return stats
+    
+    def get_llm_stats(self) -> Dict:
+        """Return circuit breaker state and structured-output parse failure and retry rates"""
+        with self._output_stats_lock:
+            output = dict(self._output_stats)
+        responses = output["responses"]
+        output["failure_rate"] = round((output["invalid"] + output["unparseable"]) / responses, 4) if responses else 0.0
+        output["repair_rate"] = round(output["repaired"] / responses, 4) if responses else 0.0
+        output["retry_rate"] = round(output["retries"] / responses, 4) if responses else 0.0
+        output["strict"] = self.strict_output
+        return {"circuit_breaker": self.circuit_breaker.stats(), "structured_output": output}
+    
+    def _cache_key(self, kind: str, resume_text: str, job_description: str) -> str:
+        """Build the cache key for one kind of analysis"""
+        return make_cache_key(
+            kind, resume_text, job_description,
+            model=self.model,
+            temperature=self.temperature,
+            prompt_version=self.PROMPT_VERSION,
+            analysis_mode=self.analysis_mode
+        )
+    
+    def _cached(self, kind: str, resume_text: str, job_description: str, compute) -> Dict:
+        """Serve a result from the analysis cache, computing and storing it on a miss.
+        
+        Concurrent misses for the same key share one computation (single-flight).
+        """
+        key = self._cache_key(kind, resume_text, job_description)
+        cached = self.cache.get(key)
+        if cached is not None:
+            print(f"⚡ Cache hit for {kind} analysis")
+            metrics.ANALYSIS_CACHE_REQUESTS.labels(kind=kind, result="hit").inc()
+            return cached
+        
+        def compute_and_store():
+            result = compute()
+            # Never cache failures or degraded results, so the model is retried on the next request
+            if isinstance(result, dict) and not any(result.get(field) for field in
+                                                    ("error", "agent_errors", "degraded_sections")):
+                self.cache.set(key, result)
+                metrics.ANALYSIS_CACHE_ENTRIES.set(len(self.cache))
+            return result
+        
+        result, shared = self.single_flight.do(key, compute_and_store)
+        if shared:
+            print(f"🔗 Coalesced identical in-flight {kind} analysis")
+        metrics.ANALYSIS_CACHE_REQUESTS.labels(kind=kind, result="coalesced" if shared else "miss").inc()
+        return result
+    
+    def _agent_tasks(self, resume_text: str, job_description: str, deadline: float) -> Dict[str, Callable[[], Dict]]:
+        """One cached LLM agent call per analysis section, each bound to the request deadline"""
+        tasks = {
+            "ats_score": lambda: self._cached("ats_score", resume_text, job_description,
+                                              lambda: self._ats_specialist_agent(resume_text, job_description)),
+            "suggestions": lambda: self._cached("suggestions", resume_text, job_description,
+                                                lambda: self._career_counselor_agent(resume_text, job_description)),
+            "keywords_analysis": lambda: self._with_local_match(
+                self._cached("keywords", resume_text, job_description,
+                             lambda: self._keyword_optimization_agent(job_description, resume_text)),
+                resume_text, job_description),
+            "skills_analysis": lambda: self.extract_skills(resume_text)
+        }
+        return {section: self._with_deadline(task, deadline) for section, task in tasks.items()}
+    
+    def _with_local_match(self, keywords_analysis: Dict, resume_text: str, job_description: str) -> Dict:
+        """Replace the model's match_percentage with the deterministic TF-IDF similarity score"""
+        if not isinstance(keywords_analysis, dict) or keywords_analysis.get("error") or not job_description:
+            return keywords_analysis
+        similarity = self.rule_based_service.similarity.score(resume_text, job_description)
+        return {
+            **keywords_analysis,
+            "match_percentage": similarity["match_percentage"],
+            "similarity": {"cosine": similarity["cosine"], "weighted_overlap": similarity["weighted_overlap"]}
+        }
+    
+    def _with_deadline(self, task: Callable[[], Dict], deadline: float) -> Callable[[], Dict]:
+        """Wrap a task so LLM calls made from its worker thread respect the request deadline"""
+        def run():
+            self._request_context.deadline = deadline
+            try:
+                return task()
+            finally:
+                self._request_context.deadline = None
+        return run
+    
+    def _skipped_model_outcomes(self, tasks: Dict[str, Callable[[], Dict]],
+                                reason: str) -> Iterator[Tuple[str, Optional[Dict], Optional[str], float]]:
+        """Agent outcomes when the model cannot be called: local sections still run, model calls are skipped"""
+        for name, task in tasks.items():
+            if name in self.LOCAL_SECTIONS:
+                started = time.monotonic()
+                yield name, task(), None, time.monotonic() - started
+            else:
+                yield name, None, reason, 0.0
+    
+    def _run_agent_with_fallback(self, section: str, resume_text: str, job_description: str) -> Dict:
+        """Run one agent within the latency budget, falling back to the rule-based result"""
+        deadline = time.monotonic() + self.analysis_deadline
+        task = self._agent_tasks(resume_text, job_description, deadline)[section]
+        if not self.transport:
+            error = "OpenAI API key not configured"
+        elif self.circuit_breaker.state == CircuitBreaker.OPEN:
+            error = "LLM circuit open - model skipped"
+        else:
+            outcome = self.agent_runner.run({section: task}, timeout=self.analysis_deadline)
+            result = outcome["results"].get(section)
+            error = outcome["errors"].get(section)
+            if error is None and isinstance(result, dict) and result.get("error"):
+                error = result["error"]
+            if error is None:
+                return result
+        
+        print(f"🛟 {section} degraded to rule-based analysis: {error}")
+        metrics.LLM_DEGRADED_SECTIONS.labels(section=section).inc()
+        result = self._rule_based_section(section, resume_text, job_description)
+        result["degraded_sections"] = [section]
+        result["fallback_reason"] = error
+        return result
+    
+    def _rule_based_section(self, section: str, resume_text: str, job_description: str = "") -> Dict:
+        """Rule-based replacement for an analysis section the model could not deliver"""
+        if section == "ats_score":
+            return self.rule_based_service.calculate_ats_score(resume_text, job_description)
+        if section == "suggestions":
+            return self.rule_based_service.get_improvement_suggestions(resume_text, job_description)
+        if section == "keywords_analysis":
+            return self.rule_based_service.extract_keywords(job_description, resume_text)
+        return self.skills_extractor.extract(resume_text)
+    
+    def _run_analysis(self, resume_text: str, job_description: str = "") -> Dict:
+        """Run every specialized agent and combine their results.
+        
+        Without an API key every model section is replaced by its rule-based result and
+        reported as degraded, as for single sections and batches.
+        """
+        if self.transport and self.analysis_mode == "combined":
+            return self._run_combined_analysis(resume_text, job_description)
+        
+        try:
+            for section, section_result in self._iter_multi_agent_analysis(resume_text, job_description):
+                if section == "complete":
+                    return section_result
+            
+        except Exception as e:
+            print(f"❌ AutoGen analysis failed: {str(e)}")
             return {
-                "error": "OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.",
+                "error": f"AutoGen analysis failed: {str(e)}",
                 "analysis_timestamp": self._get_timestamp(),
-                "analysis_method": "AutoGen GPT-4o-mini Agents (API Key Missing)"
+                "analysis_method": "AutoGen GPT-4o-mini Agents (Failed)"
             }
+    
+    def stream_analysis(self, resume_text: str, job_description: str = "",
+                        document_id: str = "") -> Iterator[Tuple[str, Dict]]:
+        """Yield `(section, result)` pairs as each analysis section becomes ready.
+        
+        The last pair is `("complete", full_result)` with the same payload analyze_resume returns.
+        """
+        if self._incremental_enabled(document_id):
+            try:
+                yield from self._iter_incremental_analysis(resume_text, job_description, document_id)
+            except Exception as e:
+                print(f"❌ Incremental streamed analysis failed: {str(e)}")
+                yield "complete", {
+                    "error": f"AutoGen analysis failed: {str(e)}",
+                    "analysis_timestamp": self._get_timestamp(),
+                    "analysis_method": "AutoGen GPT-4o-mini Agents (Failed)"
+                }
+            return
+        
+        if not self.transport or self.analysis_mode == "combined":
+            # Nothing to stream incrementally: the whole result arrives at once
+            result = self.analyze_resume(resume_text, job_description)
+        else:
+            try:
+                yield from self._stream_multi_agent_analysis(resume_text, job_description)
+                return
+            except Exception as e:
+                print(f"❌ AutoGen streamed analysis failed: {str(e)}")
+                yield "complete", {
+                    "error": f"AutoGen analysis failed: {str(e)}",
+                    "analysis_timestamp": self._get_timestamp(),
+                    "analysis_method": "AutoGen GPT-4o-mini Agents (Failed)"
+                }
+                return
+        
+        for section in self.ANALYSIS_SECTIONS:
+            if section in result:
+                yield section, result[section]
+        yield "complete", result
+    
+    def _stream_multi_agent_analysis(self, resume_text: str, job_description: str) -> Iterator[Tuple[str, Dict]]:
+        """Stream the multi-agent analysis through the analysis cache and single-flight.
+        
+        The analysis runs on its own thread under the same cache key as analyze_resume. The
+        request that computes it streams each section as its agent finishes; cache hits and
+        requests coalesced with an identical in-flight analysis get every section at once
+        when the shared result is ready. A disconnected client does not stop the analysis,
+        so its result is still cached for the requests waiting on it.
+        """
+        events = queue.Queue()
+        
+        def compute():
+            for section, section_result in self._iter_multi_agent_analysis(resume_text, job_description):
+                if section == "complete":
+                    return section_result
+                events.put((section, section_result))
         
+        def run():
+            try:
+                events.put(("complete", self._cached("analyze", resume_text, job_description, compute)))
+            except Exception as e:
+                events.put(("failed", e))
+        
+        threading.Thread(target=run, name="analysis-stream", daemon=True).start()
+        streamed = set()
+        while True:
+            section, section_result = events.get()
+            if section == "failed":
+                raise section_result
+            if section == "complete":
+                for name in self.ANALYSIS_SECTIONS:
+                    if name not in streamed and name in section_result:
+                        yield name, section_result[name]
+                yield "complete", section_result
+                return
+            streamed.add(section)
+            yield section, section_result
+    
+    def _iter_multi_agent_analysis(self, resume_text: str, job_description: str = "",
+                                   reused: Optional[Dict[str, Dict]] = None) -> Iterator[Tuple[str, Dict]]:
+        """Run the specialized agents concurrently, yielding each section as soon as it is ready.
+        
+        Sections in `reused` are taken as they are instead of running their agent.
+        """
+        reused = reused or {}
+        print(f"🤖 Starting AutoGen analysis for resume ({len(resume_text)} characters)")
+        deadline = time.monotonic() + self.analysis_deadline
+        
+        # Deterministic text statistics are exact and computed locally in microseconds;
+        # they are released together with the ATS Specialist's qualitative fields
+        analysis_details = self._analyze_text_content(resume_text)
+        
+        # Run the specialized agents concurrently; wall time approaches the slowest agent
+        tasks = {section: task for section, task in self._agent_tasks(resume_text, job_description, deadline).items()
+                 if section not in reused}
+        if not self.transport:
+            print("🔑 OpenAI API key not configured - using rule-based analysis for every section")
+            outcomes = self._skipped_model_outcomes(tasks, "OpenAI API key not configured")
+        elif self.circuit_breaker.state == CircuitBreaker.OPEN:
+            print("🔌 LLM circuit open - using rule-based analysis for every section")
+            outcomes = self._skipped_model_outcomes(tasks, "LLM circuit open - model skipped")
+        else:
+            outcomes = self.agent_runner.iter_completed(tasks, timeout=self.analysis_deadline)
+        # Reused sections are ready before any agent finishes
+        outcomes = itertools.chain(((section, result, None, None) for section, result in reused.items()), outcomes)
+        
+        # Merge partial results; sections whose agent failed or missed the deadline
+        # are replaced by the rule-based analysis and reported as degraded
+        sections = {}
+        agent_errors = {}
+        agent_timings = {}
+        degraded_sections = []
+        for section, section_result, error, duration in outcomes:
+            if duration is not None:
+                agent_timings[section] = duration
+            if error is None and isinstance(section_result, dict) and section_result.get("error"):
+                error = section_result["error"]
+            if error is not None:
+                print(f"🛟 {section} degraded to rule-based analysis: {error}")
+                metrics.LLM_DEGRADED_SECTIONS.labels(section=section).inc()
+                agent_errors[section] = error
+                section_result = self._rule_based_section(section, resume_text, job_description)
+                degraded_sections.append(section)
+            
+            if section == "ats_score":
+                self._merge_qualitative_content(section_result, analysis_details)
+                if error is not None:
+                    # The qualitative content fields come from the ATS Specialist
+                    degraded_sections.append("analysis_details")
+                sections["analysis_details"] = analysis_details
+                yield "analysis_details", analysis_details
+            sections[section] = section_result
+            yield section, section_result
+        
+        result = {section: sections[section] for section in self.ANALYSIS_SECTIONS}
+        result.update({
+            "agent_errors": agent_errors,
+            "agent_timings": agent_timings,
+            "degraded_sections": [section for section in self.ANALYSIS_SECTIONS if section in degraded_sections],
+            "analysis_timestamp": self._get_timestamp(),
+            "analysis_method": "AutoGen GPT-4o-mini Agents"
+        })
+        
+        print(f"✅ AutoGen analysis completed - ATS Score: {result['ats_score'].get('overall_score', 0)}")
+        yield "complete", result
+    
+    def _incremental_enabled(self, document_id: str) -> bool:
+        """Incremental re-analysis needs a document id, the history store and a model"""
+        return bool(document_id) and self.history is not None and bool(self.transport)
+    
+    def _run_incremental_analysis(self, resume_text: str, job_description: str, document_id: str) -> Dict:
+        """Analyze a document, re-running only the agents whose inputs changed"""
         try:
-            print(f"🤖 Starting AutoGen analysis for resume ({len(resume_text)} characters)")
+            for section, section_result in self._iter_incremental_analysis(resume_text, job_description, document_id):
+                if section == "complete":
+                    return section_result
+        except Exception as e:
+            print(f"❌ Incremental analysis failed: {str(e)}")
+            return {
+                "error": f"AutoGen analysis failed: {str(e)}",
+                "analysis_timestamp": self._get_timestamp(),
+                "analysis_method": "AutoGen GPT-4o-mini Agents (Failed)"
+            }
+    
+    def _iter_incremental_analysis(self, resume_text: str, job_description: str,
+                                   document_id: str) -> Iterator[Tuple[str, Dict]]:
+        """Diff the resume sections and job description against the document's previous
+        analysis, reuse the sections whose agent inputs are unchanged and run the rest"""
+        hashes = section_hashes(resume_text)
+        job_description_hash = self._text_hash(job_description)
+        fingerprints = self._input_fingerprints(hashes, job_description_hash)
+        previous = self.history.get(document_id)
+        
+        reused = {}
+        if previous is not None:
+            for section, fingerprint in fingerprints.items():
+                if previous["fingerprints"].get(section) == fingerprint and section in previous["sections"]:
+                    reused[section] = previous["sections"][section]
+            if "ats_score" in reused:
+                # The ATS Specialist also produced the qualitative content fields
+                details = previous["sections"].get("analysis_details", {})
+                reused["ats_score"] = dict(reused["ats_score"], **{
+                    field: details[field] for field in self.QUALITATIVE_CONTENT_FIELDS if field in details
+                })
+        rerun = [section for section in fingerprints if section not in reused]
+        print(f"♻️ Incremental analysis of {document_id}: reusing {', '.join(reused) or 'nothing'}, "
+              f"re-running {', '.join(rerun) or 'nothing'}")
+        
+        for section, section_result in self._iter_multi_agent_analysis(resume_text, job_description, reused=reused):
+            if section == "complete":
+                section_result["incremental"] = {
+                    "document_id": document_id,
+                    "previous_analysis": previous is not None,
+                    "changed_resume_sections": self._changed_sections(previous, hashes),
+                    "job_description_changed": previous is not None and previous["job_description_hash"] != job_description_hash,
+                    "reused_sections": list(reused),
+                    "rerun_sections": rerun
+                }
+                # Degraded sections get no fingerprint, so their agents run again next time
+                degraded = set(section_result.get("degraded_sections", []))
+                try:
+                    self.history.save(
+                        document_id, hashes, job_description_hash,
+                        {name: fingerprint for name, fingerprint in fingerprints.items() if name not in degraded},
+                        {name: section_result[name] for name in self.ANALYSIS_SECTIONS}
+                    )
+                except Exception as e:
+                    print(f"⚠️ Failed to store analysis history for {document_id}: {e}")
+            yield section, section_result
+    
+    def _input_fingerprints(self, hashes: Dict[str, str], job_description_hash: str) -> Dict[str, str]:
+        """Fingerprint of everything each agent's output depends on"""
+        fingerprints = {}
+        for section, inputs in self.AGENT_INPUTS.items():
+            payload = {
+                "section": section,
+                "resume_sections": {name: value for name, value in hashes.items()
+                                    if inputs["header"] or name != HEADER_SECTION},
+                "job_description": job_description_hash if inputs["job_description"] else None,
+                "model": self.model,
+                "temperature": self.temperature,
+                "prompt_version": self.PROMPT_VERSION
+            }
+            fingerprints[section] = self._text_hash(json.dumps(payload, sort_keys=True))
+        return fingerprints
+    
+    @staticmethod
+    def _changed_sections(previous: Optional[Dict], hashes: Dict[str, str]) -> List[str]:
+        """Resume sections added, removed or edited since the previous analysis"""
+        if previous is None:
+            return []
+        old_hashes = previous["section_hashes"]
+        return sorted(name for name in set(old_hashes) | set(hashes) if old_hashes.get(name) != hashes.get(name))
+    
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        """Hash of text, ignoring whitespace differences"""
+        return hashlib.sha256(normalize_for_key(text).encode("utf-8")).hexdigest()
+    
+    def _run_combined_analysis(self, resume_text: str, job_description: str = "") -> Dict:
+        """Produce every analysis section from a single structured-output request"""
+        try:
+            print(f"🤖 Starting combined-agent analysis for resume ({len(resume_text)} characters)")
+            deadline = time.monotonic() + self.analysis_deadline
             
-            # Get analysis from different specialized agents
-            ats_score = self.calculate_ats_score(resume_text, job_description)
-            analysis_details = self._analyze_text_content(resume_text)
-            suggestions = self.get_improvement_suggestions(resume_text, job_description)
-            keywords_analysis = self.extract_keywords(job_description, resume_text)
-            skills_analysis = self.extract_skills(resume_text)
+            agent_errors = {}
+            if self.circuit_breaker.state == CircuitBreaker.OPEN:
+                response = {"error": "LLM circuit open - model skipped"}
+            else:
+                combined = self._with_deadline(
+                    lambda: self._combined_agent(resume_text, job_description, include_skills=self.skills_llm_enrichment),
+                    deadline
+                )
+                outcome = self.agent_runner.run({"combined": combined}, timeout=self.analysis_deadline)
+                response = outcome["results"].get("combined")
+                if not isinstance(response, dict):
+                    response = {"error": outcome["errors"].get("combined") or "Combined agent returned no analysis"}
+            if response.get("error"):
+                agent_errors["combined"] = response["error"]
             
-            # Combine all results
-            result = {
-                "ats_score": ats_score,
-                "analysis_details": analysis_details,
-                "suggestions": suggestions,
-                "keywords_analysis": keywords_analysis,
-                "skills_analysis": skills_analysis,
+            # Sections the combined agent did not deliver fall back to the rule-based analysis
+            result = {"skills_analysis": self._combined_skills(resume_text, response)}
+            degraded_sections = []
+            for section in self.ANALYSIS_SECTIONS:
+                if section in self.LOCAL_SECTIONS:
+                    continue
+                section_result = response.get(section)
+                if isinstance(section_result, dict) and not section_result.get("error"):
+                    result[section] = section_result
+                    continue
+                degraded_sections.append(section)
+                if section == "analysis_details":
+                    result[section] = {}
+                    continue
+                if not response.get("error"):
+                    agent_errors[section] = f"Combined agent did not return {section}"
+                result[section] = self._rule_based_section(section, resume_text, job_description)
+            
+            # Replace the model's estimates with exact local statistics and similarity
+            if "keywords_analysis" not in degraded_sections:
+                result["keywords_analysis"] = self._with_local_match(result["keywords_analysis"], resume_text,
+                                                                     job_description)
+            qualitative = result["analysis_details"]
+            result["analysis_details"] = self._analyze_text_content(resume_text)
+            for field in self.QUALITATIVE_CONTENT_FIELDS:
+                if field in qualitative:
+                    result["analysis_details"][field] = qualitative[field]
+            if degraded_sections:
+                print(f"🛟 Degraded to rule-based analysis: {', '.join(degraded_sections)}")
+            for section in degraded_sections:
+                metrics.LLM_DEGRADED_SECTIONS.labels(section=section).inc()
+            
+            result = {section: result[section] for section in self.ANALYSIS_SECTIONS}
+            result.update({
+                "agent_errors": agent_errors,
+                "degraded_sections": degraded_sections,
                 "analysis_timestamp": self._get_timestamp(),
-                "analysis_method": "AutoGen GPT-4o-mini Agents"
-            }
+                "analysis_method": "AutoGen GPT-4o-mini Combined Agent"
+            })
             
-            print(f"✅ AutoGen analysis completed - ATS Score: {ats_score.get('overall_score', 0)}")
+            print(f"✅ Combined-agent analysis completed - ATS Score: {result['ats_score'].get('overall_score', 0)}")
             return result
             
         except Exception as e:
-            print(f"❌ AutoGen analysis failed: {str(e)}")
+            print(f"❌ Combined-agent analysis failed: {str(e)}")
             return {
-                "error": f"AutoGen analysis failed: {str(e)}",
+                "error": f"Combined-agent analysis failed: {str(e)}",
                 "analysis_timestamp": self._get_timestamp(),
-                "analysis_method": "AutoGen GPT-4o-mini Agents (Failed)"
+                "analysis_method": "AutoGen GPT-4o-mini Combined Agent (Failed)"
             }
     
-    def calculate_ats_score(self, resume_text: str, job_description: str = "") -> Dict:
+    def _combined_skills(self, resume_text: str, response: Dict) -> Dict:
+        """Local skills extraction, enriched with the combined agent's estimates when it was asked for them"""
+        local = self.skills_extractor.extract(resume_text)
+        if not self.skills_llm_enrichment:
+            return local
+        estimates = response.get("skills_analysis")
+        if response.get("error") or not isinstance(estimates, dict) or estimates.get("error"):
+            error = response.get("error") or "Combined agent did not return skills_analysis"
+            print(f"⚠️ Skills enrichment skipped: {error}")
+            local["enrichment_error"] = error
+            return local
+        return self.skills_extractor.enrich(local, estimates)
+    
+    def _combined_agent(self, resume_text: str, job_description: str = "", include_skills: bool = False) -> Dict:
+        """Combined Resume Analyst - send the resume and job description to the model once.
+        
+        Skills are extracted locally; `include_skills` also asks for the proficiency
+        estimates used to enrich them.
+        """
+        print("🧩 Combined Resume Analyst analyzing resume...")
+        
+        skills_task = """
+            5. skills_analysis: technical, professional and soft skills plus certifications, each
+               with an estimated level (Beginner, Intermediate, Advanced, Expert or Certified),
+               years of experience and category.""" if include_skills else ""
+        skills_example = """,
+                "skills_analysis": {
+                    "technical_skills": [{"name": "Python", "level": "Advanced", "years": 4, "category": "Programming"}],
+                    "professional_skills": [{"name": "Project Management", "level": "Advanced", "years": 5, "category": "Management"}],
+                    "soft_skills": [{"name": "Communication", "level": "Advanced", "years": 5, "category": "Interpersonal"}],
+                    "certifications": [{"name": "AWS Certified Solutions Architect", "level": "Certified", "years": 1, "category": "Cloud"}],
+                    "all_skills": [{"name": "Python", "level": "Advanced", "years": 4, "category": "Programming"}],
+                    "skills_summary": {
+                        "total_skills": 4,
+                        "technical_count": 1,
+                        "professional_count": 1,
+                        "soft_skills_count": 1,
+                        "certifications_count": 1,
+                        "average_experience_years": 3.8,
+                        "skill_level_distribution": {"Advanced": 3, "Certified": 1}
+                    }
+                }""" if include_skills else ""
+        
+        prompt = f"""You are a team of resume experts working together: an ATS specialist,
+            a content analyst, a career counselor{", a keyword optimization expert and a skills extraction specialist" if include_skills else " and a keyword optimization expert"}.
+            Analyze the resume once and answer for the whole team.
+
+            RESUME TEXT:
+            {resume_text}
+
+            JOB DESCRIPTION (if provided):
+            {self._job_prompt(job_description) if job_description else "No specific job description provided - use general ATS criteria"}
+
+            Produce the following sections:
+            1. ats_score: score the resume out of 100 - format and structure (30 points),
+               keywords matching (25), content quality (25), sections completeness (20).
+            2. analysis_details: overall content quality and key observations (text statistics
+               are computed separately, do not include them).
+            3. suggestions: specific, actionable improvements and current strengths.
+            4. keywords_analysis: keywords from the job description and resume, matches, missing
+               keywords, keyword density and match percentage.{skills_task}
+
+            Return a single valid JSON object with exactly this structure:
+            {{
+                "ats_score": {{
+                    "overall_score": 85,
+                    "max_score": 100,
+                    "grade": "B+",
+                    "interpretation": "Good ATS compatibility with minor improvements needed",
+                    "detailed_scores": {{"format_score": 25, "keywords_score": 20, "content_score": 22, "sections_score": 18}},
+                    "recommendations": ["Add more industry-specific keywords"],
+                    "strengths": ["Well-structured format"],
+                    "areas_for_improvement": ["Need more specific achievements"]
+                }},
+                "analysis_details": {{
+                    "content_quality": "Professional with room for improvement",
+                    "key_observations": ["Clear section headers throughout"]
+                }},
+                "suggestions": {{
+                    "priority_improvements": ["Add quantifiable achievements with specific numbers"],
+                    "content_suggestions": ["Replace weak action verbs with stronger alternatives"],
+                    "formatting_tips": ["Use consistent bullet point style throughout the document"],
+                    "keyword_recommendations": ["Incorporate keywords from the job description naturally"],
+                    "strengths": ["Complete contact information and professional email"],
+                    "missing_elements": ["Professional summary section at the top"]
+                }},
+                "keywords_analysis": {{
+                    "job_description_keywords": ["python", "machine learning", "sql"],
+                    "resume_keywords": ["python", "data analysis", "react"],
+                    "matching_keywords": ["python"],
+                    "missing_keywords": ["machine learning", "sql"],
+                    "keyword_density": 4.2,
+                    "match_percentage": 33.3,
+                    "critical_missing_keywords": ["machine learning"],
+                    "keyword_suggestions": ["Add 'machine learning' in skills section with specific projects"],
+                    "industry_keywords": ["data science", "analytics"]
+                }}{skills_example}
+            }}"""
+
+        return self._call_structured_agent(prompt, "Combined Resume Analyst",
+                                           "combined" if include_skills else "combined_without_skills",
+                                           max_tokens=self.combined_max_tokens)
+    
+    def _ats_specialist_agent(self, resume_text: str, job_description: str = "") -> Dict:
         """ATS Specialist Agent - Calculate ATS compatibility score using GPT-4o-mini"""
         try:
             print("🎯 ATS Specialist Agent analyzing resume...")
@@ -87,7 +847,7 @@ class AutoGenResumeAnalysisService:
             {resume_text}
 
             JOB DESCRIPTION (if provided):
-            {job_description if job_description else "No specific job description provided - use general ATS criteria"}
+            {self._job_prompt(job_description) if job_description else "No specific job description provided - use general ATS criteria"}
 
             Please evaluate and score the resume on these criteria (total 100 points):
 
@@ -115,6 +875,9 @@ class AutoGenResumeAnalysisService:
                - Professional summary or objective
                - Additional relevant sections
 
+            Also give a short overall assessment of the content quality and your key
+            observations about the resume's content and presentation.
+
             Return your response as a valid JSON object with this exact structure:
             {{
                 "overall_score": 85,
@@ -138,11 +901,16 @@ class AutoGenResumeAnalysisService:
                 "areas_for_improvement": [
                     "Missing technical keywords",
                     "Need more specific achievements"
+                ],
+                "content_quality": "Professional with room for improvement",
+                "key_observations": [
+                    "Well-structured professional experience section",
+                    "Clear section headers throughout",
+                    "Good use of action verbs"
                 ]
             }}"""
 
-            response = self._call_gpt4_agent(prompt, "ATS Specialist")
-            return self._parse_json_response(response, "ats_score")
+            return self._call_structured_agent(prompt, "ATS Specialist", "ats_score")
             
         except Exception as e:
             print(f"❌ ATS Specialist Agent failed: {str(e)}")
@@ -152,10 +920,11 @@ class AutoGenResumeAnalysisService:
                 "grade": "F",
                 "interpretation": f"ATS analysis failed: {str(e)}",
                 "detailed_scores": {},
-                "recommendations": ["Please try again with a valid resume"]
+                "recommendations": ["Please try again with a valid resume"],
+                "error": f"ATS analysis failed: {str(e)}"
             }
     
-    def get_improvement_suggestions(self, resume_text: str, job_description: str = "") -> Dict:
+    def _career_counselor_agent(self, resume_text: str, job_description: str = "") -> Dict:
         """Career Counselor Agent - Get detailed improvement suggestions using GPT-4o-mini"""
         try:
             print("💡 Career Counselor Agent generating suggestions...")
@@ -167,7 +936,7 @@ class AutoGenResumeAnalysisService:
             {resume_text}
 
             JOB DESCRIPTION (if provided):
-            {job_description if job_description else "No specific job description - provide general improvements"}
+            {self._job_prompt(job_description) if job_description else "No specific job description - provide general improvements"}
 
             Please provide detailed improvement suggestions focusing on:
             1. Content improvements and enhancements
@@ -212,8 +981,7 @@ class AutoGenResumeAnalysisService:
                 ]
             }}"""
 
-            response = self._call_gpt4_agent(prompt, "Career Counselor")
-            return self._parse_json_response(response, "suggestions")
+            return self._call_structured_agent(prompt, "Career Counselor", "suggestions")
             
         except Exception as e:
             print(f"❌ Career Counselor Agent failed: {str(e)}")
@@ -227,7 +995,7 @@ class AutoGenResumeAnalysisService:
                 "error": f"Suggestions generation failed: {str(e)}"
             }
     
-    def extract_keywords(self, job_description: str, resume_text: str = "") -> Dict:
+    def _keyword_optimization_agent(self, job_description: str, resume_text: str = "") -> Dict:
         """Keyword Optimization Agent - Analyze keywords using GPT-4o-mini"""
         try:
             print("🔍 Keyword Optimization Agent analyzing keywords...")
@@ -236,7 +1004,7 @@ class AutoGenResumeAnalysisService:
             Your role is to analyze keyword matching between resumes and job descriptions.
 
             JOB DESCRIPTION:
-            {job_description if job_description else "No job description provided - analyze resume keywords only"}
+            {self._job_prompt(job_description) if job_description else "No job description provided - analyze resume keywords only"}
 
             RESUME TEXT:
             {resume_text}
@@ -278,8 +1046,7 @@ class AutoGenResumeAnalysisService:
                 ]
             }}"""
 
-            response = self._call_gpt4_agent(prompt, "Keyword Optimization Agent")
-            return self._parse_json_response(response, "keywords")
+            return self._call_structured_agent(prompt, "Keyword Optimization Agent", "keywords")
             
         except Exception as e:
             print(f"❌ Keyword Optimization Agent failed: {str(e)}")
@@ -293,102 +1060,259 @@ class AutoGenResumeAnalysisService:
                 "error": f"Keyword extraction failed: {str(e)}"
             }
     
-    def _analyze_text_content(self, text: str) -> Dict:
-        """Content Analysis Agent - Analyze text structure and readability using GPT-4o-mini"""
+    def _requirements_extraction_agent(self, job_description: str) -> Dict:
+        """Requirements Extraction Agent - Extract the requirements of a job description using GPT-4o-mini"""
         try:
-            print("📊 Content Analysis Agent analyzing text structure...")
+            print("📋 Requirements Extraction Agent analyzing job description...")
             
-            prompt = f"""You are a professional content analysis expert.
-            Analyze this resume text and provide detailed metrics and observations.
+            prompt = f"""You are a technical recruiter. Extract the hiring requirements from this
+            job description so it can be compared with resumes without re-reading the full posting.
+
+            JOB DESCRIPTION:
+            {job_description}
+
+            Keep every entry short (a few words). Return a valid JSON object with this exact structure:
+            {{
+                "title": "Senior Backend Engineer",
+                "required_skills": ["python", "flask", "postgresql", "aws"],
+                "preferred_skills": ["kafka", "kubernetes"],
+                "experience": "5+ years backend development",
+                "education": "BS in Computer Science or equivalent",
+                "certifications": [],
+                "responsibilities": ["Design REST APIs", "Mentor junior engineers"]
+            }}"""
+
+            return self._call_structured_agent(prompt, "Requirements Extraction Agent", "job_requirements",
+                                               max_tokens=600)
+            
+        except Exception as e:
+            print(f"❌ Requirements Extraction Agent failed: {str(e)}")
+            return {"error": f"Requirements extraction failed: {str(e)}"}
+    
+    def _job_match_agent(self, resume_text: str, job_descriptions: List[str]) -> Dict:
+        """Job Match Analyst - score one resume against a group of job descriptions in one request"""
+        print(f"🧮 Job Match Analyst comparing resume with {len(job_descriptions)} job descriptions...")
+        
+        jobs = "\n\n".join(f"JOB DESCRIPTION {number}:\n{self._job_prompt(job_description)}"
+                            for number, job_description in enumerate(job_descriptions, start=1))
+        prompt = f"""You are an expert ATS specialist and keyword optimization expert.
+            Compare ONE resume with EACH of the numbered job descriptions below.
 
             RESUME TEXT:
-            {text}
+            {resume_text}
 
-            Please analyze and provide:
-            1. Text statistics (word count, readability, etc.)
-            2. Resume sections identified
-            3. Overall content quality assessment
-            4. Professional presentation evaluation
+            {jobs}
 
-            Return your response as a valid JSON object with this exact structure:
+            For each job description, score the resume out of 100 - format and structure
+            (30 points), keywords matching (25), content quality (25), sections completeness (20) -
+            and analyze which of the job's keywords the resume matches and which are missing.
+
+            Return a valid JSON object with one entry per job description, in order:
             {{
-                "word_count": 450,
-                "sentence_count": 25,
-                "character_count": 2800,
-                "average_words_per_sentence": 18.0,
-                "sections_identified": ["Contact", "Summary", "Experience", "Education", "Skills"],
-                "readability_score": 75.5,
-                "content_quality": "Professional with room for improvement",
-                "key_observations": [
-                    "Well-structured professional experience section",
-                    "Clear section headers throughout",
-                    "Good use of action verbs"
+                "job_matches": [
+                    {{
+                        "job_index": 1,
+                        "overall_score": 85,
+                        "grade": "B+",
+                        "interpretation": "Good match with minor gaps",
+                        "detailed_scores": {{"format_score": 25, "keywords_score": 20, "content_score": 22, "sections_score": 18}},
+                        "matching_keywords": ["python", "sql"],
+                        "missing_keywords": ["kubernetes"],
+                        "critical_missing_keywords": ["kubernetes"],
+                        "match_percentage": 66.7,
+                        "keyword_suggestions": ["Mention any Kubernetes deployment experience"]
+                    }}
                 ]
             }}"""
 
-            response = self._call_gpt4_agent(prompt, "Content Analysis Agent")
-            return self._parse_json_response(response, "analysis")
-            
-        except Exception as e:
-            print(f"❌ Content Analysis Agent failed: {str(e)}")
+        return self._call_structured_agent(
+            prompt, "Job Match Analyst", "job_match",
+            max_tokens=min(400 * len(job_descriptions) + 200, self.combined_max_tokens)
+        )
+    
+    def _job_prompt(self, job_description: str) -> str:
+        """Text the agents see for a job description: its compact prompt text when registered"""
+        if not job_description or self.job_registry is None:
+            return job_description
+        stored = self.job_registry.find(job_description)
+        return stored["prompt_text"] if stored else job_description
+    
+    def _merge_job_match(self, local_result: Dict, match: Optional[Dict]) -> Dict:
+        """Combine the Job Match Analyst's answer for one job description with its rule-based result"""
+        if not match:
             return {
-                "error": f"Content analysis failed: {str(e)}"
+                "ats_score": local_result["ats_score"],
+                "keywords_analysis": local_result["keywords_analysis"],
+                "degraded_sections": ["ats_score", "keywords_analysis"]
             }
+        
+        ats_score = dict(local_result["ats_score"])
+        for field in ("overall_score", "grade", "interpretation", "detailed_scores"):
+            if field in match:
+                ats_score[field] = match[field]
+        keywords_analysis = dict(local_result["keywords_analysis"])
+        # match_percentage stays the local TF-IDF similarity
+        for field in ("matching_keywords", "missing_keywords", "critical_missing_keywords", "keyword_suggestions"):
+            if field in match:
+                keywords_analysis[field] = match[field]
+        return {"ats_score": ats_score, "keywords_analysis": keywords_analysis, "degraded_sections": []}
     
-    def _call_gpt4_agent(self, prompt: str, agent_name: str) -> str:
-        """Call GPT-4o-mini as a specialized agent"""
-        try:
-            print(f"🤖 Calling {agent_name} with GPT-4o-mini...")
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": f"You are {agent_name}, a highly specialized AI agent. Always return valid JSON responses as requested."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=self.temperature,
-                max_tokens=2000
+    @staticmethod
+    def _job_title(job_description: str) -> str:
+        """First non-empty line of a job description, shortened for display"""
+        for line in job_description.splitlines():
+            if line.strip():
+                return line.strip()[:80]
+        return ""
+    
+    def _analyze_text_content(self, text: str) -> Dict:
+        """Compute exact text statistics locally; the qualitative fields come from the ATS Specialist"""
+        return self.rule_based_service._analyze_text_content(text)
+    
+    def _merge_qualitative_content(self, ats_score: Dict, analysis_details: Dict) -> None:
+        """Move the ATS Specialist's qualitative content fields into analysis_details"""
+        for field in self.QUALITATIVE_CONTENT_FIELDS:
+            if field in ats_score:
+                analysis_details[field] = ats_score.pop(field)
+    
+    def _call_gpt4_agent(self, prompt: str, agent_name: str, max_tokens: int = 2000,
+                         response_format: Optional[Dict] = None) -> str:
+        """Call GPT-4o-mini as a specialized agent.
+        
+        Transient failures are retried with exponential backoff while the request
+        deadline allows; timeouts, connection errors, 429 and 5xx responses count as
+        circuit breaker failures. Raises CircuitOpenError while the circuit is open.
+        """
+        deadline = getattr(self._request_context, "deadline", None) or time.monotonic() + self.analysis_deadline
+        
+        request_options = {}
+        if response_format:
+            request_options["response_format"] = response_format
+        
+        attempt = 0
+        while True:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("request deadline exceeded")
+                if not self.circuit_breaker.allow_request():
+                    raise CircuitOpenError("LLM circuit open - model skipped")
+                
+                print(f"🤖 Calling {agent_name} with GPT-4o-mini...")
+                started = time.perf_counter()
+                try:
+                    response = self.transport.complete(
+                        model=self.model,
+                        messages=[
+                            {
+                                "role": "system", 
+                                "content": f"You are {agent_name}, a highly specialized AI agent. Always return valid JSON responses as requested."
+                            },
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=self.temperature,
+                        max_tokens=max_tokens,
+                        timeout=min(self.agent_read_timeouts.get(agent_name, self.agent_timeout), remaining),
+                        **request_options
+                    )
+                except Exception as e:
+                    # Only outages count towards opening the circuit; a rejected request says
+                    # nothing about the health of the API
+                    if is_transport_failure(e):
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.record_ignored()
+                    metrics.LLM_AGENT_DURATION.labels(agent=agent_name, outcome="error").observe(
+                        time.perf_counter() - started
+                    )
+                    raise
+                self.circuit_breaker.record_success()
+                metrics.LLM_AGENT_DURATION.labels(agent=agent_name, outcome="success").observe(
+                    time.perf_counter() - started
+                )
+                for kind in ("prompt_tokens", "completion_tokens"):
+                    metrics.LLM_TOKENS.labels(agent=agent_name, kind=kind.split("_")[0]).observe(
+                        response.usage.get(kind) or 0
+                    )
+                
+                result = response.content.strip()
+                print(f"✅ {agent_name} responded successfully")
+                return result
+                
+            except CircuitOpenError:
+                print(f"🔌 {agent_name} skipped - LLM circuit open")
+                raise
+            except Exception as e:
+                # Full jitter keeps concurrent agents from retrying in lockstep
+                delay = self.retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                if (attempt >= self.max_retries or not is_retryable_error(e)
+                        or time.monotonic() + delay >= deadline):
+                    print(f"❌ {agent_name} API call failed: {str(e)}")
+                    raise Exception(f"{agent_name} analysis failed: {str(e)}")
+                attempt += 1
+                print(f"🔁 {agent_name} attempt {attempt} failed ({str(e)}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+    
+    def _call_structured_agent(self, prompt: str, agent_name: str, kind: str, max_tokens: int = 2000) -> Dict:
+        """Call an agent for schema-constrained JSON.
+        
+        Output that cannot be parsed, repaired or validated is re-asked from this agent
+        alone (up to LLM_OUTPUT_RETRIES times), so one bad response never costs a full
+        re-analysis.
+        """
+        response_format = structured_output.response_format(kind, strict=self.strict_output)
+        result = self._parse_json_response(
+            self._call_gpt4_agent(prompt, agent_name, max_tokens=max_tokens, response_format=response_format), kind
+        )
+        
+        for attempt in range(self.output_retries):
+            if not result.get("error"):
+                break
+            print(f"🔁 {agent_name} returned unusable output ({result['error']}), asking again")
+            self._count_output("retries")
+            retry_prompt = (f"{prompt}\n\nYour previous response could not be used: {result['error']}. "
+                            f"Return only the JSON object with exactly the required structure.")
+            result = self._parse_json_response(
+                self._call_gpt4_agent(retry_prompt, agent_name, max_tokens=max_tokens, response_format=response_format),
+                kind
             )
-            
-            result = response.choices[0].message.content.strip()
-            print(f"✅ {agent_name} responded successfully")
-            return result
-            
-        except Exception as e:
-            print(f"❌ {agent_name} API call failed: {str(e)}")
-            raise Exception(f"{agent_name} analysis failed: {str(e)}")
+            recovered = not result.get("error")
+            if recovered:
+                self._count_output("retries_recovered")
+            metrics.LLM_OUTPUT_RETRIES.labels(agent=agent_name, outcome="recovered" if recovered else "failed").inc()
+        return result
     
     def _parse_json_response(self, response: str, fallback_key: str) -> Dict:
-        """Parse JSON response with comprehensive fallback"""
-        try:
-            # First try to parse the entire response as JSON
-            return json.loads(response)
-            
-        except json.JSONDecodeError:
-            # Try to extract JSON from markdown code blocks
-            import re
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response, re.DOTALL)
-            if json_match:
-                try:
-                    return json.loads(json_match.group(1))
-                except json.JSONDecodeError:
-                    pass
-            
-            # Try to find JSON object in the response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                try:
-                    return json.loads(json_match.group())
-                except json.JSONDecodeError:
-                    pass
-            
-            print(f"⚠️ Failed to parse JSON response, using fallback for {fallback_key}")
-            
-            # Return appropriate fallback structure
-            return self._get_fallback_response(fallback_key, response)
+        """Parse a JSON response, repairing near-valid JSON locally and validating it against
+        the response schema of `fallback_key`"""
+        parsed, outcome = structured_output.parse_json(response)
+        
+        validate = structured_output.VALIDATORS.get(fallback_key)
+        errors = []
+        if parsed is not None:
+            errors = validate(parsed) if validate else ([] if isinstance(parsed, dict) else ["$: expected object"])
+            if errors:
+                outcome = "invalid"
+        
+        self._count_output("responses")
+        self._count_output(outcome)
+        metrics.LLM_JSON_PARSE.labels(kind=fallback_key, outcome=outcome).inc()
+        if outcome in ("direct", "repaired"):
+            if outcome == "repaired":
+                print(f"🩹 Repaired malformed JSON response for {fallback_key}")
+            return parsed
+        
+        print(f"⚠️ Unusable JSON response for {fallback_key}: {'; '.join(errors[:3]) or 'not JSON'}")
+        result = self._get_fallback_response(fallback_key, response)
+        if errors:
+            result["error"] = f"AI {fallback_key} analysis failed - response does not match the schema ({'; '.join(errors[:3])})"
+            result["schema_errors"] = errors[:10]
+        return result
+    
+    def _count_output(self, outcome: str) -> None:
+        """Count a structured-output event for get_llm_stats"""
+        with self._output_stats_lock:
+            self._output_stats[outcome] += 1
     
     def _get_fallback_response(self, fallback_key: str, raw_response: str) -> Dict:
         """Return error when JSON parsing fails - no mock data"""
@@ -398,6 +1322,23 @@ class AutoGenResumeAnalysisService:
         }
     
     def extract_skills(self, resume_text: str) -> Dict:
+        """Extract and categorize skills with the local ontology matcher.
+        
+        With SKILLS_LLM_ENRICHMENT the Skills Extraction Agent additionally estimates
+        proficiency and years (cached); if it fails the local result is returned as is.
+        """
+        local = self.skills_extractor.extract(resume_text)
+        if not self.skills_llm_enrichment or not self.transport:
+            return local
+        
+        estimates = self._cached("skills", resume_text, "", lambda: self._skills_extraction_agent(resume_text))
+        if estimates.get("error"):
+            print(f"⚠️ Skills enrichment skipped: {estimates['error']}")
+            local["enrichment_error"] = estimates["error"]
+            return local
+        return self.skills_extractor.enrich(local, estimates)
+    
+    def _skills_extraction_agent(self, resume_text: str) -> Dict:
         """Skills Extraction Agent - Extract and categorize skills from resume using GPT-4o-mini"""
         try:
             print("🛠️ Skills Extraction Agent analyzing resume...")
@@ -461,28 +1402,32 @@ class AutoGenResumeAnalysisService:
                 }}
             }}"""
 
-            response = self._call_gpt4_agent(prompt, "Skills Extraction Agent")
-            return self._parse_json_response(response, "skills")
+            return self._call_structured_agent(prompt, "Skills Extraction Agent", "skills")
             
         except Exception as e:
             print(f"❌ Skills Extraction Agent failed: {str(e)}")
-            return {
-                "technical_skills": [],
-                "professional_skills": [],
-                "soft_skills": [],
-                "certifications": [],
-                "all_skills": [],
-                "skills_summary": {
-                    "total_skills": 0,
-                    "technical_count": 0,
-                    "professional_count": 0,
-                    "soft_skills_count": 0,
-                    "certifications_count": 0,
-                    "average_experience_years": 0,
-                    "skill_level_distribution": {}
-                },
-                "error": f"Skills extraction failed: {str(e)}"
+            result = self._empty_skills_analysis()
+            result["error"] = f"Skills extraction failed: {str(e)}"
+            return result
+    
+    def _empty_skills_analysis(self) -> Dict:
+        """Skills analysis with no skills found"""
+        return {
+            "technical_skills": [],
+            "professional_skills": [],
+            "soft_skills": [],
+            "certifications": [],
+            "all_skills": [],
+            "skills_summary": {
+                "total_skills": 0,
+                "technical_count": 0,
+                "professional_count": 0,
+                "soft_skills_count": 0,
+                "certifications_count": 0,
+                "average_experience_years": 0,
+                "skill_level_distribution": {}
             }
+        }
     
     def _get_timestamp(self) -> str:
         """Get current timestamp"""
@@ -0,0 +1,268 @@
+from typing import Callable, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from src.utils.sqlite import connect, initialize
+
+
+class AnalysisJobQueue:
+    """Background analysis jobs backed by SQLite so job state survives worker restarts.
+
+    Every process owns the jobs it queued or claimed under a random owner id and keeps them
+    leased with a heartbeat; on every beat it also re-queues jobs whose lease has expired, so
+    a surviving worker picks up orphans even while it receives no new submissions.
+    Unlike process ids, owner ids are never reused after a container restart.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    def __init__(self, db_path: str, processor: Callable[[bytes, str, str], Dict],
+                 max_workers: int = 2, retention_seconds: float = 24 * 60 * 60, lease_seconds: float = 30.0):
+        """Initialize the queue.
+
+        `processor(pdf_bytes, filename, job_description)` runs one job and returns its result.
+        Leases are renewed every `lease_seconds / 3`, so a job is only taken over once its
+        owner has missed several heartbeats.
+        """
+        self.db_path = db_path
+        self.processor = processor
+        self.max_workers = max_workers
+        self.retention_seconds = retention_seconds
+        self.lease_seconds = lease_seconds
+        self._executor = None
+        self._executor_pid = None
+        self._owner_id = None
+        self._owner_pid = None
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_db()
+        self._recover_orphaned_jobs()
+        # Start the heartbeat now so idle workers keep sweeping for orphans
+        self._get_executor()
+
+    def submit(self, pdf_bytes: bytes, filename: str, job_description: str = "") -> Dict:
+        """Persist a new job and schedule it; returns immediately with the job id"""
+        self._recover_orphaned_jobs()
+        self._purge_expired_jobs()
+
+        job_id = uuid.uuid4().hex
+        with connect(self.db_path) as conn:
+            conn.execute(
+                """INSERT INTO analysis_jobs (id, status, filename, pdf_data, job_description, owner_id,
+                                              lease_expires_at, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (job_id, self.STATUS_QUEUED, filename, sqlite3.Binary(pdf_bytes),
+                 job_description, self._owner(), time.time() + self.lease_seconds, time.time())
+            )
+
+        self._get_executor().submit(self._run_job, job_id)
+        print(f"📥 Queued analysis job {job_id}")
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return the status (and result, once finished) of a job"""
+        with connect(self.db_path) as conn:
+            row = conn.execute(
+                """SELECT id, status, filename, result, error, created_at, started_at, finished_at
+                   FROM analysis_jobs WHERE id = ?""",
+                (job_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        job = {
+            "job_id": row["id"],
+            "status": row["status"],
+            "filename": row["filename"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "wait_time": self._elapsed(row["created_at"], row["started_at"]),
+            "run_time": self._elapsed(row["started_at"], row["finished_at"])
+        }
+        if row["result"]:
+            job["result"] = json.loads(row["result"])
+        if row["error"]:
+            job["error"] = row["error"]
+        return job
+
+    def stats(self) -> Dict:
+        """Return queue depth and average wait/run times of recently finished jobs"""
+        with connect(self.db_path) as conn:
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM analysis_jobs GROUP BY status"
+            ).fetchall())
+            timings = conn.execute(
+                """SELECT AVG(started_at - created_at), AVG(finished_at - started_at),
+                          MAX(started_at - created_at), MAX(finished_at - started_at)
+                   FROM analysis_jobs WHERE finished_at IS NOT NULL AND finished_at > ?""",
+                (time.time() - 60 * 60,)
+            ).fetchone()
+
+        return {
+            "queue_depth": counts.get(self.STATUS_QUEUED, 0),
+            "running": counts.get(self.STATUS_RUNNING, 0),
+            "completed": counts.get(self.STATUS_COMPLETED, 0),
+            "failed": counts.get(self.STATUS_FAILED, 0),
+            "max_workers": self.max_workers,
+            "avg_wait_time": round(timings[0] or 0, 3),
+            "avg_run_time": round(timings[1] or 0, 3),
+            "max_wait_time": round(timings[2] or 0, 3),
+            "max_run_time": round(timings[3] or 0, 3)
+        }
+
+    def _run_job(self, job_id: str) -> None:
+        """Claim a queued job, process it and store the outcome"""
+        with connect(self.db_path) as conn:
+            claimed = conn.execute(
+                """UPDATE analysis_jobs SET status = ?, owner_id = ?, lease_expires_at = ?, started_at = ?
+                   WHERE id = ? AND status = ?""",
+                (self.STATUS_RUNNING, self._owner(), time.time() + self.lease_seconds, time.time(),
+                 job_id, self.STATUS_QUEUED)
+            ).rowcount
+            if not claimed:
+                return
+            row = conn.execute(
+                "SELECT pdf_data, filename, job_description FROM analysis_jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+
+        print(f"⚙️ Running analysis job {job_id}")
+        try:
+            result = self.processor(bytes(row["pdf_data"]), row["filename"], row["job_description"] or "")
+            status, result_json, error = self.STATUS_COMPLETED, json.dumps(result), None
+        except Exception as e:
+            print(f"❌ Analysis job {job_id} failed: {str(e)}")
+            status, result_json, error = self.STATUS_FAILED, None, f"Analysis failed: {str(e)}"
+
+        # The uploaded PDF is no longer needed once the job has finished. A worker whose lease
+        # expired mid-run must not overwrite the outcome of the worker that took the job over.
+        with connect(self.db_path) as conn:
+            stored = conn.execute(
+                """UPDATE analysis_jobs SET status = ?, result = ?, error = ?, finished_at = ?, pdf_data = NULL
+                   WHERE id = ? AND owner_id = ?""",
+                (status, result_json, error, time.time(), job_id, self._owner())
+            ).rowcount
+        if not stored:
+            print(f"⚠️ Analysis job {job_id} was taken over by another worker; discarding this result")
+            return
+        print(f"✅ Analysis job {job_id} {status}")
+
+    def _recover_orphaned_jobs(self) -> None:
+        """Re-queue unfinished jobs of other owners whose lease has expired"""
+        owner = self._owner()
+        with connect(self.db_path) as conn:
+            rows = conn.execute(
+                """SELECT id, owner_id FROM analysis_jobs
+                   WHERE status IN (?, ?) AND (lease_expires_at IS NULL OR lease_expires_at < ?)""",
+                (self.STATUS_QUEUED, self.STATUS_RUNNING, time.time())
+            ).fetchall()
+
+        for row in rows:
+            # This process's own jobs are still in its pool; the heartbeat renews them
+            if row["owner_id"] == owner:
+                continue
+            # Claim atomically so only one surviving worker picks up each orphan
+            with connect(self.db_path) as conn:
+                claimed = conn.execute(
+                    """UPDATE analysis_jobs SET status = ?, owner_id = ?, lease_expires_at = ?, started_at = NULL
+                       WHERE id = ? AND owner_id IS ? AND status IN (?, ?)
+                         AND (lease_expires_at IS NULL OR lease_expires_at < ?)""",
+                    (self.STATUS_QUEUED, owner, time.time() + self.lease_seconds, row["id"], row["owner_id"],
+                     self.STATUS_QUEUED, self.STATUS_RUNNING, time.time())
+                ).rowcount
+            if claimed:
+                print(f"♻️ Recovered orphaned analysis job {row['id']}")
+                self._get_executor().submit(self._run_job, row["id"])
+
+    def _renew_leases(self) -> None:
+        """Extend the lease of every unfinished job this process owns"""
+        with connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE analysis_jobs SET lease_expires_at = ? WHERE owner_id = ? AND status IN (?, ?)",
+                (time.time() + self.lease_seconds, self._owner(), self.STATUS_QUEUED, self.STATUS_RUNNING)
+            )
+
+    def _heartbeat(self, pid: int) -> None:
+        """Renew this process's leases and recover orphans until replaced by a forked child's pool"""
+        while self._executor_pid == pid:
+            time.sleep(self.lease_seconds / 3)
+            try:
+                self._renew_leases()
+            except Exception as e:
+                print(f"⚠️ Analysis job lease renewal failed: {str(e)}")
+            try:
+                self._recover_orphaned_jobs()
+            except Exception as e:
+                print(f"⚠️ Analysis job orphan recovery failed: {str(e)}")
+
+    def _purge_expired_jobs(self) -> None:
+        """Delete finished jobs older than the retention period"""
+        with connect(self.db_path) as conn:
+            conn.execute(
+                "DELETE FROM analysis_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - self.retention_seconds,)
+            )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the worker pool and its lease heartbeat on demand (and again in a forked child process)"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="analysis-job"
+                )
+                self._executor_pid = os.getpid()
+                threading.Thread(target=self._heartbeat, args=(self._executor_pid,),
+                                 name="analysis-job-heartbeat", daemon=True).start()
+            return self._executor
+
+    def _owner(self) -> str:
+        """Random id of this process (a forked child gets its own), recorded on the jobs it owns"""
+        with self._lock:
+            if self._owner_pid != os.getpid():
+                self._owner_id = uuid.uuid4().hex
+                self._owner_pid = os.getpid()
+            return self._owner_id
+
+    def _init_db(self) -> None:
+        """Create the jobs table if needed"""
+        with initialize(self.db_path) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS analysis_jobs (
+                       id TEXT PRIMARY KEY,
+                       status TEXT NOT NULL,
+                       filename TEXT,
+                       pdf_data BLOB,
+                       job_description TEXT,
+                       result TEXT,
+                       error TEXT,
+                       owner_id TEXT,
+                       lease_expires_at REAL,
+                       created_at REAL NOT NULL,
+                       started_at REAL,
+                       finished_at REAL
+                   )"""
+            )
+            # Databases created before leases keep their owner_pid column, which is no longer read
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(analysis_jobs)")}
+            for column, column_type in (("owner_id", "TEXT"), ("lease_expires_at", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE analysis_jobs ADD COLUMN {column} {column_type}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status ON analysis_jobs (status)")
+
+    @staticmethod
+    def _elapsed(start: Optional[float], end: Optional[float]) -> Optional[float]:
+        """Seconds between two timestamps, if both are known"""
+        if start is None or end is None:
+            return None
+        return round(end - start, 3)
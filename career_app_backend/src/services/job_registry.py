@@ -0,0 +1,166 @@
+from typing import Callable, Dict, List, Optional
+import hashlib
+import json
+import os
+import re
+import time
+from src.utils.sqlite import connect, initialize
+
+
+class JobDescriptionRegistry:
+    """Stored job descriptions with their analysis precomputed once and reused for every resume"""
+
+    def __init__(self, db_path: str, keyword_extractor: Callable[[str], List[str]],
+                 requirement_extractor: Optional[Callable[[str], Dict]] = None, normalizer=None):
+        """Initialize the registry.
+
+        `keyword_extractor(description)` returns the local keyword list;
+        `requirement_extractor(description)` optionally asks the model for structured requirements;
+        `normalizer` (a TextNormalizer) cleans the stored text and counts prompt tokens.
+        """
+        self.db_path = db_path
+        self.keyword_extractor = keyword_extractor
+        self.requirement_extractor = requirement_extractor
+        self.normalizer = normalizer
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_db()
+
+    def register(self, description: str, title: str = "", extract_requirements: bool = True) -> Dict:
+        """Store a job description and precompute its analysis; re-registering returns the stored entry"""
+        if self.normalizer is not None:
+            description = self.normalizer.normalize(description, max_tokens=0)["text"]
+        job_id = self.make_job_id(description)
+
+        existing = self.get(job_id, count_use=False)
+        if existing is not None and (existing["requirements"] or not extract_requirements
+                                     or self.requirement_extractor is None):
+            existing["created"] = False
+            return existing
+
+        keywords = self.keyword_extractor(description)
+        requirements = None
+        requirements_error = None
+        if extract_requirements and self.requirement_extractor is not None:
+            extracted = self.requirement_extractor(description)
+            if extracted.get("error") or not extracted:
+                requirements_error = extracted.get("error") or "No requirements extracted"
+            else:
+                requirements = extracted
+        title = title or (requirements or {}).get("title") or self._first_line(description)
+        prompt_text = self._build_prompt_text(title, description, requirements)
+
+        with connect(self.db_path) as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO job_descriptions
+                       (id, title, description, keywords, requirements, requirements_error, prompt_text,
+                        use_count, created_at, last_used_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, COALESCE((SELECT use_count FROM job_descriptions WHERE id = ?), 0), ?, NULL)""",
+                (job_id, title, description, json.dumps(keywords),
+                 json.dumps(requirements) if requirements else None, requirements_error, prompt_text,
+                 job_id, time.time())
+            )
+        print(f"🗂️ Registered job description {job_id} ({title})")
+
+        job = self.get(job_id, count_use=False)
+        job["created"] = existing is None
+        return job
+
+    def get(self, job_id: str, count_use: bool = True) -> Optional[Dict]:
+        """Return a stored job description; lookups by resume requests are counted"""
+        with connect(self.db_path) as conn:
+            if count_use:
+                conn.execute(
+                    "UPDATE job_descriptions SET use_count = use_count + 1, last_used_at = ? WHERE id = ?",
+                    (time.time(), job_id)
+                )
+            row = conn.execute("SELECT * FROM job_descriptions WHERE id = ?", (job_id,)).fetchone()
+
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "keywords": json.loads(row["keywords"]),
+            "requirements": json.loads(row["requirements"]) if row["requirements"] else None,
+            "requirements_error": row["requirements_error"],
+            "prompt_text": row["prompt_text"],
+            "description_tokens": self._count_tokens(row["description"]),
+            "prompt_tokens": self._count_tokens(row["prompt_text"]),
+            "use_count": row["use_count"],
+            "created_at": row["created_at"],
+            "last_used_at": row["last_used_at"]
+        }
+
+    def find(self, description: str) -> Optional[Dict]:
+        """Prompt text and keywords stored for a job description, or None if it is not registered"""
+        with connect(self.db_path) as conn:
+            row = conn.execute("SELECT prompt_text, keywords FROM job_descriptions WHERE id = ?",
+                               (self.make_job_id(description),)).fetchone()
+        if row is None:
+            return None
+        return {"prompt_text": row["prompt_text"], "keywords": json.loads(row["keywords"])}
+
+    def stored_keywords(self, description: str) -> Optional[List[str]]:
+        """Keywords precomputed for a registered job description"""
+        stored = self.find(description)
+        return stored["keywords"] if stored else None
+
+    @staticmethod
+    def make_job_id(description: str) -> str:
+        """Content-addressed id, so posting the same job description twice yields the same id"""
+        normalized = re.sub(r'\s+', ' ', description).strip().lower()
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+    def _build_prompt_text(self, title: str, description: str, requirements: Optional[Dict]) -> str:
+        """Compact job description sent to the agents in place of the full posting.
+        
+        Short postings are sent as they are when the requirement summary would not be smaller.
+        """
+        if not requirements:
+            return description
+
+        lines = [f"Title: {title}"]
+        for label, field in (("Required skills", "required_skills"), ("Preferred skills", "preferred_skills"),
+                             ("Experience", "experience"), ("Education", "education"),
+                             ("Certifications", "certifications"), ("Responsibilities", "responsibilities")):
+            value = requirements.get(field)
+            if isinstance(value, list):
+                value = "; ".join(str(item) for item in value if item)
+            if value:
+                lines.append(f"{label}: {value}")
+        compact = "\n".join(lines)
+        return compact if self._count_tokens(compact) < self._count_tokens(description) else description
+
+    def _count_tokens(self, text: str) -> int:
+        """Prompt tokens of a text (estimated without a normalizer)"""
+        if self.normalizer is not None:
+            return self.normalizer.count_tokens(text or "")
+        return (len(text or "") + 3) // 4
+
+    @staticmethod
+    def _first_line(description: str) -> str:
+        """First non-empty line, used as the title when none is given"""
+        for line in description.splitlines():
+            if line.strip():
+                return line.strip()[:80]
+        return ""
+
+    def _init_db(self) -> None:
+        """Create the job descriptions table if needed"""
+        with initialize(self.db_path) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS job_descriptions (
+                       id TEXT PRIMARY KEY,
+                       title TEXT,
+                       description TEXT NOT NULL,
+                       keywords TEXT NOT NULL,
+                       requirements TEXT,
+                       requirements_error TEXT,
+                       prompt_text TEXT NOT NULL,
+                       use_count INTEGER NOT NULL DEFAULT 0,
+                       created_at REAL NOT NULL,
+                       last_used_at REAL
+                   )"""
+            )
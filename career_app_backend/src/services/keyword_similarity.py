@@ -0,0 +1,167 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+import json
+import math
+import os
+import sys
+
+import numpy as np
+from scipy import sparse
+
+from src.utils.phrase_matcher import tokenize
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further
+had has have having he her here hers him his how i if in into is it its itself just let may me
+more most must my new no nor not now of off on once only or other our ours out over own per same
+she should so some such than that the their them then there these they this those through to too
+under until up upon us use very via was way we were what when where which while who whom why will
+with within without would you your yours
+""".split())
+
+
+def terms(text: str) -> List[str]:
+    """Content terms of a text: word tokens without stop words and bare numbers"""
+    return [token for token in tokenize(text)
+            if token not in STOP_WORDS and not token.replace(".", "").isdigit()]
+
+
+class KeywordSimilarity:
+    """TF-IDF cosine and IDF-weighted term overlap between resumes and job descriptions.
+
+    IDF comes from a reference corpus (see `fit` and `save`); terms the corpus never saw get
+    the highest IDF. Without a corpus every term weighs the same. Scoring a batch builds one
+    sparse matrix per side, so any number of resume x job description pairs is two sparse
+    matrix products.
+    """
+
+    # Share of the cosine similarity in match_percentage; the rest is the weighted overlap
+    COSINE_WEIGHT = 0.5
+
+    def __init__(self, document_frequency: Optional[Dict[str, int]] = None, documents: int = 0):
+        self.document_frequency = document_frequency or {}
+        self.documents = documents
+
+    @classmethod
+    def fit(cls, corpus: Iterable[str]) -> "KeywordSimilarity":
+        """Build the IDF table from a reference corpus of documents"""
+        document_frequency = Counter()
+        documents = 0
+        for document in corpus:
+            document_frequency.update(set(terms(document)))
+            documents += 1
+        return cls(dict(document_frequency), documents)
+
+    @classmethod
+    def load(cls, path: str) -> "KeywordSimilarity":
+        """Load an IDF table saved with `save`; a missing file gives uniform weights"""
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            table = json.load(f)
+        return cls(table["document_frequency"], table["documents"])
+
+    def save(self, path: str) -> None:
+        """Write the IDF table as JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"documents": self.documents, "document_frequency": self.document_frequency}, f)
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency of a term"""
+        return math.log((1 + self.documents) / (1 + self.document_frequency.get(term, 0))) + 1
+
+    def score(self, resume_text: str, job_description: str) -> Dict[str, float]:
+        """Similarity of one resume and one job description"""
+        scores = self.score_matrix([resume_text], [job_description])
+        return {name: float(values[0, 0]) for name, values in scores.items()}
+
+    def score_matrix(self, resume_texts: List[str], job_descriptions: List[str]) -> Dict[str, np.ndarray]:
+        """Similarity of every resume with every job description.
+
+        Returns `cosine`, `weighted_overlap` (IDF mass of the job description's terms found
+        in the resume) and `match_percentage`, each a resumes x job descriptions array.
+        Results do not depend on the rest of the batch: the vocabulary is sorted, so shared
+        terms are always summed in the same order.
+        """
+        resume_terms = [Counter(terms(text)) for text in resume_texts]
+        job_terms = [Counter(terms(text)) for text in job_descriptions]
+        vocabulary = {term: index for index, term in
+                      enumerate(sorted(set().union(*resume_terms, *job_terms)))}
+        idf = np.array([self.idf(term) for term in vocabulary], dtype=np.float64)
+
+        resumes = self._term_matrix(resume_terms, vocabulary)
+        jobs = self._term_matrix(job_terms, vocabulary)
+        cosine = (self._tfidf(resumes, idf) @ self._tfidf(jobs, idf).T).toarray()
+
+        # IDF-weighted share of each job description's distinct terms present in the resume
+        job_weights = self._binary(jobs) @ sparse.diags(idf)
+        present = (self._binary(resumes) @ job_weights.T).toarray()
+        total = np.asarray(job_weights.sum(axis=1)).ravel()
+        weighted_overlap = np.divide(present, total, out=np.zeros_like(present), where=total > 0)
+
+        cosine = np.clip(cosine, 0.0, 1.0)
+        match = 100 * (self.COSINE_WEIGHT * cosine + (1 - self.COSINE_WEIGHT) * weighted_overlap)
+        return {
+            "cosine": np.round(cosine, 4),
+            "weighted_overlap": np.round(weighted_overlap, 4),
+            "match_percentage": np.round(match, 2)
+        }
+
+    @staticmethod
+    def _term_matrix(term_counts: List[Counter], vocabulary: Dict[str, int]) -> sparse.csr_matrix:
+        """Documents x vocabulary matrix of raw term counts with sorted column indices"""
+        indptr = [0]
+        indices = []
+        data = []
+        for counts in term_counts:
+            for column, count in sorted((vocabulary[term], count) for term, count in counts.items()):
+                indices.append(column)
+                data.append(count)
+            indptr.append(len(indices))
+        return sparse.csr_matrix((np.array(data, dtype=np.float64), indices, indptr),
+                                 shape=(len(term_counts), len(vocabulary)))
+
+    @staticmethod
+    def _tfidf(counts: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+        """Sublinear TF-IDF rows scaled to unit length"""
+        weights = counts.copy()
+        weights.data = (1 + np.log(weights.data)) * idf[weights.indices]
+        norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ weights
+
+    @staticmethod
+    def _binary(counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Term presence matrix"""
+        present = counts.copy()
+        present.data = np.ones_like(present.data)
+        return present
+
+
+def _read_corpus(paths: List[str]) -> Iterable[str]:
+    """Documents of a reference corpus: every .txt file, or every line of a .jsonl file
+    (its "description" or "text" field)"""
+    for path in paths:
+        files = ([os.path.join(root, name) for root, _, names in os.walk(path) for name in sorted(names)]
+                 if os.path.isdir(path) else [path])
+        for file_path in files:
+            if file_path.endswith(".jsonl"):
+                with open(file_path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            yield record.get("description") or record.get("text") or ""
+            elif file_path.endswith(".txt"):
+                with open(file_path, encoding="utf-8", errors="ignore") as f:
+                    yield f.read()
+
+
+if __name__ == "__main__":
+    # python -m src.services.keyword_similarity OUTPUT.json CORPUS_PATH [CORPUS_PATH ...]
+    if len(sys.argv) < 3:
+        sys.exit("usage: python -m src.services.keyword_similarity OUTPUT.json CORPUS_PATH [CORPUS_PATH ...]")
+    table = KeywordSimilarity.fit(_read_corpus(sys.argv[2:]))
+    table.save(sys.argv[1])
+    print(f"✅ IDF table of {len(table.document_frequency)} terms from {table.documents} documents "
+          f"written to {sys.argv[1]}")
@@ -0,0 +1,223 @@
+from typing import Callable, Dict, List, Optional
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import openai
+
+try:
+    import httpx
+except ImportError:  # Newer openai releases ship the httpx2 fork instead
+    import httpx2 as httpx
+
+
+class LLMResponse:
+    """Provider-independent chat completion result"""
+
+    __slots__ = ("content", "usage", "model")
+
+    def __init__(self, content: str, usage: Optional[Dict] = None, model: str = ""):
+        self.content = content
+        self.usage = usage or {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        self.model = model
+
+    def to_dict(self) -> Dict:
+        return {"content": self.content, "usage": self.usage, "model": self.model}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LLMResponse":
+        return cls(data.get("content", ""), data.get("usage"), data.get("model", ""))
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode when no recording exists for a request"""
+
+
+class OpenAITransport:
+    """Send chat completion requests through an `openai.OpenAI` client"""
+
+    def __init__(self, client=None, client_factory: Optional[Callable[[], object]] = None,
+                 connect_timeout: Optional[float] = None):
+        """Use a ready `client`, or build one lazily in each process with `client_factory`.
+
+        A factory-built client (and its connection pool) is recreated after a fork, so
+        Gunicorn workers never share sockets inherited from the master process.
+        """
+        if client is None and client_factory is None:
+            raise ValueError("A client or a client factory is required")
+        self._client = client
+        self._client_factory = client_factory
+        self._client_pid = os.getpid() if client is not None else None
+        self._lock = threading.Lock()
+        self.connect_timeout = connect_timeout
+
+    @property
+    def client(self):
+        """The client owned by the current process"""
+        if self._client_factory is not None and self._client_pid != os.getpid():
+            with self._lock:
+                if self._client_pid != os.getpid():
+                    self._client = self._client_factory()
+                    self._client_pid = os.getpid()
+        return self._client
+
+    def complete(self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+                 timeout: Optional[float] = None, **options) -> LLMResponse:
+        """Run one chat completion; `timeout` bounds the wait for the response"""
+        if timeout is not None:
+            if self.connect_timeout is not None:
+                # Fail fast on an unreachable endpoint while still allowing slow generations
+                timeout = httpx.Timeout(timeout, connect=min(self.connect_timeout, timeout))
+            options["timeout"] = timeout
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **options
+        )
+        usage = getattr(response, "usage", None)
+        return LLMResponse(
+            content=response.choices[0].message.content or "",
+            usage={
+                "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+                "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+                "total_tokens": getattr(usage, "total_tokens", 0) or 0
+            },
+            model=getattr(response, "model", model) or model
+        )
+
+
+class CassetteTransport:
+    """Record chat completions to JSON cassettes, or replay them without any network access"""
+
+    MODE_RECORD = "record"
+    MODE_REPLAY = "replay"
+
+    def __init__(self, cassette_dir: str, mode: str = MODE_REPLAY, inner=None):
+        """`inner` is the live transport used in record mode"""
+        if mode not in (self.MODE_RECORD, self.MODE_REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode == self.MODE_RECORD and inner is None:
+            raise ValueError("Record mode needs a live transport to record from")
+
+        self.cassette_dir = cassette_dir
+        self.mode = mode
+        self.inner = inner
+        self._lock = threading.Lock()
+        os.makedirs(cassette_dir, exist_ok=True)
+
+    def complete(self, model: str, messages: List[Dict], temperature: float, max_tokens: int,
+                 timeout: Optional[float] = None, **options) -> LLMResponse:
+        """Replay the recorded response for this request, or record a live one"""
+        key = request_fingerprint(model, messages, temperature, max_tokens, **options)
+        path = os.path.join(self.cassette_dir, f"{key}.json")
+
+        if self.mode == self.MODE_REPLAY:
+            if not os.path.exists(path):
+                raise CassetteMissError(f"No cassette recorded for request {key}")
+            with open(path, encoding="utf-8") as f:
+                return LLMResponse.from_dict(json.load(f)["response"])
+
+        response = self.inner.complete(model, messages, temperature, max_tokens, timeout=timeout, **options)
+        with self._lock:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "request": {"model": model, "messages": messages, "temperature": temperature,
+                                "max_tokens": max_tokens, "options": options},
+                    "response": response.to_dict()
+                }, f, indent=2, ensure_ascii=False)
+        return response
+
+
+def request_fingerprint(model: str, messages: List[Dict], temperature: float, max_tokens: int, **options) -> str:
+    """Stable hash of everything that determines a completion (timeouts excluded)"""
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "options": options
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Whether a failed completion is worth retrying (timeouts, connection errors, 429 and 5xx)"""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError,
+                          openai.RateLimitError, openai.InternalServerError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and (status_code in (408, 409, 429) or status_code >= 500)
+
+
+def is_transport_failure(error: Exception) -> bool:
+    """Whether a failed completion points at an unhealthy API (timeouts, connection errors, 429 and 5xx)
+    rather than at the request itself, so it should count towards opening the circuit"""
+    if isinstance(error, (TimeoutError, ConnectionError, openai.APITimeoutError, openai.APIConnectionError,
+                          openai.RateLimitError, openai.InternalServerError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and (status_code in (408, 429) or status_code >= 500)
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package"""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client(config, **client_options):
+    """Connection-pooled HTTP client shared by every agent call of one process"""
+    http2 = (config.LLM_HTTP2 or "auto").lower()
+    use_http2 = http2 == "true" or (http2 == "auto" and http2_available())
+    return openai.DefaultHttpxClient(
+        http2=use_http2,
+        limits=httpx.Limits(
+            max_connections=config.LLM_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=config.LLM_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY_SECONDS
+        ),
+        timeout=httpx.Timeout(config.AGENT_TIMEOUT_SECONDS, connect=config.LLM_CONNECT_TIMEOUT_SECONDS),
+        **client_options
+    )
+
+
+def parse_agent_timeouts(spec: str) -> Dict[str, float]:
+    """Parse per-agent read timeouts such as "Combined Resume Analyst=40,Job Match Analyst=30" """
+    timeouts = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        agent_name, _, seconds = item.rpartition("=")
+        if not agent_name.strip():
+            raise ValueError(f"Invalid agent timeout: {item.strip()!r} (expected 'Agent Name=seconds')")
+        timeouts[agent_name.strip()] = float(seconds)
+    return timeouts
+
+
+def create_transport(config) -> Optional[object]:
+    """Build the transport selected by LLM_TRANSPORT ('openai', 'record' or 'replay')"""
+    mode = (config.LLM_TRANSPORT or "openai").lower()
+
+    if mode == CassetteTransport.MODE_REPLAY:
+        return CassetteTransport(config.LLM_CASSETTE_DIR, mode=CassetteTransport.MODE_REPLAY)
+
+    if not config.OPENAI_API_KEY:
+        return None
+
+    # Retries are handled by the analysis service so they can respect the request deadline
+    client_options = {"api_key": config.OPENAI_API_KEY, "max_retries": 0}
+    if config.OPENAI_BASE_URL:
+        # e.g. a local stand-in server for offline load tests
+        client_options["base_url"] = config.OPENAI_BASE_URL
+    # Built on first use in each worker process, never inherited across a fork
+    live = OpenAITransport(
+        client_factory=lambda: openai.OpenAI(http_client=create_http_client(config), **client_options),
+        connect_timeout=config.LLM_CONNECT_TIMEOUT_SECONDS
+    )
+
+    if mode == CassetteTransport.MODE_RECORD:
+        return CassetteTransport(config.LLM_CASSETTE_DIR, mode=CassetteTransport.MODE_RECORD, inner=live)
+    return live
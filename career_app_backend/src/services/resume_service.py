@@ -1,16 +1,24 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import json
 import os
-import re
 from datetime import datetime
+import numpy as np
 from config.settings import Config
+from src.services.keyword_similarity import KeywordSimilarity
+from src.utils.resume_features import (
+    ACTION_VERBS, FORMAT_HEADERS, PROFESSIONAL_TERMS, REQUIRED_SECTIONS, RESUME_SECTIONS,
+    SCORING_COLUMNS, SUGGESTION_ACTION_VERBS, SUGGESTION_SECTIONS, ResumeFeatures, extract_features, scoring_row
+)
 
 class ResumeAnalysisService:
     """Service for analyzing resumes with basic rule-based analysis"""
     
     def __init__(self):
         """Initialize the resume analysis service"""
-        pass
+        # TF-IDF similarity engine behind match_percentage (IDF from the reference corpus table)
+        self.similarity = KeywordSimilarity.load(Config.KEYWORD_IDF_PATH)
+        # Optional lookup of keywords precomputed for a job description (the job registry's)
+        self.stored_keywords: Optional[Callable[[str], Optional[List[str]]]] = None
     
     def analyze_resume(self, resume_text: str, job_description: str = "") -> Dict:
         """Complete resume analysis using rule-based methods"""
@@ -47,43 +55,22 @@ class ResumeAnalysisService:
     def calculate_ats_score(self, resume_text: str, job_description: str = "") -> Dict:
         """Calculate ATS compatibility score using rule-based analysis"""
         try:
+            features = extract_features(resume_text)
             scores = {}
-            total_score = 0
             
             # Format and Structure Analysis (30 points)
-            format_score = self._analyze_format_structure(resume_text)
-            scores["format_score"] = format_score
-            total_score += format_score
+            scores["format_score"] = self._analyze_format_structure(features)
             
             # Keywords Matching (25 points) 
-            keywords_score = self._analyze_keywords_matching(resume_text, job_description)
-            scores["keywords_score"] = keywords_score
-            total_score += keywords_score
+            scores["keywords_score"] = self._analyze_keywords_matching(features, job_description)
             
             # Content Quality (25 points)
-            content_score = self._analyze_content_quality(resume_text)
-            scores["content_score"] = content_score
-            total_score += content_score
+            scores["content_score"] = self._analyze_content_quality(features)
             
             # Sections Completeness (20 points)
-            sections_score = self._analyze_sections_completeness(resume_text)
-            scores["sections_score"] = sections_score
-            total_score += sections_score
+            scores["sections_score"] = self._analyze_sections_completeness(features)
             
-            # Calculate grade
-            grade = self._calculate_grade(total_score)
-            interpretation = self._get_score_interpretation(total_score)
-            
-            return {
-                "overall_score": total_score,
-                "max_score": 100,
-                "grade": grade,
-                "interpretation": interpretation,
-                "detailed_scores": scores,
-                "recommendations": self._get_score_recommendations(scores),
-                "strengths": self._identify_strengths(scores),
-                "areas_for_improvement": self._identify_improvements(scores)
-            }
+            return self._build_ats_score(scores)
             
         except Exception as e:
             return {
@@ -95,9 +82,53 @@ class ResumeAnalysisService:
                 "recommendations": ["Please try again with a valid resume"]
             }
     
+    def calculate_ats_scores(self, resume_texts: List[str], job_description: str = "") -> List[Dict]:
+        """Rule-based ATS scores of many resumes against one job description.
+        
+        Every resume's features become one row of a feature matrix and the format, keyword,
+        content and section rules run as array operations over the whole batch; keyword
+        similarity to the job description is a single sparse matrix product. Each entry is
+        identical to calculate_ats_score for that resume.
+        """
+        if not resume_texts:
+            return []
+        
+        texts = [text or "" for text in resume_texts]
+        columns = self._feature_matrix(texts)
+        
+        format_scores = np.minimum(
+            np.minimum(columns["headers"] * 3, 15) + 5 * columns["email"] + 5 * columns["phone"] + 5 * columns["bullets"],
+            30
+        )
+        content_scores = np.minimum(
+            np.minimum(columns["action_verbs"] * 2, 10) + np.minimum(columns["quantified"] * 3, 10)
+            + np.minimum(columns["professional_terms"], 5),
+            25
+        )
+        sections_scores = np.minimum(columns["required_sections"] * 5, 20)
+        
+        if job_description and self._extract_keywords_from_text(job_description):
+            match = self.similarity.score_matrix(texts, [job_description])["match_percentage"][:, 0]
+            keywords_scores = np.minimum((match / 100 * 25).astype(np.int64), 25)
+        else:
+            keywords_scores = np.full(len(texts), 15, dtype=np.int64)  # Default score if no job description
+        
+        return [
+            self._build_ats_score({
+                "format_score": format_score,
+                "keywords_score": keywords_score,
+                "content_score": content_score,
+                "sections_score": sections_score
+            })
+            for format_score, keywords_score, content_score, sections_score in zip(
+                format_scores.tolist(), keywords_scores.tolist(), content_scores.tolist(), sections_scores.tolist()
+            )
+        ]
+    
     def get_improvement_suggestions(self, resume_text: str, job_description: str = "") -> Dict:
         """Get improvement suggestions using rule-based analysis"""
         try:
+            features = extract_features(resume_text)
             suggestions = {
                 "priority_improvements": [],
                 "content_suggestions": [],
@@ -108,49 +139,42 @@ class ResumeAnalysisService:
             }
             
             # Analyze content and provide suggestions
-            word_count = len(resume_text.split())
+            word_count = features.word_count
             if word_count < 200:
                 suggestions["priority_improvements"].append("Expand resume content - current word count is too low")
             elif word_count > 800:
                 suggestions["priority_improvements"].append("Consider condensing resume - current word count is very high")
             
             # Check for action verbs
-            action_verbs = ["achieved", "developed", "managed", "led", "created", "implemented", "improved"]
-            found_verbs = [verb for verb in action_verbs if verb.lower() in resume_text.lower()]
-            if len(found_verbs) < 3:
+            if features.count_present(SUGGESTION_ACTION_VERBS) < 3:
                 suggestions["content_suggestions"].append("Add more strong action verbs to describe accomplishments")
             else:
                 suggestions["strengths"].append("Good use of action verbs")
             
             # Check for quantifiable achievements
-            numbers_pattern = r'\d+%|\d+\+|\$\d+|\d+ [a-zA-Z]+'
-            if not re.search(numbers_pattern, resume_text):
+            if not features.quantified_count:
                 suggestions["priority_improvements"].append("Add quantifiable achievements with specific numbers or percentages")
             else:
                 suggestions["strengths"].append("Contains quantifiable achievements")
             
             # Check for contact information
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-            
-            if re.search(email_pattern, resume_text):
+            if features.has_email:
                 suggestions["strengths"].append("Email address found")
             else:
                 suggestions["missing_elements"].append("Email address")
                 
-            if re.search(phone_pattern, resume_text):
+            if features.has_phone:
                 suggestions["strengths"].append("Phone number found")
             else:
                 suggestions["missing_elements"].append("Phone number")
             
             # Check for common sections
-            sections = ["experience", "education", "skills", "summary", "objective"]
-            found_sections = [section for section in sections if section.lower() in resume_text.lower()]
+            found_sections = [section for section in SUGGESTION_SECTIONS if section in features.terms_present]
             
             if len(found_sections) >= 3:
                 suggestions["strengths"].append("Resume contains multiple important sections")
             else:
-                suggestions["missing_elements"].extend([s for s in sections if s not in found_sections])
+                suggestions["missing_elements"].extend([s for s in SUGGESTION_SECTIONS if s not in found_sections])
             
             # Formatting tips
             suggestions["formatting_tips"].extend([
@@ -188,30 +212,15 @@ class ResumeAnalysisService:
         """Extract and analyze keywords using basic text analysis"""
         try:
             # Basic keyword extraction
-            resume_words = self._extract_keywords_from_text(resume_text)
+            features = extract_features(resume_text)
+            resume_words = list(features.keywords)
             job_words = self._extract_keywords_from_text(job_description) if job_description else []
             
-            # Find matching keywords
-            matching_keywords = list(set(resume_words) & set(job_words)) if job_description else []
-            missing_keywords = list(set(job_words) - set(resume_words)) if job_description else []
-            
-            # Calculate match percentage
-            match_percentage = (len(matching_keywords) / len(job_words) * 100) if job_words else 0
-            
             # Calculate keyword density
-            keyword_density = len(resume_words) / len(resume_text.split()) * 100 if resume_text else 0
+            keyword_density = len(resume_words) / features.word_count * 100 if resume_text else 0
+            similarity = self.similarity.score(resume_text, job_description) if job_description else None
             
-            return {
-                "job_description_keywords": job_words[:20],  # Top 20 keywords
-                "resume_keywords": resume_words[:20],  # Top 20 keywords
-                "matching_keywords": matching_keywords,
-                "missing_keywords": missing_keywords[:10],  # Top 10 missing
-                "keyword_density": round(keyword_density, 2),
-                "match_percentage": round(match_percentage, 2),
-                "critical_missing_keywords": missing_keywords[:5],  # Top 5 critical
-                "keyword_suggestions": self._generate_keyword_suggestions(missing_keywords),
-                "industry_keywords": self._get_common_industry_keywords()
-            }
+            return self._compare_keywords(resume_words, job_words, keyword_density, similarity)
             
         except Exception as e:
             return {
@@ -224,116 +233,167 @@ class ResumeAnalysisService:
                 "error": f"Keyword extraction failed: {str(e)}"
             }
     
+    def score_job_descriptions(self, resume_text: str, job_descriptions: List[str]) -> List[Dict]:
+        """Rule-based ATS score and keyword analysis of one resume against several job descriptions.
+        
+        Resume-side scores and keywords are computed once and reused for every job description,
+        and the similarity to all job descriptions is one vectorized operation; each entry
+        matches calculate_ats_score and extract_keywords for that job description.
+        """
+        features = extract_features(resume_text)
+        resume_words = list(features.keywords)
+        keyword_density = len(resume_words) / features.word_count * 100 if resume_text else 0
+        format_score = self._analyze_format_structure(features)
+        content_score = self._analyze_content_quality(features)
+        sections_score = self._analyze_sections_completeness(features)
+        similarity_matrix = self.similarity.score_matrix([resume_text], job_descriptions)
+        
+        results = []
+        for index, job_description in enumerate(job_descriptions):
+            job_words = self._extract_keywords_from_text(job_description) if job_description else []
+            similarity = ({name: float(values[0, index]) for name, values in similarity_matrix.items()}
+                          if job_description else None)
+            scores = {
+                "format_score": format_score,
+                "keywords_score": self._keywords_score(similarity, job_words, job_description),
+                "content_score": content_score,
+                "sections_score": sections_score
+            }
+            results.append({
+                "ats_score": self._build_ats_score(scores),
+                "keywords_analysis": self._compare_keywords(resume_words, job_words, keyword_density, similarity)
+            })
+        return results
+    
     # Helper methods for analysis
     def _analyze_text_content(self, text: str) -> Dict:
         """Analyze basic text content"""
-        words = text.split()
-        sentences = text.split('.')
+        features = extract_features(text)
         
         return {
-            "word_count": len(words),
-            "sentence_count": len(sentences),
-            "character_count": len(text),
-            "average_words_per_sentence": round(len(words) / len(sentences), 2) if sentences else 0,
-            "sections_identified": self._identify_sections(text),
-            "readability_score": self._calculate_readability(text)
+            "word_count": features.word_count,
+            "sentence_count": features.sentence_count,
+            "character_count": features.character_count,
+            "average_words_per_sentence": round(features.word_count / features.sentence_count, 2) if features.sentence_count else 0,
+            "sections_identified": self._identify_sections(features),
+            "readability_score": self._calculate_readability(features)
         }
     
-    def _analyze_format_structure(self, text: str) -> int:
+    def _analyze_format_structure(self, features: ResumeFeatures) -> int:
         """Analyze format and structure (max 30 points)"""
         score = 0
         
         # Check for section headers
-        common_headers = ["experience", "education", "skills", "summary", "contact"]
-        headers_found = sum(1 for header in common_headers if header.lower() in text.lower())
+        headers_found = features.count_present(FORMAT_HEADERS)
         score += min(headers_found * 3, 15)
         
         # Check for contact information
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        
-        if re.search(email_pattern, text):
+        if features.has_email:
             score += 5
-        if re.search(phone_pattern, text):
+        if features.has_phone:
             score += 5
         
         # Check for bullet points or organized structure
-        if '•' in text or '*' in text or '-' in text:
+        if features.has_bullets:
             score += 5
         
         return min(score, 30)
     
-    def _analyze_keywords_matching(self, resume_text: str, job_description: str) -> int:
+    def _analyze_keywords_matching(self, features: ResumeFeatures, job_description: str) -> int:
         """Analyze keyword matching (max 25 points)"""
         if not job_description:
             return 15  # Default score if no job description
         
-        resume_keywords = self._extract_keywords_from_text(resume_text)
         job_keywords = self._extract_keywords_from_text(job_description)
+        return self._keywords_score(self.similarity.score(features.text, job_description), job_keywords, job_description)
+    
+    def _keywords_score(self, similarity: Optional[Dict], job_keywords: List[str], job_description: str) -> int:
+        """Keyword matching score (max 25 points) from the TF-IDF similarity"""
+        if not job_description:
+            return 15  # Default score if no job description
         
         if not job_keywords:
             return 15
         
-        matching_keywords = set(resume_keywords) & set(job_keywords)
-        match_ratio = len(matching_keywords) / len(job_keywords)
-        
-        return min(int(match_ratio * 25), 25)
+        return min(int(similarity["match_percentage"] / 100 * 25), 25)
     
-    def _analyze_content_quality(self, text: str) -> int:
+    def _analyze_content_quality(self, features: ResumeFeatures) -> int:
         """Analyze content quality (max 25 points)"""
         score = 0
         
         # Check for action verbs
-        action_verbs = ["achieved", "developed", "managed", "led", "created", "implemented", "improved", "designed", "executed", "delivered"]
-        found_verbs = sum(1 for verb in action_verbs if verb.lower() in text.lower())
-        score += min(found_verbs * 2, 10)
+        score += min(features.count_present(ACTION_VERBS) * 2, 10)
         
         # Check for quantifiable achievements
-        numbers_pattern = r'\d+%|\d+\+|\$\d+|\d+ [a-zA-Z]+'
-        numbers_found = len(re.findall(numbers_pattern, text))
-        score += min(numbers_found * 3, 10)
+        score += min(features.quantified_count * 3, 10)
         
         # Check for professional language
-        professional_terms = ["responsible", "collaborated", "coordinated", "analyzed", "optimized"]
-        prof_terms_found = sum(1 for term in professional_terms if term.lower() in text.lower())
-        score += min(prof_terms_found, 5)
+        score += min(features.count_present(PROFESSIONAL_TERMS), 5)
         
         return min(score, 25)
     
-    def _analyze_sections_completeness(self, text: str) -> int:
+    def _analyze_sections_completeness(self, features: ResumeFeatures) -> int:
         """Analyze sections completeness (max 20 points)"""
-        score = 0
-        required_sections = ["experience", "education", "skills", "contact"]
-        
-        for section in required_sections:
-            if section.lower() in text.lower():
-                score += 5
-        
-        return min(score, 20)
+        return min(features.count_present(REQUIRED_SECTIONS) * 5, 20)
+    
+    def _feature_matrix(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Columns of the batch feature matrix the ATS scoring rules read, one row per resume.
+        
+        Rows are not memoized like extract_features, so bulk imports do not evict the
+        features of interactive requests.
+        """
+        matrix = np.array([scoring_row(text) for text in texts], dtype=np.int64).reshape(len(texts), len(SCORING_COLUMNS))
+        return {name: matrix[:, index] for index, name in enumerate(SCORING_COLUMNS)}
     
     def _extract_keywords_from_text(self, text: str) -> List[str]:
-        """Extract keywords from text"""
+        """Extract keywords (3+ characters, not common words), most frequent first"""
         if not text:
             return []
+        if self.stored_keywords is not None:
+            stored = self.stored_keywords(text)
+            if stored is not None:
+                return stored
+        return list(extract_features(text).keywords)
+    
+    def _build_ats_score(self, scores: Dict) -> Dict:
+        """Assemble the ATS score result from the per-criterion scores"""
+        total_score = sum(scores.values())
+        return {
+            "overall_score": total_score,
+            "max_score": 100,
+            "grade": self._calculate_grade(total_score),
+            "interpretation": self._get_score_interpretation(total_score),
+            "detailed_scores": scores,
+            "recommendations": self._get_score_recommendations(scores),
+            "strengths": self._identify_strengths(scores),
+            "areas_for_improvement": self._identify_improvements(scores)
+        }
+    
+    def _compare_keywords(self, resume_words: List[str], job_words: List[str], keyword_density: float,
+                          similarity: Optional[Dict] = None) -> Dict:
+        """Keyword analysis from already extracted keywords and the TF-IDF similarity"""
+        # Find matching keywords
+        matching_keywords = list(set(resume_words) & set(job_words)) if job_words else []
+        missing_keywords = list(set(job_words) - set(resume_words)) if job_words else []
         
-        # Common technical and professional keywords
-        keywords = []
-        
-        # Clean and split text
-        clean_text = re.sub(r'[^\w\s]', ' ', text.lower())
-        words = clean_text.split()
-        
-        # Filter for meaningful keywords (3+ characters, not common words)
-        common_words = {"the", "and", "for", "are", "but", "not", "you", "all", "can", "had", "her", "was", "one", "our", "out", "day", "get", "has", "him", "his", "how", "its", "may", "new", "now", "old", "see", "two", "way", "who", "boy", "did", "its", "let", "put", "say", "she", "too", "use"}
-        
-        for word in words:
-            if len(word) >= 3 and word not in common_words:
-                keywords.append(word)
+        # Match percentage: TF-IDF cosine blended with IDF-weighted term overlap
+        match_percentage = similarity["match_percentage"] if similarity and job_words else 0
         
-        # Return unique keywords, most frequent first
-        from collections import Counter
-        keyword_counts = Counter(keywords)
-        return [word for word, count in keyword_counts.most_common(50)]
+        return {
+            "job_description_keywords": job_words[:20],  # Top 20 keywords
+            "resume_keywords": resume_words[:20],  # Top 20 keywords
+            "matching_keywords": matching_keywords,
+            "missing_keywords": missing_keywords[:10],  # Top 10 missing
+            "keyword_density": round(keyword_density, 2),
+            "match_percentage": round(match_percentage, 2),
+            "critical_missing_keywords": missing_keywords[:5],  # Top 5 critical
+            "keyword_suggestions": self._generate_keyword_suggestions(missing_keywords),
+            "industry_keywords": self._get_common_industry_keywords(),
+            "similarity": {
+                "cosine": similarity["cosine"] if similarity and job_words else 0,
+                "weighted_overlap": similarity["weighted_overlap"] if similarity and job_words else 0
+            }
+        }
     
     def _calculate_grade(self, score: int) -> str:
         """Calculate letter grade from score"""
@@ -406,27 +466,17 @@ class ResumeAnalysisService:
         
         return improvements
     
-    def _identify_sections(self, text: str) -> List[str]:
+    def _identify_sections(self, features: ResumeFeatures) -> List[str]:
         """Identify sections in the resume"""
-        common_sections = ["summary", "objective", "experience", "education", "skills", "certifications", "projects", "achievements"]
-        found_sections = []
-        
-        for section in common_sections:
-            if section.lower() in text.lower():
-                found_sections.append(section.capitalize())
-        
-        return found_sections
+        return [section.capitalize() for section in RESUME_SECTIONS if section in features.terms_present]
     
-    def _calculate_readability(self, text: str) -> float:
+    def _calculate_readability(self, features: ResumeFeatures) -> float:
         """Calculate basic readability score"""
-        words = text.split()
-        sentences = text.split('.')
-        
-        if not sentences or not words:
+        if not features.sentence_count or not features.word_count:
             return 0
         
-        avg_sentence_length = len(words) / len(sentences)
-        avg_word_length = sum(len(word) for word in words) / len(words)
+        avg_sentence_length = features.word_count / features.sentence_count
+        avg_word_length = features.total_word_length / features.word_count
         
         # Simple readability approximation
         readability = 100 - (avg_sentence_length * 2) - (avg_word_length * 3)
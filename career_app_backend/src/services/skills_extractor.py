@@ -0,0 +1,104 @@
+from typing import Dict, List, Optional
+
+from src.services.skills_ontology import SKILLS_ONTOLOGY
+from src.utils.phrase_matcher import PhraseMatcher, tokenize
+
+SKILL_BUCKETS = ("technical_skills", "professional_skills", "soft_skills", "certifications")
+
+# Level of a skill found in the text; proficiency needs the model (see SKILLS_LLM_ENRICHMENT)
+UNRATED_LEVEL = "Unrated"
+
+
+class SkillsExtractor:
+    """Dictionary-based skills extraction: every ontology name and alias is compiled into one
+    phrase matcher, so a resume is scanned once regardless of the ontology size"""
+
+    def __init__(self, ontology: Dict = SKILLS_ONTOLOGY):
+        self.matcher = PhraseMatcher()
+        # Token form of every name and alias -> (bucket, category, canonical name)
+        self._canonical = {}
+        for bucket, categories in ontology.items():
+            for category, skills in categories.items():
+                for name, aliases in skills.items():
+                    entry = (bucket, category, name)
+                    for phrase in (name, *aliases):
+                        self.matcher.add(phrase, entry)
+                        self._canonical.setdefault(" ".join(tokenize(phrase)), entry)
+        self.matcher.build()
+
+    def extract(self, resume_text: str) -> Dict:
+        """Skills found in the resume, in the `skills_analysis` response format"""
+        found = {}
+        for _, _, (bucket, category, name) in self.matcher.find_longest(resume_text):
+            skill = found.get(name)
+            if skill is None:
+                found[name] = skill = {
+                    "name": name,
+                    "level": "Certified" if bucket == "certifications" else UNRATED_LEVEL,
+                    "years": 0,
+                    "category": category,
+                    "mentions": 0,
+                    "_bucket": bucket
+                }
+            skill["mentions"] += 1
+
+        result = {bucket: [] for bucket in SKILL_BUCKETS}
+        for skill in found.values():
+            result[skill.pop("_bucket")].append(skill)
+        return build_skills_analysis(result, extraction_method="local")
+
+    def lookup(self, name: str) -> Optional[tuple]:
+        """`(bucket, category, canonical name)` of a skill name or alias, or None if not in the ontology"""
+        return self._canonical.get(" ".join(tokenize(name)))
+
+    def enrich(self, local: Dict, llm: Dict) -> Dict:
+        """Merge the model's proficiency estimates into a local extraction.
+
+        Skills found locally take level and years from the model's entry for the same
+        canonical skill; skills only the model found are added to their bucket.
+        """
+        llm_skills = {}
+        for bucket in SKILL_BUCKETS:
+            for skill in llm.get(bucket) or []:
+                if isinstance(skill, dict) and skill.get("name"):
+                    entry = self.lookup(skill["name"])
+                    llm_skills.setdefault(entry[2] if entry else skill["name"], (bucket, skill))
+
+        result = {}
+        for bucket in SKILL_BUCKETS:
+            result[bucket] = []
+            for skill in local.get(bucket, []):
+                skill = dict(skill)
+                _, estimate = llm_skills.pop(skill["name"], (None, None))
+                if estimate:
+                    skill["level"] = estimate.get("level") or skill["level"]
+                    skill["years"] = estimate.get("years") or 0
+                result[bucket].append(skill)
+        for name, (bucket, skill) in llm_skills.items():
+            result[bucket].append({**skill, "name": name, "mentions": 0})
+        return build_skills_analysis(result, extraction_method="local+llm")
+
+
+def build_skills_analysis(buckets: Dict[str, List[Dict]], extraction_method: str) -> Dict:
+    """Complete a skills_analysis response (all_skills and skills_summary) from its skill buckets"""
+    all_skills = [skill for bucket in SKILL_BUCKETS for skill in buckets.get(bucket, [])]
+    experienced = [skill["years"] for skill in all_skills if isinstance(skill.get("years"), (int, float)) and skill["years"]]
+    distribution = {}
+    for skill in all_skills:
+        if skill.get("level") and skill["level"] != UNRATED_LEVEL:
+            distribution[skill["level"]] = distribution.get(skill["level"], 0) + 1
+
+    return {
+        **{bucket: buckets.get(bucket, []) for bucket in SKILL_BUCKETS},
+        "all_skills": all_skills,
+        "skills_summary": {
+            "total_skills": len(all_skills),
+            "technical_count": len(buckets.get("technical_skills", [])),
+            "professional_count": len(buckets.get("professional_skills", [])),
+            "soft_skills_count": len(buckets.get("soft_skills", [])),
+            "certifications_count": len(buckets.get("certifications", [])),
+            "average_experience_years": round(sum(experienced) / len(experienced), 1) if experienced else 0,
+            "skill_level_distribution": distribution
+        },
+        "extraction_method": extraction_method
+    }
@@ -0,0 +1,249 @@
+"""Skills ontology: bucket -> category -> canonical skill name -> aliases.
+
+Buckets match the `skills_analysis` response (`technical_skills`, `professional_skills`,
+`soft_skills`, `certifications`). The canonical name is always matched as well, so
+aliases only list other spellings. Names that are also ordinary words ("Go", "R", "rest",
+"express", "lean") are left out or only matched in a longer form.
+"""
+
+SKILLS_ONTOLOGY = {
+    "technical_skills": {
+        "Programming": {
+            "Python": ("python3",),
+            "Java": (),
+            "JavaScript": ("js", "ecmascript", "es6"),
+            "TypeScript": ("ts",),
+            "C++": ("cpp",),
+            "C#": ("csharp", "c sharp"),
+            "Golang": (),
+            "Rust": (),
+            "Ruby": (),
+            "PHP": (),
+            "Kotlin": (),
+            "Swift": (),
+            "Scala": (),
+            "Perl": (),
+            "MATLAB": (),
+            "Bash": ("shell scripting", "bash scripting"),
+            "PowerShell": (),
+            "SQL": (),
+            "Dart": (),
+            "Objective-C": ("objective c",),
+            "VBA": (),
+        },
+        "Frontend": {
+            "React.js": ("react", "reactjs"),
+            "Angular": ("angularjs", "angular.js"),
+            "Vue.js": ("vue", "vuejs"),
+            "Next.js": ("nextjs",),
+            "Svelte": (),
+            "Redux": (),
+            "HTML": ("html5",),
+            "CSS": ("css3",),
+            "Sass": ("scss",),
+            "Tailwind CSS": ("tailwind", "tailwindcss"),
+            "Bootstrap": (),
+            "jQuery": (),
+            "Webpack": (),
+        },
+        "Backend": {
+            "Node.js": ("nodejs",),
+            "Express.js": ("expressjs",),
+            "Django": (),
+            "Flask": (),
+            "FastAPI": (),
+            "Spring Boot": ("springboot", "spring framework"),
+            "Ruby on Rails": ("rails",),
+            ".NET": ("dotnet", "asp.net", ".net core"),
+            "Laravel": (),
+            "GraphQL": (),
+            "REST APIs": ("restful", "rest api", "restful apis", "restful api"),
+            "gRPC": (),
+            "Microservices": ("microservice", "microservices architecture"),
+        },
+        "Database": {
+            "PostgreSQL": ("postgres", "postgresql"),
+            "MySQL": (),
+            "SQLite": (),
+            "Microsoft SQL Server": ("sql server", "mssql", "ms sql"),
+            "Oracle Database": ("oracle", "pl/sql", "plsql"),
+            "MongoDB": ("mongo",),
+            "Redis": (),
+            "Cassandra": (),
+            "DynamoDB": (),
+            "Elasticsearch": ("elastic search",),
+            "Snowflake": (),
+            "BigQuery": ("big query",),
+        },
+        "Cloud": {
+            "AWS": ("amazon web services",),
+            "Microsoft Azure": ("azure",),
+            "Google Cloud": ("gcp", "google cloud platform"),
+            "AWS Lambda": (),
+            "Amazon S3": ("s3",),
+            "Amazon EC2": ("ec2",),
+            "Heroku": (),
+            "Firebase": (),
+            "Serverless": (),
+        },
+        "DevOps": {
+            "Docker": (),
+            "Kubernetes": ("k8s",),
+            "Terraform": (),
+            "Ansible": (),
+            "Jenkins": (),
+            "GitHub Actions": (),
+            "GitLab CI": ("gitlab ci/cd",),
+            "CI/CD": ("continuous integration", "continuous delivery", "continuous deployment"),
+            "Linux": ("unix",),
+            "Nginx": (),
+            "Prometheus": (),
+            "Grafana": (),
+            "Helm": (),
+        },
+        "Data": {
+            "Apache Spark": ("spark", "pyspark"),
+            "Apache Kafka": ("kafka",),
+            "Apache Airflow": ("airflow",),
+            "Hadoop": (),
+            "Pandas": (),
+            "NumPy": (),
+            "ETL": (),
+            "Data Analysis": ("data analytics",),
+            "Data Visualization": ("data visualisation",),
+            "Tableau": (),
+            "Power BI": ("powerbi",),
+            "Excel": ("microsoft excel", "ms excel"),
+            "dbt": (),
+        },
+        "Machine Learning": {
+            "Machine Learning": ("ml",),
+            "Deep Learning": (),
+            "TensorFlow": (),
+            "PyTorch": (),
+            "scikit-learn": ("sklearn", "scikit learn"),
+            "Keras": (),
+            "Natural Language Processing": ("nlp",),
+            "Computer Vision": (),
+            "Large Language Models": ("llm", "llms"),
+            "Generative AI": ("genai", "gen ai"),
+        },
+        "Mobile": {
+            "Android": (),
+            "iOS": (),
+            "React Native": (),
+            "Flutter": (),
+        },
+        "Testing": {
+            "Unit Testing": ("unit tests",),
+            "pytest": (),
+            "JUnit": (),
+            "Jest": (),
+            "Selenium": (),
+            "Cypress": (),
+            "Test Automation": ("automated testing",),
+        },
+        "Tools": {
+            "Git": (),
+            "GitHub": (),
+            "GitLab": (),
+            "Jira": (),
+            "Confluence": (),
+            "Figma": (),
+            "Postman": (),
+        },
+        "Security": {
+            "Cybersecurity": ("cyber security", "information security", "infosec"),
+            "OAuth": ("oauth2",),
+            "Penetration Testing": ("pen testing", "pentesting"),
+        },
+    },
+    "professional_skills": {
+        "Management": {
+            "Project Management": (),
+            "Product Management": (),
+            "Program Management": (),
+            "Stakeholder Management": (),
+            "Budget Management": ("budgeting",),
+            "Risk Management": (),
+            "Vendor Management": (),
+        },
+        "Leadership": {
+            "Team Leadership": ("team lead", "led a team", "leading teams"),
+            "Mentoring": ("mentorship", "mentored", "coaching"),
+            "People Management": ("managed a team", "line management"),
+            "Strategic Planning": (),
+        },
+        "Methodology": {
+            "Agile": ("agile methodologies",),
+            "Scrum": (),
+            "Kanban": (),
+            "Six Sigma": (),
+            "DevOps Practices": (),
+        },
+        "Business": {
+            "Business Analysis": (),
+            "Requirements Gathering": (),
+            "Process Improvement": (),
+            "Customer Success": (),
+            "Sales": (),
+            "Digital Marketing": ("seo", "search engine optimization"),
+            "Financial Analysis": (),
+            "Technical Writing": (),
+        },
+    },
+    "soft_skills": {
+        "Interpersonal": {
+            "Communication": ("communication skills", "communicator"),
+            "Teamwork": ("team player", "collaboration", "collaborative", "cross-functional"),
+            "Presentation": ("presentations", "public speaking"),
+            "Negotiation": (),
+            "Customer Service": (),
+        },
+        "Analytical": {
+            "Problem Solving": ("problem-solving", "troubleshooting"),
+            "Critical Thinking": (),
+            "Attention to Detail": ("detail-oriented", "detail oriented"),
+            "Decision Making": (),
+        },
+        "Personal": {
+            "Time Management": (),
+            "Adaptability": ("adaptable", "flexibility"),
+            "Creativity": (),
+            "Self-Motivation": ("self-motivated", "self starter", "self-starter"),
+            "Leadership": (),
+        },
+    },
+    "certifications": {
+        "Cloud": {
+            "AWS Certified Solutions Architect": ("aws solutions architect",),
+            "AWS Certified Developer": (),
+            "AWS Certified Cloud Practitioner": (),
+            "Microsoft Certified: Azure Fundamentals": ("az-900",),
+            "Microsoft Certified: Azure Administrator": ("az-104",),
+            "Google Cloud Professional Cloud Architect": ("professional cloud architect",),
+            "Certified Kubernetes Administrator": ("cka",),
+        },
+        "Management": {
+            "PMP": ("project management professional",),
+            "PRINCE2": (),
+            "Certified ScrumMaster": ("csm", "scrum master certification"),
+            "PMI-ACP": (),
+            "ITIL": (),
+        },
+        "Security": {
+            "CISSP": (),
+            "CompTIA Security+": ("security+",),
+            "CEH": ("certified ethical hacker",),
+            "CISM": (),
+        },
+        "Data": {
+            "Google Data Analytics Certificate": ("google data analytics",),
+            "Tableau Desktop Specialist": (),
+        },
+        "Finance": {
+            "CPA": ("certified public accountant",),
+            "CFA": ("chartered financial analyst",),
+        },
+    },
+}
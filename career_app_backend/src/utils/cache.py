@@ -0,0 +1,94 @@
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+
+
+class LRUTTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries also expire after a TTL"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600):
+        """Initialize an empty cache"""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Callers may mutate results (e.g. add timestamps), so never hand out the stored object
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond the size bound"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def normalize_for_key(text: str) -> str:
+    """Normalize text so cosmetic whitespace differences map to the same cache key"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def make_cache_key(kind: str, resume_text: str, job_description: str = "", **params) -> str:
+    """Build a content-addressed key from the inputs that determine an analysis result"""
+    payload = {
+        "kind": kind,
+        "resume_text": normalize_for_key(resume_text),
+        "job_description": normalize_for_key(job_description),
+        "params": params
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
@@ -0,0 +1,104 @@
+from typing import Dict
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+
+class CircuitBreaker:
+    """Stop calling an unhealthy dependency after repeated failures.
+
+    closed: calls go through; `failure_threshold` consecutive failures open the circuit.
+    open: calls are rejected until `reset_timeout` seconds have passed.
+    half_open: a single trial call is let through; success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize the breaker; failure_threshold <= 0 disables it"""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._rejected = 0
+        self._times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be attempted now"""
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call and close the circuit"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                print(f"✅ Circuit '{self.name}' closed - dependency recovered")
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit once the threshold is reached"""
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._consecutive_failures += 1
+            state = self._current_state()
+            if state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if state != self.OPEN:
+                    self._times_opened += 1
+                    print(f"🔌 Circuit '{self.name}' opened after {self._consecutive_failures} consecutive failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def record_ignored(self) -> None:
+        """Record a call that failed for reasons unrelated to the dependency's health.
+
+        The failure count is left unchanged; a half-open trial slot is released so the
+        next call can probe the dependency.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict:
+        """Return the breaker state and counters"""
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._consecutive_failures,
+                "times_opened": self._times_opened,
+                "rejected_calls": self._rejected,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout
+            }
+
+    def _current_state(self) -> str:
+        """Current state, moving from open to half-open once the reset timeout has passed"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
@@ -0,0 +1,148 @@
+from typing import Dict, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+from src.utils.cache import LRUTTLCache
+from src.utils.sqlite import connect, initialize
+
+
+class ExtractionCache:
+    """Extracted PDF documents keyed by content hash, in memory and optionally on disk.
+
+    The memory tier is a per-process LRU. The disk tier is a SQLite table that every gunicorn
+    worker on the host shares; it is evicted least recently used first once it holds more than
+    `max_disk_entries` documents. Disk hits are promoted into the memory tier.
+    """
+
+    def __init__(self, max_entries: int = 256, db_path: str = "", max_disk_entries: int = 10000):
+        self.memory = LRUTTLCache(max_entries=max_entries, ttl_seconds=0)
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+        self.disk_errors = 0
+
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._init_db()
+
+    def get(self, key: str) -> Tuple[Optional[Dict], str]:
+        """Return `(document, tier)` with tier "memory" or "disk", or `(None, "miss")`"""
+        document = self.memory.get(key)
+        if document is not None:
+            self._count("memory_hits")
+            return document, "memory"
+
+        document = self._disk_get(key)
+        if document is not None:
+            self.memory.set(key, document)
+            self._count("disk_hits")
+            return document, "disk"
+
+        self._count("misses")
+        return None, "miss"
+
+    def set(self, key: str, document: Dict) -> None:
+        """Store a document in both tiers"""
+        self.memory.set(key, document)
+        self._disk_set(key, document)
+
+    def clear(self) -> None:
+        """Drop every entry of both tiers (counters are kept)"""
+        self.memory.clear()
+        if self.db_path:
+            with connect(self.db_path) as conn:
+                conn.execute("DELETE FROM extracted_documents")
+
+    def stats(self) -> Dict:
+        """Return per-tier hit counters (this process) and current occupancy"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            stats = {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self.memory),
+                "max_memory_entries": self.memory.max_entries,
+                "memory_evictions": self.memory.evictions,
+                "disk_enabled": bool(self.db_path),
+                "disk_evictions": self.disk_evictions,
+                "disk_errors": self.disk_errors
+            }
+        if self.db_path:
+            try:
+                with connect(self.db_path) as conn:
+                    row = conn.execute(
+                        "SELECT COUNT(*) AS entries, COALESCE(SUM(LENGTH(document)), 0) AS size FROM extracted_documents"
+                    ).fetchone()
+                stats.update(disk_entries=row["entries"], disk_bytes=row["size"],
+                             max_disk_entries=self.max_disk_entries)
+            except sqlite3.Error as e:
+                print(f"⚠️ PDF text cache stats failed: {e}")
+        return stats
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _disk_get(self, key: str) -> Optional[Dict]:
+        """Read a document from the shared disk tier and mark it as recently used"""
+        if not self.db_path:
+            return None
+        try:
+            with connect(self.db_path) as conn:
+                row = conn.execute("SELECT document FROM extracted_documents WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE extracted_documents SET last_used_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            # The disk tier is an optimization; extraction still works without it
+            self._count("disk_errors")
+            print(f"⚠️ PDF text cache read failed: {e}")
+            return None
+        return json.loads(row["document"]) if row is not None else None
+
+    def _disk_set(self, key: str, document: Dict) -> None:
+        """Write a document to the shared disk tier, evicting the least recently used beyond the bound"""
+        if not self.db_path:
+            return
+        now = time.time()
+        try:
+            with connect(self.db_path) as conn:
+                conn.execute(
+                    """INSERT OR REPLACE INTO extracted_documents (key, document, created_at, last_used_at)
+                       VALUES (?, ?, ?, ?)""",
+                    (key, json.dumps(document), now, now)
+                )
+                evicted = conn.execute(
+                    """DELETE FROM extracted_documents WHERE key IN (
+                           SELECT key FROM extracted_documents ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                       )""",
+                    (self.max_disk_entries,)
+                ).rowcount
+        except sqlite3.Error as e:
+            self._count("disk_errors")
+            print(f"⚠️ PDF text cache write failed: {e}")
+            return
+        if evicted:
+            self._count("disk_evictions", evicted)
+
+    def _init_db(self) -> None:
+        """Create the document table if needed"""
+        with initialize(self.db_path) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS extracted_documents (
+                       key TEXT PRIMARY KEY,
+                       document TEXT NOT NULL,
+                       created_at REAL NOT NULL,
+                       last_used_at REAL NOT NULL
+                   )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extracted_documents_last_used ON extracted_documents (last_used_at)"
+            )
@@ -0,0 +1,245 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from src.utils import metrics
+
+
+class ExtractionError(Exception):
+    """A PDF that was refused or abandoned; the message is safe to return to the client"""
+
+
+class ExtractionTimeout(ExtractionError):
+    """Extraction did not finish within the per-document time limit"""
+
+
+class ExtractionMemoryLimit(ExtractionError):
+    """The worker extracting the document exceeded its memory limit"""
+
+
+def _worker_main(conn) -> None:
+    """Worker process loop: run `(function, args)` messages until told to stop"""
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        function, args = message
+        try:
+            reply = (True, function(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # Results or exceptions that cannot be pickled still produce an answer
+            conn.send((False, RuntimeError(f"{type(reply[1]).__name__}: {e}")))
+
+
+class _Worker:
+    """One sandboxed worker process and the pipe to it"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def rss_bytes(self) -> Optional[int]:
+        """Resident memory of the process (Linux /proc), or None where it cannot be read"""
+        try:
+            with open(f"/proc/{self.process.pid}/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        """Ask the worker to exit, killing it if it does not"""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ExtractionSandbox:
+    """Pool of isolated worker processes for parsing untrusted PDFs.
+
+    Every task gets a wall-clock deadline and its worker's resident memory is watched while it
+    runs; a worker that overruns either is killed and replaced, and the caller gets an
+    ExtractionError instead of a hang. Workers are also recycled after `max_tasks_per_worker`
+    tasks. Functions must be importable module-level functions (they are pickled by name).
+    With `processes` 0, functions run in the calling process without limits.
+    """
+
+    def __init__(self, processes: int = 1, timeout_seconds: float = 30, max_rss_bytes: int = 0,
+                 max_tasks_per_worker: int = 100, poll_interval: float = 0.05):
+        self.processes = processes
+        self.timeout_seconds = timeout_seconds
+        self.max_rss_bytes = max_rss_bytes
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.poll_interval = poll_interval
+        # Spawned (not forked) workers, since the web worker runs request threads
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._started = False
+        self._fanout = None
+        self.tasks = 0
+        self.timeouts = 0
+        self.queue_timeouts = 0
+        self.memory_kills = 0
+        self.crashes = 0
+        self.recycles = 0
+
+    def run(self, function: Callable, *args, deadline: Optional[float] = None) -> Any:
+        """Run `function(*args)` in a worker and return its result or re-raise its exception.
+
+        `deadline` is a time.monotonic() value; by default the task gets `timeout_seconds`.
+        """
+        if self.processes <= 0:
+            return function(*args)
+        self._ensure_started()
+        if deadline is None:
+            deadline = time.monotonic() + self.timeout_seconds
+
+        try:
+            worker = self._idle.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            self._count("queue_timeouts")
+            raise ExtractionTimeout("No PDF extraction worker became available in time; please retry")
+
+        try:
+            ok, value = self._call(worker, function, args, deadline)
+        except BaseException:
+            # The worker may be mid-task; never hand it to another caller
+            if worker in self._workers:
+                self._replace(worker, "crash")
+            raise
+        with self._lock:
+            self.tasks += 1
+        worker.tasks += 1
+        if self.max_tasks_per_worker and worker.tasks >= self.max_tasks_per_worker:
+            self._replace(worker, "recycle")
+        else:
+            self._idle.put(worker)
+        if ok:
+            return value
+        raise value
+
+    def run_all(self, calls: Sequence[Tuple[Callable, tuple]], deadline: Optional[float] = None) -> List[Any]:
+        """Run `(function, args)` calls on as many workers as are free, results in call order"""
+        if len(calls) <= 1 or self.processes <= 1:
+            return [self.run(function, *args, deadline=deadline) for function, args in calls]
+        self._ensure_started()
+        if deadline is None:
+            deadline = time.monotonic() + self.timeout_seconds
+        futures = [self._fanout.submit(self.run, function, *args, deadline=deadline) for function, args in calls]
+        return [future.result() for future in futures]
+
+    def stats(self) -> Dict:
+        """Return task, timeout and worker restart counters of this process"""
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "live_workers": len(self._workers),
+                "idle_workers": self._idle.qsize(),
+                "timeout_seconds": self.timeout_seconds,
+                "max_rss_bytes": self.max_rss_bytes,
+                "tasks": self.tasks,
+                "timeouts": self.timeouts,
+                "queue_timeouts": self.queue_timeouts,
+                "memory_kills": self.memory_kills,
+                "crashes": self.crashes,
+                "recycles": self.recycles,
+                "restarts": self.timeouts + self.memory_kills + self.crashes + self.recycles
+            }
+
+    def shutdown(self) -> None:
+        """Stop every worker; the pool starts again on the next task"""
+        with self._lock:
+            workers, self._workers = self._workers, set()
+            self._idle = queue.Queue()
+            fanout, self._fanout = self._fanout, None
+            self._started = False
+        for worker in workers:
+            worker.stop()
+        if fanout is not None:
+            fanout.shutdown()
+
+    def _call(self, worker: _Worker, function: Callable, args: tuple, deadline: float) -> Tuple[bool, Any]:
+        """Send one task and wait for its reply, enforcing the deadline and the memory limit"""
+        try:
+            worker.conn.send((function, args))
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._replace(worker, "timeout")
+                    raise ExtractionTimeout(
+                        f"PDF extraction took longer than {self.timeout_seconds:g} seconds and was stopped"
+                    )
+                # The pipe also becomes readable (EOF) when the worker dies
+                if worker.conn.poll(min(self.poll_interval, remaining)):
+                    return worker.conn.recv()
+                rss = worker.rss_bytes() if self.max_rss_bytes else None
+                if rss is not None and rss > self.max_rss_bytes:
+                    self._replace(worker, "memory")
+                    raise ExtractionMemoryLimit(
+                        f"PDF extraction exceeded the {self.max_rss_bytes // (1024 * 1024)} MB memory limit"
+                    )
+        except (EOFError, OSError):
+            self._replace(worker, "crash")
+            raise ExtractionError("PDF extraction worker crashed while reading this file")
+
+    def _replace(self, worker: _Worker, reason: str) -> None:
+        """Retire a worker (killing it unless it is recycled when idle) and start its replacement"""
+        counter = {"timeout": "timeouts", "memory": "memory_kills", "crash": "crashes", "recycle": "recycles"}[reason]
+        with self._lock:
+            if worker not in self._workers:
+                return
+            self._workers.discard(worker)
+            setattr(self, counter, getattr(self, counter) + 1)
+        if reason == "recycle":
+            worker.stop()
+        else:
+            worker.kill()
+            print(f"♻️ Restarted PDF extraction worker after {reason}")
+        metrics.PDF_WORKER_RESTARTS.labels(reason=reason).inc()
+        self._add_worker()
+
+    def _add_worker(self) -> None:
+        worker = _Worker(self._context)
+        with self._lock:
+            self._workers.add(worker)
+        self._idle.put(worker)
+
+    def _ensure_started(self) -> None:
+        """Start the workers on first use in this process"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self._fanout = ThreadPoolExecutor(max_workers=self.processes * 2, thread_name_prefix="pdf-fanout")
+        for _ in range(self.processes):
+            self._add_worker()
+        print(f"📄 Started {self.processes} sandboxed PDF extraction workers")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
@@ -1,26 +1,123 @@
+import hashlib
+import io
 import os
+import shutil
 import tempfile
+import time
 import PyPDF2
-import pdfplumber
-from typing import Optional
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, Optional, Union
+from config.settings import Config
+from src.utils import metrics
+from src.utils.extraction_cache import ExtractionCache
+from src.utils.extraction_sandbox import ExtractionError, ExtractionMemoryLimit, ExtractionSandbox, ExtractionTimeout
+from src.utils.page_quality import is_good_page
+from src.utils.pdf_pages import (PdfData, extract_page_range, extract_pypdf2_pages, extract_with_pypdf2, inspect_pdf,
+                                 join_pages, page_ranges, page_runs)
+
+# What extract_text_from_pdf accepts: a file path, raw bytes or a seekable binary stream
+PdfSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
 
 class FileHandler:
     """Handle file operations for resume processing"""
     
-    def __init__(self):
+    # Bump whenever extraction output changes so cached documents from older code are not reused
+    EXTRACTION_VERSION = 2
+    STRATEGIES = ("adaptive", "pdfplumber")
+    
+    def __init__(self, spill_threshold: Optional[int] = None, cache: Optional[ExtractionCache] = None,
+                 normalizer=None, sandbox: Optional[ExtractionSandbox] = None,
+                 parallel_min_pages: Optional[int] = None, max_pages: Optional[int] = None,
+                 strategy: Optional[str] = None):
+        """Initialize the handler.
+        
+        `cache` (an ExtractionCache) stores extracted documents by the SHA-256 of the PDF bytes;
+        `normalizer` (a TextNormalizer) cleans the text once, before it is cached.
+        PDFs are parsed in the `sandbox` worker processes (configured from Config by default);
+        documents with at least `parallel_min_pages` pages are split into one page range per
+        worker, and documents above `max_pages` pages are refused.
+        `strategy` "adaptive" reads every page with PyPDF2 and re-extracts only the pages whose
+        text scores poorly with pdfplumber; "pdfplumber" uses pdfplumber for every page.
+        """
         self.allowed_extensions = {'pdf'}
         self.max_file_size = 16 * 1024 * 1024  # 16MB
+        # Uploads up to this size are parsed from memory; larger ones are spilled to a temp file
+        self.spill_threshold = Config.PDF_SPILL_THRESHOLD_BYTES if spill_threshold is None else spill_threshold
+        self.cache = cache
+        self.normalizer = normalizer
+        self.sandbox = sandbox if sandbox is not None else ExtractionSandbox(
+            processes=Config.PDF_WORKER_PROCESSES,
+            timeout_seconds=Config.PDF_EXTRACTION_TIMEOUT_SECONDS,
+            max_rss_bytes=Config.PDF_WORKER_MAX_RSS_MB * 1024 * 1024,
+            max_tasks_per_worker=Config.PDF_WORKER_MAX_TASKS
+        )
+        self.parallel_min_pages = Config.PDF_PARALLEL_MIN_PAGES if parallel_min_pages is None else parallel_min_pages
+        self.max_pages = Config.PDF_MAX_PAGES if max_pages is None else max_pages
+        self.strategy = strategy or Config.PDF_EXTRACTION_STRATEGY
+        if self.strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown PDF extraction strategy '{self.strategy}'; expected one of {self.STRATEGIES}")
     
-    def save_temp_file(self, file, filename: str) -> str:
-        """Save uploaded file temporarily"""
-        # Create temporary file
-        temp_dir = tempfile.gettempdir()
-        temp_path = os.path.join(temp_dir, f"resume_{filename}")
+    @contextmanager
+    def open_upload(self, upload: Union[bytes, bytearray, memoryview, BinaryIO], filename: str = "") -> Iterator[PdfSource]:
+        """Yield a source for extract_text_from_pdf without touching disk when possible.
         
-        # Save file
+        `upload` is raw bytes, a werkzeug FileStorage or any binary stream. Uploads up to
+        `spill_threshold` bytes are parsed from memory (an in-memory stream is used as is);
+        larger or non-seekable uploads are copied to a uniquely named temporary file, which
+        is removed when the block exits.
+        """
+        if isinstance(upload, (bytes, bytearray, memoryview)):
+            if len(upload) <= self.spill_threshold:
+                metrics.PDF_INGESTIONS.labels(mode="memory").inc()
+                yield io.BytesIO(upload)
+                return
+            stream = io.BytesIO(upload)
+        else:
+            stream = getattr(upload, "stream", upload)
+            size = self._stream_size(stream)
+            if size is not None and size <= self.spill_threshold:
+                metrics.PDF_INGESTIONS.labels(mode="memory").inc()
+                stream.seek(0)
+                yield stream if isinstance(stream, io.BytesIO) else io.BytesIO(stream.read())
+                return
+        
+        metrics.PDF_INGESTIONS.labels(mode="spill").inc()
+        fd, temp_path = tempfile.mkstemp(prefix="resume_", suffix=f"_{filename}" if filename else ".pdf")
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                if hasattr(stream, "seek"):
+                    stream.seek(0)
+                shutil.copyfileobj(stream, temp_file, 1024 * 1024)
+            yield temp_path
+        finally:
+            self.cleanup_temp_file(temp_path)
+    
+    @staticmethod
+    def _stream_size(stream) -> Optional[int]:
+        """Size of a seekable stream, or None if it cannot seek"""
+        try:
+            if not stream.seekable():
+                return None
+            size = stream.seek(0, os.SEEK_END)
+            stream.seek(0)
+            return size
+        except (AttributeError, OSError, ValueError):
+            return None
+    
+    def save_temp_file(self, file, filename: str) -> str:
+        """Save uploaded file to a uniquely named temporary file"""
+        fd, temp_path = tempfile.mkstemp(prefix="resume_", suffix=f"_{filename}")
+        os.close(fd)
         file.save(temp_path)
         return temp_path
     
+    def save_temp_bytes(self, data: bytes, filename: str) -> str:
+        """Save raw upload bytes to a uniquely named temporary file"""
+        fd, temp_path = tempfile.mkstemp(prefix="resume_", suffix=f"_{filename}")
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(data)
+        return temp_path
+    
     def cleanup_temp_file(self, file_path: str) -> None:
         """Remove temporary file"""
         try:
@@ -29,46 +126,188 @@ class FileHandler:
         except Exception as e:
             print(f"Error cleaning up file {file_path}: {e}")
     
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF using multiple methods for better accuracy"""
-        text = ""
+    def extract_text_from_pdf(self, file_path: PdfSource) -> str:
+        """Extract text from PDF using multiple methods for better accuracy.
+        
+        `file_path` may also be raw bytes or a seekable binary stream (see open_upload).
+        Repeated uploads of the same bytes are served from the cache.
+        """
+        return self.extract_document(file_path)["text"]
+    
+    def extract_document(self, source: PdfSource) -> Dict:
+        """Extract a PDF's text, page count and metadata, served from the cache when possible.
+        
+        Returns `text` (with a `text_normalization` token report when the handler has a normalizer),
+        `page_count`, `metadata`, `extraction_method`, the `sha256` of the PDF bytes and the
+        `cache` tier that answered ("memory", "disk" or "miss").
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        digest = self._content_digest(source)
+        key = self._cache_key(digest)
+        
+        if self.cache is not None:
+            document, tier = self.cache.get(key)
+            metrics.PDF_TEXT_CACHE_REQUESTS.labels(result=tier).inc()
+            if document is not None:
+                print(f"⚡ PDF text cache hit ({tier}) for {digest[:12]}")
+                document.update(sha256=digest, cache=tier)
+                return document
+        
+        document = self._extract_document(source)
+        if self.normalizer is not None:
+            normalized = self.normalizer.normalize(document["text"])
+            document["text"] = normalized.pop("text")
+            document["text_normalization"] = normalized
+        if self.cache is not None:
+            self.cache.set(key, document)
+        document.update(sha256=digest, cache="miss")
+        return document
+    
+    def _cache_key(self, digest: str) -> str:
+        """Cache key of a document: its content hash plus everything that shapes the stored text"""
+        normalization = "raw"
+        if self.normalizer is not None:
+            normalization = f"{self.normalizer.max_tokens}:{self.normalizer.repeated_line_threshold}"
+        return f"v{self.EXTRACTION_VERSION}:{self.strategy}:{normalization}:{digest}"
+    
+    @staticmethod
+    def _content_digest(source: PdfSource) -> str:
+        """SHA-256 of the raw PDF bytes; streams are left at position 0"""
+        if isinstance(source, io.BytesIO):
+            return hashlib.sha256(source.getbuffer()).hexdigest()
+        sha256 = hashlib.sha256()
+        if isinstance(source, str):
+            with open(source, 'rb') as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                    sha256.update(chunk)
+        else:
+            source.seek(0)
+            for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                sha256.update(chunk)
+            source.seek(0)
+        return sha256.hexdigest()
+    
+    def _extract_document(self, source: PdfSource) -> Dict:
+        """Extract in the sandbox workers within one per-document deadline.
+        
+        The adaptive strategy reads every page with PyPDF2 and re-extracts only poorly scored pages
+        with pdfplumber, falling back to the pdfplumber-then-PyPDF2 chain if PyPDF2 cannot parse
+        the file; the pdfplumber strategy uses that chain directly. Documents that are refused
+        (page ceiling), time out or exceed the worker memory limit raise ExtractionError without
+        a fallback; the routes answer those with a 422.
+        """
+        data = self._pdf_data(source)
+        deadline = time.monotonic() + self.sandbox.timeout_seconds
+        
+        if self.strategy == "adaptive":
+            document = None
+            try:
+                document = self._timed_extraction("adaptive", self._extract_adaptive, data, deadline)
+            except ExtractionError:
+                raise
+            except Exception as e:
+                print(f"Adaptive extraction failed: {e}")
+            if document is not None:
+                if document["text"].strip():
+                    return document
+                # pdfplumber already re-read every page PyPDF2 could not, so the fallbacks would find nothing
+                raise Exception("Could not extract text from PDF file")
         
         # Method 1: Try pdfplumber first (best for complex layouts)
         try:
-            text = self._extract_with_pdfplumber(file_path)
-            if text.strip():
-                return text
+            document = self._timed_extraction("pdfplumber", self._extract_with_pdfplumber, data, deadline)
+            if document["text"].strip():
+                return document
+        except ExtractionError:
+            raise
         except Exception as e:
             print(f"pdfplumber failed: {e}")
         
         # Method 2: Fallback to PyPDF2
         try:
-            text = self._extract_with_pypdf2(file_path)
-            if text.strip():
-                return text
+            document = self._timed_extraction("pypdf2", self._extract_with_pypdf2, data, deadline)
+            if document["text"].strip():
+                return document
+        except ExtractionError:
+            raise
         except Exception as e:
             print(f"PyPDF2 failed: {e}")
         
         raise Exception("Could not extract text from PDF file")
     
-    def _extract_with_pdfplumber(self, file_path: str) -> str:
-        """Extract text using pdfplumber"""
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        return text
-    
-    def _extract_with_pypdf2(self, file_path: str) -> str:
+    @staticmethod
+    def _pdf_data(source: PdfSource) -> PdfData:
+        """The path or raw bytes of a source, which can be sent to a worker process"""
+        if isinstance(source, str):
+            return source
+        if isinstance(source, io.BytesIO):
+            return source.getvalue()
+        source.seek(0)
+        return source.read()
+    
+    def _timed_extraction(self, method: str, extract, data: PdfData, deadline: float) -> Dict:
+        """Run one extraction method, recording its duration and outcome"""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            document = extract(data, deadline)
+            document["extraction_method"] = method
+            outcome = "success" if document["text"].strip() else "empty"
+            return document
+        except ExtractionError as e:
+            outcome = ("timeout" if isinstance(e, ExtractionTimeout)
+                       else "memory_limit" if isinstance(e, ExtractionMemoryLimit) else "rejected")
+            metrics.PDF_EXTRACTION_REJECTIONS.labels(reason=outcome).inc()
+            print(f"🛑 PDF extraction stopped ({outcome}): {e}")
+            raise
+        finally:
+            metrics.PDF_EXTRACTION_DURATION.labels(method=method, outcome=outcome).observe(
+                time.perf_counter() - started
+            )
+    
+    def _extract_with_pdfplumber(self, data: PdfData, deadline: float) -> Dict:
+        """Extract text using pdfplumber, one page range per sandbox worker for long documents"""
+        info = self.sandbox.run(inspect_pdf, data, self.max_pages, deadline=deadline)
+        page_count = info["page_count"]
+        parts = self.sandbox.processes if page_count >= self.parallel_min_pages else 1
+        chunks = self.sandbox.run_all(
+            [(extract_page_range, (data, start, stop)) for start, stop in page_ranges(page_count, parts)],
+            deadline=deadline
+        )
+        pages = [text for chunk in chunks for text in chunk]
+        return {"text": join_pages(pages), "page_count": page_count, "metadata": info["metadata"]}
+    
+    def _extract_adaptive(self, data: PdfData, deadline: float) -> Dict:
+        """PyPDF2 for every page, then pdfplumber for only the pages whose text scores poorly"""
+        fast = self.sandbox.run(extract_pypdf2_pages, data, self.max_pages, deadline=deadline)
+        pages = fast["pages"]
+        poor_pages = [index for index, text in enumerate(pages) if not is_good_page(text)]
+        
+        if poor_pages:
+            # Long runs of poor pages (e.g. a scanned-looking document) are split across workers
+            ranges = []
+            for start, stop in page_runs(poor_pages):
+                parts = self.sandbox.processes if stop - start >= self.parallel_min_pages else 1
+                ranges.extend((start + first, start + last) for first, last in page_ranges(stop - start, parts))
+            chunks = self.sandbox.run_all(
+                [(extract_page_range, (data, start, stop)) for start, stop in ranges], deadline=deadline
+            )
+            for (start, stop), chunk in zip(ranges, chunks):
+                pages[start:stop] = chunk
+        
+        metrics.PDF_ADAPTIVE_PAGES.labels(engine="pypdf2").inc(len(pages) - len(poor_pages))
+        metrics.PDF_ADAPTIVE_PAGES.labels(engine="pdfplumber").inc(len(poor_pages))
+        return {"text": join_pages(pages), "page_count": fast["page_count"], "metadata": fast["metadata"],
+                "reextracted_pages": poor_pages}
+    
+    def _extract_with_pypdf2(self, data: PdfData, deadline: float) -> Dict:
         """Extract text using PyPDF2"""
-        text = ""
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+        return self.sandbox.run(extract_with_pypdf2, data, self.max_pages, deadline=deadline)
+    
+    def shutdown(self) -> None:
+        """Stop the sandboxed extraction workers"""
+        self.sandbox.shutdown()
     
     def get_file_info(self, file_path: str) -> dict:
         """Get file information"""
@@ -0,0 +1,166 @@
+from typing import Callable, Dict, Tuple
+import os
+import time
+
+try:
+    from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge,
+                                   Histogram, generate_latest, multiprocess)
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # Metrics are disabled without prometheus_client
+    Counter = Gauge = Histogram = None
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _NoopMetric:
+    """Stand-in used when prometheus_client is not installed"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, *args, **kwargs):
+        pass
+
+    def inc(self, *args, **kwargs):
+        pass
+
+    def set(self, *args, **kwargs):
+        pass
+
+
+def _metric(metric_class, *args, **kwargs):
+    """Create a metric, or a no-op stand-in when prometheus_client is unavailable"""
+    if metric_class is None:
+        return _NoopMetric()
+    return metric_class(*args, **kwargs)
+
+
+ENABLED = Counter is not None
+
+# LLM calls take seconds; HTTP requests span cache hits (ms) to full analyses (tens of seconds)
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+HTTP_REQUEST_DURATION = _metric(
+    Histogram, "http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+PDF_EXTRACTION_DURATION = _metric(
+    Histogram, "pdf_extraction_duration_seconds", "PDF text extraction time by extraction method",
+    ["method", "outcome"], buckets=LATENCY_BUCKETS
+)
+PDF_INGESTIONS = _metric(
+    Counter, "pdf_ingestions_total", "PDF uploads by ingestion mode (memory, or spill to a temp file)",
+    ["mode"]
+)
+PDF_TEXT_CACHE_REQUESTS = _metric(
+    Counter, "pdf_text_cache_requests_total", "PDF text cache lookups by result (memory, disk or miss)",
+    ["result"]
+)
+PDF_EXTRACTION_REJECTIONS = _metric(
+    Counter, "pdf_extraction_rejections_total",
+    "PDF extractions stopped by the sandbox (timeout, memory_limit, rejected)", ["reason"]
+)
+PDF_ADAPTIVE_PAGES = _metric(
+    Counter, "pdf_adaptive_pages_total",
+    "Pages extracted by the adaptive strategy, by the engine whose text was kept (pypdf2, pdfplumber)", ["engine"]
+)
+PDF_WORKER_RESTARTS = _metric(
+    Counter, "pdf_worker_restarts_total", "Sandboxed PDF extraction worker restarts by reason", ["reason"]
+)
+LLM_AGENT_DURATION = _metric(
+    Histogram, "llm_agent_duration_seconds", "Latency of each LLM agent call attempt",
+    ["agent", "outcome"], buckets=LATENCY_BUCKETS
+)
+LLM_TOKENS = _metric(
+    Histogram, "llm_tokens", "Tokens per LLM call from the response usage",
+    ["agent", "kind"], buckets=TOKEN_BUCKETS
+)
+LLM_JSON_PARSE = _metric(
+    Counter, "llm_json_parse_total", "LLM response parsing by outcome (direct, repaired, invalid, unparseable)",
+    ["kind", "outcome"]
+)
+LLM_OUTPUT_RETRIES = _metric(
+    Counter, "llm_output_retries_total", "Agents re-asked after unusable output, by whether the retry recovered",
+    ["agent", "outcome"]
+)
+LLM_DEGRADED_SECTIONS = _metric(
+    Counter, "llm_degraded_sections_total", "Analysis sections replaced by the rule-based fallback",
+    ["section"]
+)
+ANALYSIS_CACHE_REQUESTS = _metric(
+    Counter, "analysis_cache_requests_total", "Analysis cache lookups by result (hit, miss, coalesced)",
+    ["kind", "result"]
+)
+ANALYSIS_CACHE_ENTRIES = _metric(
+    Gauge, "analysis_cache_entries", "Entries in the analysis result cache, summed over live workers",
+    multiprocess_mode="livesum"
+)
+
+
+class StatsCollector:
+    """Expose a stats() dict as gauges at scrape time (for state shared by all workers, e.g. SQLite)"""
+
+    def __init__(self, prefix: str, stats_fn: Callable[[], Dict], description: str):
+        self.prefix = prefix
+        self.stats_fn = stats_fn
+        self.description = description
+
+    def collect(self):
+        try:
+            stats = self.stats_fn()
+        except Exception as e:
+            print(f"⚠️ Metrics collection failed for {self.prefix}: {e}")
+            return
+        for name, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield GaugeMetricFamily(f"{self.prefix}_{name}", f"{self.description}: {name}", value=value)
+
+
+_collectors = []
+
+
+def register_collector(collector) -> None:
+    """Add a scrape-time collector to every /metrics response"""
+    if not ENABLED:
+        return
+    _collectors.append(collector)
+    if not multiprocess_dir():
+        REGISTRY.register(collector)
+
+
+def multiprocess_dir() -> str:
+    """Directory shared by gunicorn workers for aggregated metrics (empty when single-process)"""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir") or ""
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Render every metric in the Prometheus text format, aggregated across workers if configured"""
+    if not ENABLED:
+        return b"# prometheus_client is not installed\n", CONTENT_TYPE_LATEST
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        for collector in _collectors:
+            registry.register(collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def init_app(app) -> None:
+    """Record the latency of every request by route template"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_latency(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            # The route template (e.g. /api/resume/jobs/<job_id>) keeps label cardinality bounded
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            HTTP_REQUEST_DURATION.labels(
+                method=request.method, route=route, status=str(response.status_code)
+            ).observe(time.perf_counter() - started)
+        return response
@@ -0,0 +1,51 @@
+from typing import Dict
+import re
+
+# Pages below this many non-whitespace characters are treated as failed extractions
+MIN_PAGE_CHARACTERS = 40
+# Replacement characters, private-use glyphs, control characters and unmapped "(cid:N)" codes
+GARBAGE_PATTERN = re.compile(r'\(cid:\d+\)|[\ufffd\ue000-\uf8ff\x00-\x08\x0b\x0c\x0e-\x1f]')
+MAX_GARBAGE_RATIO = 0.02
+# Readable text averages 3-10 characters per word; words glued together (missing spaces) or
+# letter-spaced words ("J o h n") push the distribution out of that range
+MIN_MEAN_WORD_LENGTH = 2.5
+MAX_MEAN_WORD_LENGTH = 10.0
+MAX_LONG_WORD_RATIO = 0.05
+LONG_WORD_LENGTH = 25
+MAX_SINGLE_CHARACTER_RATIO = 0.35
+
+
+def score_page(text: str) -> Dict:
+    """Quality measures of one page's extracted text and whether it is good enough to keep.
+
+    Returns `characters` (non-whitespace), `garbage_ratio`, `mean_word_length`,
+    `long_word_ratio`, `single_character_ratio` and `good`.
+    """
+    text = text or ""
+    words = text.split()
+    characters = sum(len(word) for word in words)
+    if not characters:
+        return {"characters": 0, "garbage_ratio": 0.0, "mean_word_length": 0.0, "long_word_ratio": 0.0,
+                "single_character_ratio": 0.0, "good": False}
+
+    garbage = sum(len(match) for match in GARBAGE_PATTERN.findall(text))
+    scores = {
+        "characters": characters,
+        "garbage_ratio": round(garbage / characters, 4),
+        "mean_word_length": round(characters / len(words), 2),
+        "long_word_ratio": round(sum(1 for word in words if len(word) >= LONG_WORD_LENGTH) / len(words), 4),
+        "single_character_ratio": round(sum(1 for word in words if len(word) == 1) / len(words), 4)
+    }
+    scores["good"] = (
+        characters >= MIN_PAGE_CHARACTERS
+        and scores["garbage_ratio"] <= MAX_GARBAGE_RATIO
+        and MIN_MEAN_WORD_LENGTH <= scores["mean_word_length"] <= MAX_MEAN_WORD_LENGTH
+        and scores["long_word_ratio"] <= MAX_LONG_WORD_RATIO
+        and scores["single_character_ratio"] <= MAX_SINGLE_CHARACTER_RATIO
+    )
+    return scores
+
+
+def is_good_page(text: str) -> bool:
+    """Whether a fast extractor's page text is usable without a layout-aware re-extraction"""
+    return score_page(text)["good"]
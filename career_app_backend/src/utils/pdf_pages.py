@@ -0,0 +1,96 @@
+from typing import Dict, List, Tuple, Union
+import io
+import PyPDF2
+import pdfplumber
+from src.utils.extraction_sandbox import ExtractionError
+
+# A PDF as a file path or its raw bytes (what can be sent to a worker process)
+PdfData = Union[str, bytes]
+
+# The functions below run in sandboxed worker processes, so they take the document itself
+# rather than an open file and return plain, picklable values.
+
+
+def page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Split pages 0..page_count into at most `parts` contiguous [start, stop) ranges of near-equal size"""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for index in range(parts):
+        stop = start + size + (1 if index < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def inspect_pdf(data: PdfData, max_pages: int = 0) -> Dict:
+    """Page count and metadata of a PDF, refusing documents above `max_pages` (0 = unlimited)"""
+    with pdfplumber.open(_open(data)) as pdf:
+        page_count = len(pdf.pages)
+        _check_page_count(page_count, max_pages)
+        return {"page_count": page_count, "metadata": clean_metadata(pdf.metadata)}
+
+
+def extract_page_range(data: PdfData, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) with pdfplumber, opening only those pages ("" for empty pages)"""
+    if stop <= start:
+        return []
+    with pdfplumber.open(_open(data), pages=list(range(start + 1, stop + 1))) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages]
+
+
+def extract_with_pypdf2(data: PdfData, max_pages: int = 0) -> Dict:
+    """Text, page count and metadata with PyPDF2"""
+    document = extract_pypdf2_pages(data, max_pages)
+    document["text"] = "".join(f"{text}\n" for text in document.pop("pages"))
+    return document
+
+
+def extract_pypdf2_pages(data: PdfData, max_pages: int = 0) -> Dict:
+    """Per-page `pages` texts, page count and metadata with PyPDF2 (fast, no layout analysis)"""
+    pdf_reader = PyPDF2.PdfReader(_open(data))
+    page_count = len(pdf_reader.pages)
+    _check_page_count(page_count, max_pages)
+    return {
+        "pages": [page.extract_text() or "" for page in pdf_reader.pages],
+        "page_count": page_count,
+        "metadata": clean_metadata(pdf_reader.metadata)
+    }
+
+
+def page_runs(indexes: List[int]) -> List[Tuple[int, int]]:
+    """Contiguous [start, stop) ranges covering sorted page indexes"""
+    runs = []
+    for index in indexes:
+        if runs and runs[-1][1] == index:
+            runs[-1] = (runs[-1][0], index + 1)
+        else:
+            runs.append((index, index + 1))
+    return runs
+
+
+def join_pages(pages: List[str]) -> str:
+    """Join page texts in order, one newline after every non-empty page"""
+    return "".join(f"{text}\n" for text in pages if text)
+
+
+def clean_metadata(metadata) -> Dict[str, str]:
+    """Document info as plain strings (PyPDF2 keys start with '/'), so it can be cached as JSON"""
+    cleaned = {}
+    for name, value in (metadata or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, bytes):
+            value = value.decode('utf-8', 'replace')
+        cleaned[str(name).lstrip('/')] = str(value)
+    return cleaned
+
+
+def _open(data: PdfData):
+    return data if isinstance(data, str) else io.BytesIO(data)
+
+
+def _check_page_count(page_count: int, max_pages: int) -> None:
+    if max_pages and page_count > max_pages:
+        raise ExtractionError(f"PDF has {page_count} pages; at most {max_pages} pages are supported")
@@ -0,0 +1,92 @@
+from typing import Any, Dict, List, Tuple
+import re
+
+# Words keep the characters that belong to technology names (c++, c#, node.js, .net);
+# everything else, including hyphens and slashes, separates words
+_TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*|\.[a-z][a-z0-9]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, so "Machine-Learning" and "machine learning" tokenize alike"""
+    return _TOKEN_PATTERN.findall((text or "").lower())
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over word tokens: finds every occurrence of many phrases in one
+    linear pass over the text, with whole-word boundaries by construction"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Phrases ending exactly at each state; build() merges in those of the failure states
+        self._own_outputs: List[List[Tuple[int, Any]]] = [[]]
+        self._outputs: List[List[Tuple[int, Any]]] = [[]]
+        self._built = False
+
+    def add(self, phrase: str, payload: Any) -> None:
+        """Register a phrase; matches report its payload"""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._own_outputs.append([])
+            state = next_state
+        self._own_outputs[state].append((len(tokens), payload))
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links breadth-first (called automatically before the first search).
+        
+        Rebuilds from scratch, so it may be called again after adding more phrases.
+        """
+        self._fail = [0] * len(self._goto)
+        self._outputs = [list(outputs) for outputs in self._own_outputs]
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # A state also reports every phrase that ends at its failure state
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+        self._built = True
+
+    def find_all(self, text: str) -> List[Tuple[int, int, Any]]:
+        """Return `(start_token, token_length, payload)` for every phrase occurrence, overlaps included"""
+        if not self._built:
+            self.build()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matches = []
+        state = 0
+        for index, token in enumerate(tokenize(text)):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, payload in outputs[state]:
+                matches.append((index - length + 1, length, payload))
+        return matches
+
+    def find_longest(self, text: str) -> List[Tuple[int, int, Any]]:
+        """Non-overlapping occurrences, preferring the longest phrase ("react native" over "react")"""
+        selected = []
+        covered_until = -1
+        for start, length, payload in sorted(self.find_all(text), key=lambda match: (match[0], -match[1])):
+            if start > covered_until:
+                selected.append((start, length, payload))
+                covered_until = start + length - 1
+        return selected
@@ -0,0 +1,113 @@
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import FrozenSet, Tuple
+import re
+
+# Terms the rule-based scorers look for (substring matches on the lowercased text)
+FORMAT_HEADERS = ("experience", "education", "skills", "summary", "contact")
+REQUIRED_SECTIONS = ("experience", "education", "skills", "contact")
+SUGGESTION_SECTIONS = ("experience", "education", "skills", "summary", "objective")
+RESUME_SECTIONS = ("summary", "objective", "experience", "education", "skills", "certifications", "projects",
+                   "achievements")
+ACTION_VERBS = ("achieved", "developed", "managed", "led", "created", "implemented", "improved", "designed",
+                "executed", "delivered")
+SUGGESTION_ACTION_VERBS = ACTION_VERBS[:7]
+PROFESSIONAL_TERMS = ("responsible", "collaborated", "coordinated", "analyzed", "optimized")
+SCORED_TERMS = frozenset(FORMAT_HEADERS + REQUIRED_SECTIONS + SUGGESTION_SECTIONS + RESUME_SECTIONS
+                         + ACTION_VERBS + PROFESSIONAL_TERMS)
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+# Same matches as r'\d+%|\d+\+|\$\d+|\d+ [a-zA-Z]+', without re-scanning the digits once per branch
+QUANTIFIED_PATTERN = re.compile(r'(?=[\d$])(?:\$\d+|\d+(?:%|\+| [a-zA-Z]+))')
+
+# Words too common to count as keywords
+COMMON_WORDS = frozenset({
+    "the", "and", "for", "are", "but", "not", "you", "all", "can", "had", "her", "was", "one", "our", "out",
+    "day", "get", "has", "him", "his", "how", "its", "may", "new", "now", "old", "see", "two", "way", "who",
+    "boy", "did", "let", "put", "say", "she", "too", "use"
+})
+MAX_KEYWORDS = 50
+
+# Columns of the ATS scoring feature matrix (see scoring_row)
+SCORING_COLUMNS = ("headers", "email", "phone", "bullets", "action_verbs", "quantified", "professional_terms",
+                   "required_sections")
+
+
+def _terms_present(lower: str) -> FrozenSet[str]:
+    """Scored terms occurring in the lowercased text"""
+    return frozenset(term for term in SCORED_TERMS if term in lower)
+
+
+def _has_email(text: str) -> bool:
+    return '@' in text and EMAIL_PATTERN.search(text) is not None
+
+
+def _has_bullets(text: str) -> bool:
+    return '•' in text or '*' in text or '-' in text
+
+
+class ResumeFeatures:
+    """Everything the rule-based scorers read from a text, extracted in one pass.
+
+    Instances are immutable, so one object can be shared by every scorer and across threads.
+    """
+
+    __slots__ = ("text", "word_count", "sentence_count", "character_count", "total_word_length",
+                 "terms_present", "has_email", "has_phone", "quantified_count", "has_bullets",
+                 "keyword_counts", "keywords")
+
+    def __init__(self, text: str):
+        lower = text.lower()
+        words = text.split()
+        word_counts = Counter(re.sub(r'[^\w\s]', ' ', lower).split())
+        keyword_counts = Counter({word: count for word, count in word_counts.items()
+                                  if len(word) >= 3 and word not in COMMON_WORDS})
+        values = {
+            "text": text,
+            "word_count": len(words),
+            "sentence_count": len(text.split('.')),
+            "character_count": len(text),
+            "total_word_length": len("".join(words)),
+            "terms_present": _terms_present(lower),
+            "has_email": _has_email(text),
+            "has_phone": PHONE_PATTERN.search(text) is not None,
+            "quantified_count": len(QUANTIFIED_PATTERN.findall(text)),
+            "has_bullets": _has_bullets(text),
+            "keyword_counts": MappingProxyType(dict(keyword_counts)),
+            "keywords": tuple(word for word, _ in keyword_counts.most_common(MAX_KEYWORDS))
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ResumeFeatures is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("ResumeFeatures is immutable")
+
+    def count_present(self, terms: Tuple[str, ...]) -> int:
+        """How many of the terms occur in the text"""
+        return sum(1 for term in terms if term in self.terms_present)
+
+
+def scoring_row(text: str) -> Tuple[int, ...]:
+    """The facts ATS scoring reads (SCORING_COLUMNS) without the keyword extraction, for bulk scoring"""
+    terms = _terms_present(text.lower())
+    return (
+        sum(1 for term in FORMAT_HEADERS if term in terms),
+        _has_email(text),
+        PHONE_PATTERN.search(text) is not None,
+        _has_bullets(text),
+        sum(1 for term in ACTION_VERBS if term in terms),
+        len(QUANTIFIED_PATTERN.findall(text)),
+        sum(1 for term in PROFESSIONAL_TERMS if term in terms),
+        sum(1 for term in REQUIRED_SECTIONS if term in terms)
+    )
+
+
+@lru_cache(maxsize=64)
+def extract_features(text: str) -> ResumeFeatures:
+    """Features of a text; the scorers of one request share the same object"""
+    return ResumeFeatures(text or "")
@@ -0,0 +1,84 @@
+from typing import Dict
+import hashlib
+import re
+
+from src.utils.cache import normalize_for_key
+
+# Contact lines (email, phone, links) before the first recognised heading
+HEADER_SECTION = "header"
+# Any other text before the first heading, e.g. the name, a title or an unheaded summary
+INTRODUCTION_SECTION = "introduction"
+
+# Emails, links and phone numbers ("+44 20 7946 0958", "(555) 123-4567", "555-0100"), not year ranges
+CONTACT_LINE = re.compile(
+    r'[\w.+-]+@[\w-]+\.[\w.]+|https?://|www\.|linkedin\.com|github\.com'
+    r'|\+\d[\d\s().-]{6,}\d|\(?\b\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}\b|\b\d{3}-\d{4}\b',
+    re.IGNORECASE
+)
+
+# Exact heading aliases of every recognised section, shared by section splitting here and
+# section-aware truncation in TextNormalizer
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "career summary", "profile", "professional profile",
+                "objective", "career objective", "about me"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"),
+    "education": ("education", "academic background", "education and training", "qualifications"),
+    "skills": ("skills", "technical skills", "key skills", "core skills", "core competencies", "competencies"),
+    "projects": ("projects", "personal projects", "key projects", "selected projects"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications",
+                       "licenses & certifications"),
+    "achievements": ("achievements", "awards", "honors", "honors and awards", "honors & awards",
+                     "accomplishments"),
+    "publications": ("publications", "selected publications", "papers"),
+    "volunteer": ("volunteer", "volunteering", "volunteer experience", "volunteer work"),
+    "languages": ("languages", "language skills"),
+    "interests": ("interests", "hobbies", "hobbies and interests", "interests and hobbies",
+                  "hobbies & interests", "interests & hobbies"),
+    "references": ("references", "referees")
+}
+
+_HEADING_ALIASES = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+
+def split_sections(resume_text: str) -> Dict[str, str]:
+    """Split resume text into its sections by heading lines; repeated headings are concatenated.
+
+    Text before the first heading is split into contact lines (HEADER_SECTION) and everything
+    else (INTRODUCTION_SECTION), so agents that skip contact details still see a title or
+    unheaded summary.
+    """
+    sections = {HEADER_SECTION: []}
+    current = None
+    for line in (resume_text or "").splitlines():
+        heading = heading_section(line)
+        if heading:
+            current = heading
+            sections.setdefault(current, [])
+            continue
+        if current is None:
+            section = HEADER_SECTION if CONTACT_LINE.search(line) else INTRODUCTION_SECTION
+            sections.setdefault(section, []).append(line)
+            continue
+        sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def section_hashes(resume_text: str) -> Dict[str, str]:
+    """Content hash per section; whitespace-only differences hash the same"""
+    return {
+        name: hashlib.sha256(normalize_for_key(content).encode("utf-8")).hexdigest()[:16]
+        for name, content in split_sections(resume_text).items()
+    }
+
+
+def heading_section(line: str) -> str:
+    """Section a heading line introduces, or "" for ordinary content lines.
+
+    Only whole lines equal to a known alias (ignoring case, spacing and decoration such as a
+    trailing colon) are headings, so "Strong communication skills" stays content.
+    """
+    candidate = re.sub(r'[\s:|•\-_=*#]+$', '', line.strip()).strip(' :|•-_=*#').lower()
+    if not candidate or len(candidate.split()) > 5:
+        return ""
+    return _HEADING_ALIASES.get(re.sub(r'\s+', ' ', candidate), "")
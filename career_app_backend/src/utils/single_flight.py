@@ -0,0 +1,76 @@
+from typing import Any, Callable, Dict, Tuple
+import copy
+import threading
+
+
+class _Call:
+    """One in-flight computation shared by every caller with the same key"""
+
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into a single execution"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run `fn` unless an identical call is already in flight, then share its result.
+
+        Returns `(result, shared)`; `shared` is True for callers that waited on another
+        caller's execution. Those callers receive their own deep copy of the result, so
+        every caller may mutate what it gets. Exceptions are re-raised to every caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+            else:
+                call.followers += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                followers = call.followers
+            # No caller can join once the key is gone; snapshot the result for the followers
+            # before the leader's caller gets a chance to mutate it
+            if followers and call.error is None:
+                call.result = copy.deepcopy(result)
+            call.done.set()
+        return result, False
+
+    def stats(self) -> Dict:
+        """Return execution and coalescing counters"""
+        with self._lock:
+            calls = self.executions + self.coalesced
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+                "coalesce_rate": round(self.coalesced / calls, 4) if calls else 0.0
+            }
@@ -0,0 +1,27 @@
+from typing import Iterator
+from contextlib import contextmanager
+import sqlite3
+
+
+@contextmanager
+def connect(db_path: str) -> Iterator[sqlite3.Connection]:
+    """Open a connection that commits on success and is always closed"""
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def initialize(db_path: str) -> Iterator[sqlite3.Connection]:
+    """Open a connection for schema setup with write-ahead logging enabled.
+
+    WAL lets readers in other workers proceed while one writer commits, which
+    every SQLite-backed store here relies on when shared across processes.
+    """
+    with connect(db_path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        yield conn
@@ -0,0 +1,236 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import re
+
+STRING = {"type": "string"}
+NUMBER = {"type": "number"}
+INTEGER = {"type": "integer"}
+
+
+def _object(properties: Dict[str, Dict]) -> Dict:
+    """Object schema in the form strict structured output requires: every property required, no extras"""
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+
+def _array(items: Dict) -> Dict:
+    return {"type": "array", "items": items}
+
+
+STRINGS = _array(STRING)
+
+DETAILED_SCORES = _object({
+    "format_score": NUMBER, "keywords_score": NUMBER, "content_score": NUMBER, "sections_score": NUMBER
+})
+ATS_SCORE = {
+    "overall_score": NUMBER,
+    "max_score": NUMBER,
+    "grade": STRING,
+    "interpretation": STRING,
+    "detailed_scores": DETAILED_SCORES,
+    "recommendations": STRINGS,
+    "strengths": STRINGS,
+    "areas_for_improvement": STRINGS
+}
+CONTENT_DETAILS = {"content_quality": STRING, "key_observations": STRINGS}
+SUGGESTIONS = _object({
+    "priority_improvements": STRINGS, "content_suggestions": STRINGS, "formatting_tips": STRINGS,
+    "keyword_recommendations": STRINGS, "strengths": STRINGS, "missing_elements": STRINGS
+})
+KEYWORDS = _object({
+    "job_description_keywords": STRINGS,
+    "resume_keywords": STRINGS,
+    "matching_keywords": STRINGS,
+    "missing_keywords": STRINGS,
+    "keyword_density": NUMBER,
+    "match_percentage": NUMBER,
+    "critical_missing_keywords": STRINGS,
+    "keyword_suggestions": STRINGS,
+    "industry_keywords": STRINGS
+})
+SKILL = _object({"name": STRING, "level": STRING, "years": NUMBER, "category": STRING})
+SKILLS = _object({
+    "technical_skills": _array(SKILL),
+    "professional_skills": _array(SKILL),
+    "soft_skills": _array(SKILL),
+    "certifications": _array(SKILL),
+    "all_skills": _array(SKILL),
+    "skills_summary": _object({
+        "total_skills": INTEGER,
+        "technical_count": INTEGER,
+        "professional_count": INTEGER,
+        "soft_skills_count": INTEGER,
+        "certifications_count": INTEGER,
+        "average_experience_years": NUMBER,
+        "skill_level_distribution": _object({
+            level: INTEGER for level in ("Expert", "Advanced", "Intermediate", "Beginner", "Certified")
+        })
+    })
+})
+JOB_MATCH = _object({
+    "job_index": INTEGER,
+    "overall_score": NUMBER,
+    "grade": STRING,
+    "interpretation": STRING,
+    "detailed_scores": DETAILED_SCORES,
+    "matching_keywords": STRINGS,
+    "missing_keywords": STRINGS,
+    "critical_missing_keywords": STRINGS,
+    "match_percentage": NUMBER,
+    "keyword_suggestions": STRINGS
+})
+
+# Sections of the combined agent; skills are only asked for when the model enriches them
+COMBINED_SECTIONS = {
+    "ats_score": _object(ATS_SCORE),
+    "analysis_details": _object(CONTENT_DETAILS),
+    "suggestions": SUGGESTIONS,
+    "keywords_analysis": KEYWORDS
+}
+
+# Response schema per agent output kind (the `fallback_key` of _parse_json_response)
+RESPONSE_SCHEMAS = {
+    "ats_score": _object({**ATS_SCORE, **CONTENT_DETAILS}),
+    "suggestions": SUGGESTIONS,
+    "keywords": KEYWORDS,
+    "skills": SKILLS,
+    "combined": _object({**COMBINED_SECTIONS, "skills_analysis": SKILLS}),
+    "combined_without_skills": _object(COMBINED_SECTIONS),
+    "job_requirements": _object({
+        "title": STRING, "required_skills": STRINGS, "preferred_skills": STRINGS, "experience": STRING,
+        "education": STRING, "certifications": STRINGS, "responsibilities": STRINGS
+    }),
+    "job_match": _object({"job_matches": _array(JOB_MATCH)})
+}
+
+
+def response_format(kind: str, strict: bool = True) -> Dict:
+    """`response_format` request option: schema-constrained output, or plain JSON mode"""
+    if strict and kind in RESPONSE_SCHEMAS:
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": kind, "strict": True, "schema": RESPONSE_SCHEMAS[kind]}
+        }
+    return {"type": "json_object"}
+
+
+def compile_validator(schema: Dict) -> Callable[[Any], List[str]]:
+    """Compile a schema into a function returning validation errors (empty when valid).
+
+    Supports the subset the response schemas use: object, array, string, number and
+    integer types with `properties`, `required` and `items`. Unknown extra properties
+    are tolerated so non-strict providers are not rejected for additional detail.
+    """
+    schema_type = schema.get("type")
+
+    if schema_type == "object":
+        properties = {name: compile_validator(child) for name, child in schema.get("properties", {}).items()}
+        required = tuple(schema.get("required", ()))
+
+        def validate_object(value, path="$"):
+            if not isinstance(value, dict):
+                return [f"{path}: expected object"]
+            errors = [f"{path}.{name}: missing" for name in required if name not in value]
+            for name, validate in properties.items():
+                if name in value:
+                    errors.extend(validate(value[name], f"{path}.{name}"))
+            return errors
+        return validate_object
+
+    if schema_type == "array":
+        validate_item = compile_validator(schema.get("items", {}))
+
+        def validate_array(value, path="$"):
+            if not isinstance(value, list):
+                return [f"{path}: expected array"]
+            errors = []
+            for index, item in enumerate(value):
+                errors.extend(validate_item(item, f"{path}[{index}]"))
+            return errors
+        return validate_array
+
+    python_types = {"string": (str,), "number": (int, float), "integer": (int,)}.get(schema_type)
+    if python_types is None:
+        return lambda value, path="$": []
+
+    def validate_scalar(value, path="$"):
+        if isinstance(value, bool) or not isinstance(value, python_types):
+            if schema_type == "integer" and isinstance(value, float) and value.is_integer():
+                return []
+            return [f"{path}: expected {schema_type}"]
+        return []
+    return validate_scalar
+
+
+VALIDATORS = {kind: compile_validator(schema) for kind, schema in RESPONSE_SCHEMAS.items()}
+
+# Curly double quotes some models emit as JSON string delimiters
+_SMART_QUOTES = ("“", "”")
+
+
+def repair_json(text: str) -> Optional[str]:
+    """Cheap local repair of near-valid JSON: code fences, surrounding prose, smart quotes,
+    trailing commas and output truncated by max_tokens (unterminated strings and brackets)"""
+    fence = re.search(r'```(?:json)?\s*(.*?)(?:```|$)', text, re.DOTALL)
+    if fence:
+        text = fence.group(1)
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    # Keep the first top-level object, tracking which brackets are still open. Curly quotes
+    # become '"' only where they delimit a string; inside a string literal they are content.
+    closers = []
+    chars = []
+    in_string = escaped = False
+    string_delimiters = ('"',)
+    for char in text[start:]:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char in string_delimiters:
+                in_string = False
+                char = '"'
+            elif char == '"':
+                # A straight quote inside a string opened with a curly quote is content
+                char = '\\"'
+        elif char == '"' or char in _SMART_QUOTES:
+            in_string = True
+            string_delimiters = ('"',) if char == '"' else _SMART_QUOTES
+            char = '"'
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]" and closers:
+            closers.pop()
+            if not closers:
+                chars.append(char)
+                break
+        chars.append(char)
+    repaired = "".join(chars)
+
+    if closers:
+        # Truncated: close the open string, drop a dangling key or comma, close the brackets
+        if in_string:
+            repaired += '"'
+        if closers[-1] == "}":
+            # Inside an object a trailing string is a key still waiting for its value
+            repaired = re.sub(r'(,\s*"[^"]*"\s*:?\s*|\s*"[^"]*"\s*:\s*)$', '', repaired)
+        repaired = re.sub(r',\s*$', '', repaired)
+        repaired += "".join(reversed(closers))
+    return re.sub(r',(\s*[}\]])', r'\1', repaired)
+
+
+def parse_json(text: str) -> Tuple[Optional[Any], str]:
+    """Parse model output; returns (value, outcome) with outcome 'direct', 'repaired' or 'unparseable'"""
+    try:
+        return json.loads(text), "direct"
+    except (json.JSONDecodeError, TypeError):
+        pass
+    repaired = repair_json(text or "")
+    if repaired is not None:
+        try:
+            return json.loads(repaired), "repaired"
+        except json.JSONDecodeError:
+            pass
+    return None, "unparseable"
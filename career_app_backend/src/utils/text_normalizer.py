@@ -0,0 +1,180 @@
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+import re
+from src.utils.resume_sections import heading_section
+
+try:
+    import tiktoken
+except ImportError:  # Token counts fall back to a character-based estimate
+    tiktoken = None
+
+
+class TextNormalizer:
+    """Clean extracted resume text and compact it to a token budget before prompting"""
+
+    LIGATURES = {
+        "\ufb00": "ff", "\ufb01": "fi", "\ufb02": "fl", "\ufb03": "ffi",
+        "\ufb04": "ffl", "\ufb05": "st", "\ufb06": "st"
+    }
+
+    # Characters that carry no content for the model: soft hyphen, zero-width
+    # characters, byte order mark and the replacement character
+    INVISIBLE_CHARS = re.compile('[\u00ad\u200b\u200c\u200d\u2060\ufeff\ufffd]')
+    CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+    CID_GLYPHS = re.compile(r'\(cid:\d+\)')
+    HYPHENATION = re.compile(r'(\w)-\n[ \t]*([a-z])')
+    PAGE_NUMBER_LINE = re.compile(r'^(page\s*\d+(\s*(of|/)\s*\d+)?|-?\s*\d{1,3}\s*-?|\d+\s*/\s*\d+)$', re.IGNORECASE)
+
+    # Sections of src.utils.resume_sections in truncation priority order (kept whole first)
+    SECTION_PRIORITY = [
+        "summary", "experience", "skills", "education", "certifications", "projects", "achievements",
+        "publications", "volunteer", "languages", "interests", "references"
+    ]
+
+    def __init__(self, max_tokens: int = 3000, repeated_line_threshold: int = 3,
+                 model: str = "gpt-4o-mini"):
+        """Initialize the normalizer; max_tokens <= 0 disables truncation"""
+        self.max_tokens = max_tokens
+        self.repeated_line_threshold = repeated_line_threshold
+        self._encoding = self._load_encoding(model)
+
+    def normalize(self, text: str, max_tokens: Optional[int] = None) -> Dict:
+        """Normalize text and enforce the token budget.
+
+        Returns the cleaned `text` together with token counts before and after,
+        so the reduction can be reported per request.
+        """
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        tokens_before = self.count_tokens(text or "")
+
+        cleaned = self._fix_characters(text or "")
+        cleaned = self.HYPHENATION.sub(r'\1\2', cleaned)
+        lines, removed_lines = self._clean_lines(cleaned)
+        cleaned = "\n".join(lines).strip()
+
+        truncated_sections = []
+        if budget and budget > 0 and self.count_tokens(cleaned) > budget:
+            cleaned, truncated_sections = self._truncate_by_section(cleaned, budget)
+
+        tokens_after = self.count_tokens(cleaned)
+        return {
+            "text": cleaned,
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_saved": tokens_before - tokens_after,
+            "removed_lines": removed_lines,
+            "truncated": bool(truncated_sections),
+            "truncated_sections": truncated_sections
+        }
+
+    def count_tokens(self, text: str) -> int:
+        """Count prompt tokens (estimated as ~4 characters per token without tiktoken)"""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return (len(text) + 3) // 4
+
+    def _fix_characters(self, text: str) -> str:
+        """Replace ligature glyphs and drop invisible, control and unmapped glyph characters"""
+        for ligature, replacement in self.LIGATURES.items():
+            text = text.replace(ligature, replacement)
+        text = text.replace("\u00a0", " ").replace("\r\n", "\n").replace("\r", "\n")
+        text = self.CID_GLYPHS.sub("", text)
+        text = self.INVISIBLE_CHARS.sub("", text)
+        return self.CONTROL_CHARS.sub("", text)
+
+    def _clean_lines(self, text: str) -> Tuple[List[str], int]:
+        """Collapse whitespace and drop page numbers, symbol-only lines and repeated headers/footers"""
+        lines = [re.sub(r'[ \t]+', ' ', line).strip() for line in text.split("\n")]
+        counts = Counter(line.lower() for line in lines if line)
+
+        kept = []
+        seen_repeated = set()
+        removed = 0
+        for line in lines:
+            if not line:
+                # Keep at most one blank line between blocks
+                if kept and kept[-1]:
+                    kept.append("")
+                continue
+
+            key = line.lower()
+            if self.PAGE_NUMBER_LINE.match(line) or not re.search(r'[^\W_]', line):
+                removed += 1
+                continue
+            if self.repeated_line_threshold and counts[key] >= self.repeated_line_threshold:
+                # Running headers/footers repeat on every page; keep the first occurrence only
+                if key in seen_repeated:
+                    removed += 1
+                    continue
+                seen_repeated.add(key)
+            kept.append(line)
+
+        return kept, removed
+
+    def _truncate_by_section(self, text: str, budget: int) -> Tuple[str, List[str]]:
+        """Fit the text into the budget, keeping high-priority sections whole and cutting the rest"""
+        sections = self._split_sections(text)
+        costs = [self.count_tokens("\n".join(lines)) for _, lines in sections]
+
+        # Contact details precede the first header and always come first
+        order = sorted(range(len(sections)), key=lambda i: self._section_rank(sections[i][0]))
+        allowed = {}
+        remaining = budget
+        for index in order:
+            if costs[index] <= remaining:
+                allowed[index] = len(sections[index][1])
+                remaining -= costs[index] + 1
+            else:
+                allowed[index] = self._lines_within_budget(sections[index][1], remaining)
+                remaining -= self.count_tokens("\n".join(sections[index][1][:allowed[index]])) + 1
+                remaining = max(remaining, 0)
+
+        output = []
+        truncated = []
+        for index, (name, lines) in enumerate(sections):
+            if allowed[index] < len(lines):
+                truncated.append(name or "header")
+            output.extend(lines[:allowed[index]])
+        return "\n".join(output).strip(), truncated
+
+    def _split_sections(self, text: str) -> List[Tuple[str, List[str]]]:
+        """Split text into (section name, lines) blocks at recognised section headers"""
+        sections = [("", [])]
+        for line in text.split("\n"):
+            name = self._section_name(line)
+            if name:
+                sections.append((name, [line]))
+            else:
+                sections[-1][1].append(line)
+        return [(name, lines) for name, lines in sections if lines]
+
+    def _section_name(self, line: str) -> Optional[str]:
+        """Return the section a header line introduces, or None for ordinary lines"""
+        return heading_section(line) or None
+
+    def _section_rank(self, name: str) -> int:
+        """Rank sections for truncation; the untitled header block ranks first"""
+        if not name:
+            return -1
+        return self.SECTION_PRIORITY.index(name)
+
+    def _lines_within_budget(self, lines: List[str], budget: int) -> int:
+        """Number of leading lines that fit within the budget"""
+        used = 0
+        for count, line in enumerate(lines):
+            used += self.count_tokens(line) + 1
+            if used > budget:
+                return count
+        return len(lines)
+
+    @staticmethod
+    def _load_encoding(model: str):
+        """Load the tokenizer for the model when tiktoken is installed"""
+        if tiktoken is None:
+            return None
+        try:
+            return tiktoken.encoding_for_model(model)
+        except Exception:
+            return None
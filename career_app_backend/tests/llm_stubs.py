@@ -0,0 +1,21 @@
+"""Helpers for LLM transport stand-ins used across tests"""
+from src.utils.structured_output import RESPONSE_SCHEMAS
+
+
+def schema_instance(schema, **overrides):
+    """Smallest value that validates against a response schema, with top-level overrides"""
+    schema_type = schema.get("type")
+    if schema_type == "object":
+        value = {name: schema_instance(child) for name, child in schema["properties"].items()}
+        value.update(overrides)
+        return value
+    if schema_type == "array":
+        return []
+    if schema_type == "string":
+        return "text"
+    return 0
+
+
+def valid_response(kind, **overrides):
+    """Schema-valid agent response of one output kind"""
+    return schema_instance(RESPONSE_SCHEMAS[kind], **overrides)
@@ -0,0 +1,35 @@
+import pytest
+import time
+from src.services.agent_runner import AgentRunner
+
+class TestAgentRunner:
+    """Test cases for the concurrent agent fan-out"""
+    
+    @pytest.fixture
+    def runner(self):
+        """Create a runner and stop its pool afterwards"""
+        runner = AgentRunner(max_workers=4, default_timeout=1)
+        yield runner
+        runner.shutdown()
+    
+    def test_agents_run_concurrently(self, runner):
+        """Test that wall time approaches the slowest agent"""
+        tasks = {name: (lambda: time.sleep(0.2) or {"ok": True}) for name in ("a", "b", "c", "d")}
+        outcome = runner.run(tasks)
+        assert set(outcome["results"]) == {"a", "b", "c", "d"}
+        assert outcome["wall_time"] < 0.6
+    
+    def test_partial_results_with_errors_and_timeouts(self, runner):
+        """Test that failures are reported per agent and do not drop other results"""
+        def failing():
+            raise ValueError("agent exploded")
+        
+        outcome = runner.run({
+            "fast": lambda: {"score": 80},
+            "failing": failing,
+            "slow": lambda: time.sleep(0.5) or {}
+        }, timeout=0.2)
+        
+        assert outcome["results"] == {"fast": {"score": 80}}
+        assert "agent exploded" in outcome["errors"]["failing"]
+        assert "timed out" in outcome["errors"]["slow"]
@@ -0,0 +1,23 @@
+import pytest
+from collections import Counter
+from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+from tests.test_incremental_analysis import RESUME, CountingTransport
+
+class TestAnalysisDetails:
+    """Test cases for the locally computed text statistics in analysis_details"""
+    
+    def test_statistics_are_local_and_qualitative_fields_come_from_ats_agent(self):
+        """Test that only the ATS Specialist informs analysis_details and the counts match the input"""
+        service = AutoGenResumeAnalysisService(transport=CountingTransport())
+        service.cache.clear()
+        result = service.analyze_resume(RESUME, "Python developer")
+        details = result["analysis_details"]
+        
+        assert service.transport.calls == Counter({"ATS Specialist": 1, "Career Counselor": 1,
+                                                   "Keyword Optimization Agent": 1})
+        assert details["word_count"] == len(RESUME.split())
+        assert details["character_count"] == len(RESUME)
+        assert details["sections_identified"] == ["Summary", "Experience", "Education", "Skills"]
+        assert details["readability_score"] > 0
+        assert details["content_quality"] == "good" and details["key_observations"] == []
+        assert "content_quality" not in result["ats_score"]
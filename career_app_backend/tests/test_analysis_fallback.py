@@ -0,0 +1,84 @@
+import pytest
+import time
+from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+from src.utils.circuit_breaker import CircuitBreaker
+
+RESUME = "Jane Doe\njane@example.com\nExperience\nDeveloped Python services and managed a team of 4\nEducation\nBS Computer Science\nSkills\nPython, Flask, SQL"
+
+class SlowTransport:
+    """LLM transport that never answers within the test deadline"""
+    
+    def complete(self, model, messages, temperature, max_tokens, timeout=None, **options):
+        time.sleep(min(timeout or 1, 1))
+        raise TimeoutError("Request timed out.")
+
+class TestAnalysisFallback:
+    """Test cases for the rule-based fallback of the LLM agents"""
+    
+    @pytest.fixture
+    def service(self):
+        service = AutoGenResumeAnalysisService(transport=SlowTransport())
+        service.analysis_deadline = 0.2
+        service.cache.clear()
+        return service
+    
+    def test_deadline_degrades_every_section(self, service):
+        """Test that agents missing the deadline are replaced by rule-based results"""
+        started = time.monotonic()
+        result = service.analyze_resume(RESUME, "Python developer with Flask")
+        
+        assert time.monotonic() - started < 1
+        assert result["degraded_sections"] == [section for section in service.ANALYSIS_SECTIONS
+                                               if section not in service.LOCAL_SECTIONS]
+        assert result["skills_analysis"]["extraction_method"] == "local"
+        assert result["ats_score"]["overall_score"] > 0
+        assert "matching_keywords" in result["keywords_analysis"]
+        assert service.get_cache_stats()["entries"] == 0
+    
+    def test_open_circuit_skips_model(self, service):
+        """Test that an open circuit answers from the rule-based service immediately"""
+        for _ in range(service.circuit_breaker.failure_threshold):
+            service.circuit_breaker.record_failure()
+        assert service.circuit_breaker.state == CircuitBreaker.OPEN
+        
+        started = time.monotonic()
+        result = service.calculate_ats_score(RESUME)
+        
+        assert time.monotonic() - started < 0.1
+        assert result["degraded_sections"] == ["ats_score"]
+        assert "circuit open" in result["fallback_reason"]
+    
+    def test_rejected_requests_do_not_open_circuit(self):
+        """Test that errors caused by the request itself are not counted as outages"""
+        class BadRequestTransport:
+            def complete(self, model, messages, temperature, max_tokens, timeout=None, **options):
+                error = RuntimeError("Error code: 400 - invalid request")
+                error.status_code = 400
+                raise error
+        
+        service = AutoGenResumeAnalysisService(transport=BadRequestTransport())
+        service.cache.clear()
+        for _ in range(service.circuit_breaker.failure_threshold + 1):
+            assert service.calculate_ats_score(RESUME)["degraded_sections"] == ["ats_score"]
+        
+        assert service.circuit_breaker.state == CircuitBreaker.CLOSED
+        assert service.circuit_breaker.stats()["consecutive_failures"] == 0
+    
+    def test_missing_api_key_falls_back_to_rule_based(self, service):
+        """Test that every analysis path without an API key returns rule-based results"""
+        service.transport = None
+        
+        result = service.calculate_ats_score(RESUME, "Python developer with Flask")
+        assert result["overall_score"] > 0 and "API key" in result["fallback_reason"]
+        
+        for analysis in (service.analyze_resume(RESUME, "Python developer with Flask"),
+                         dict(service.stream_analysis(RESUME, "Python developer with Flask"))["complete"]):
+            assert "error" not in analysis
+            assert analysis["degraded_sections"] == ["ats_score", "analysis_details", "suggestions", "keywords_analysis"]
+            assert analysis["ats_score"]["overall_score"] > 0 and analysis["analysis_details"]["word_count"] > 0
+            assert set(analysis["agent_errors"].values()) == {"OpenAI API key not configured"}
+        
+        batch = service.analyze_batch(RESUME, ["Python developer with Flask", "Data engineer with Spark"])
+        assert "error" not in batch and batch["degraded_jobs"] == [0, 1]
+        assert [entry["rank"] for entry in batch["results"]] == [1, 2]
+        assert batch["resume"]["skills_analysis"]["extraction_method"] == "local"
@@ -0,0 +1,47 @@
+import pytest
+import json
+from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+from src.services.llm_transport import LLMResponse
+from src.services.resume_service import ResumeAnalysisService
+from src.utils.structured_output import JOB_MATCH
+from tests.llm_stubs import schema_instance
+
+RESUME = "Jane Doe\njane@example.com\nExperience\nDeveloped Python services and managed a team of 4\nEducation\nBS Computer Science\nSkills\nPython, Flask, SQL"
+JOBS = ["Python developer with Flask and SQL", "Frontend engineer with React and CSS", "Data engineer with Spark"]
+
+class JobMatchTransport:
+    """LLM transport answering the Job Match Analyst with descending scores"""
+    
+    def complete(self, model, messages, temperature, max_tokens, timeout=None, **options):
+        if "Job Match Analyst" not in messages[0]["content"]:
+            raise RuntimeError("unexpected agent")
+        count = messages[1]["content"].count("JOB DESCRIPTION ")
+        matches = [schema_instance(JOB_MATCH, job_index=index, overall_score=60 + 10 * index, match_percentage=50.0)
+                   for index in range(1, count + 1)]
+        return LLMResponse(json.dumps({"job_matches": matches}))
+
+class TestBatchAnalysis:
+    """Test cases for scoring one resume against several job descriptions"""
+    
+    def test_rule_based_batch_matches_single_calls(self):
+        """Test that the shared resume-side work gives the same results as per-job calls"""
+        service = ResumeAnalysisService()
+        batch = service.score_job_descriptions(RESUME, JOBS)
+        
+        for job_description, result in zip(JOBS, batch):
+            assert result["ats_score"] == service.calculate_ats_score(RESUME, job_description)
+            single = service.extract_keywords(job_description, RESUME)
+            assert sorted(result["keywords_analysis"]["matching_keywords"]) == sorted(single["matching_keywords"])
+            assert result["keywords_analysis"]["match_percentage"] == single["match_percentage"]
+    
+    def test_batch_is_ranked_and_skills_are_local(self):
+        """Test that results are ranked by score and skills are extracted without the model"""
+        service = AutoGenResumeAnalysisService(transport=JobMatchTransport())
+        service.cache.clear()
+        result = service.analyze_batch(RESUME, JOBS)
+        
+        assert [entry["job_index"] for entry in result["results"]] == [2, 1, 0]
+        assert [entry["rank"] for entry in result["results"]] == [1, 2, 3]
+        assert result["degraded_jobs"] == []
+        assert result["resume"]["degraded_sections"] == []
+        assert [skill["name"] for skill in result["resume"]["skills_analysis"]["technical_skills"]] == ["Python", "Flask", "SQL"]
@@ -0,0 +1,50 @@
+import pytest
+import time
+from src.utils.cache import LRUTTLCache, make_cache_key
+
+class TestAnalysisCache:
+    """Test cases for the LRU + TTL analysis cache"""
+    
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted"""
+        cache = LRUTTLCache(max_entries=4, ttl_seconds=60)
+        assert cache.get("missing") is None
+        cache.set("key", {"overall_score": 80})
+        assert cache.get("key") == {"overall_score": 80}
+        
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = LRUTTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+    
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL"""
+        cache = LRUTTLCache(max_entries=2, ttl_seconds=0.05)
+        cache.set("a", 1)
+        time.sleep(0.1)
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+    
+    def test_returned_values_are_copies(self):
+        """Test that mutating a cached result does not corrupt the cache"""
+        cache = LRUTTLCache()
+        cache.set("a", {"items": [1]})
+        cache.get("a")["items"].append(2)
+        assert cache.get("a") == {"items": [1]}
+    
+    def test_cache_key_normalization(self):
+        """Test that whitespace-only differences share a key while parameters do not"""
+        key = make_cache_key("analyze", "John  Doe\n\nPython", "JD", model="gpt-4o-mini")
+        assert key == make_cache_key("analyze", " John Doe Python ", "JD", model="gpt-4o-mini")
+        assert key != make_cache_key("analyze", "John Doe Python", "JD", model="gpt-4o")
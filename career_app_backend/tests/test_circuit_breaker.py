@@ -0,0 +1,52 @@
+import pytest
+import time
+from src.utils.circuit_breaker import CircuitBreaker
+
+class TestCircuitBreaker:
+    """Test cases for the LLM circuit breaker"""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens at the threshold and rejects calls"""
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.stats()["rejected_calls"] == 1
+    
+    def test_half_open_trial(self):
+        """Test that one trial call is allowed after the reset timeout and closes the circuit"""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_failed_trial_reopens(self):
+        """Test that a failed half-open trial opens the circuit again"""
+        breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=0.05)
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow_request()
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.stats()["times_opened"] == 2
+    
+    def test_ignored_failure_releases_half_open_trial(self):
+        """Test that a failure unrelated to the dependency frees the trial slot without re-opening"""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        
+        assert breaker.allow_request()
+        breaker.record_ignored()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
@@ -0,0 +1,97 @@
+import pytest
+import json
+from collections import Counter
+from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+from src.services.llm_transport import LLMResponse
+from tests.llm_stubs import valid_response
+
+RESUME = "Jane Doe\njane@example.com\nExperience\nDeveloped Python services and managed a team of 4\nEducation\nBS Computer Science\nSkills\nPython, Flask, SQL"
+
+class CombinedTransport:
+    """LLM transport answering the Combined Resume Analyst with valid JSON, optionally edited"""
+    
+    def __init__(self, edit=None):
+        self.edit = edit
+        self.calls = Counter()
+        self.schemas = []
+    
+    def complete(self, model, messages, temperature, max_tokens, timeout=None, **options):
+        kind = options["response_format"]["json_schema"]["name"]
+        self.calls[messages[0]["content"].split(",")[0].replace("You are ", "")] += 1
+        self.schemas.append(kind)
+        response = valid_response(kind)
+        if kind.startswith("combined"):
+            response["ats_score"]["overall_score"] = 77
+            response["analysis_details"] = {"content_quality": "strong", "key_observations": ["Clear headings"]}
+            if "skills_analysis" in response:
+                response["skills_analysis"]["technical_skills"] = [
+                    {"name": "python", "level": "Expert", "years": 6, "category": "Programming"}]
+            if self.edit:
+                self.edit(response)
+        return LLMResponse(json.dumps(response))
+
+class TestCombinedAnalysis:
+    """Test cases for ANALYSIS_MODE=combined"""
+    
+    @pytest.fixture
+    def service(self):
+        service = AutoGenResumeAnalysisService(transport=CombinedTransport())
+        service.analysis_mode = "combined"
+        service.skills_llm_enrichment = False
+        service.cache.clear()
+        return service
+    
+    def test_skills_are_extracted_locally(self, service):
+        """Test that combined mode takes skills from the local matcher and does not ask the model for them"""
+        result = service.analyze_resume(RESUME, "Python developer")
+        
+        assert service.transport.schemas == ["combined_without_skills"]
+        assert result["skills_analysis"]["extraction_method"] == "local"
+        assert [skill["name"] for skill in result["skills_analysis"]["technical_skills"]] == ["Python", "Flask", "SQL"]
+        assert "skills_analysis" not in result["degraded_sections"]
+    
+    def test_skills_enrichment_uses_the_combined_response(self, service):
+        """Test that with enrichment on, the combined agent's estimates refine the local skills"""
+        service.skills_llm_enrichment = True
+        result = service.analyze_resume(RESUME, "Python developer")
+        
+        assert service.transport.schemas == ["combined"]
+        assert result["skills_analysis"]["extraction_method"] == "local+llm"
+        python = result["skills_analysis"]["technical_skills"][0]
+        assert (python["name"], python["level"], python["years"]) == ("Python", "Expert", 6)
+    
+    def test_single_call_returns_every_section(self, service):
+        """Test that combined mode makes exactly one LLM call and returns every section"""
+        result = service.analyze_resume(RESUME, "Python developer")
+        
+        assert service.transport.calls == Counter({"Combined Resume Analyst": 1})
+        assert all(section in result for section in service.ANALYSIS_SECTIONS)
+        assert result["degraded_sections"] == [] and result["agent_errors"] == {}
+        assert result["ats_score"]["overall_score"] == 77
+        assert result["analysis_method"] == "AutoGen GPT-4o-mini Combined Agent"
+    
+    @pytest.mark.parametrize("edit", [
+        lambda response: response.pop("suggestions"),
+        lambda response: response.update(keywords_analysis="n/a")
+    ])
+    def test_missing_or_invalid_section_falls_back(self, service, edit):
+        """Test that a combined response missing a section is replaced by rule-based sections"""
+        service.transport.edit = edit
+        service.output_retries = 0
+        result = service.analyze_resume(RESUME, "Python developer")
+        
+        assert sum(service.transport.calls.values()) == 1
+        assert set(result["degraded_sections"]) >= {"ats_score", "suggestions", "keywords_analysis"}
+        assert result["suggestions"] == service.rule_based_service.get_improvement_suggestions(RESUME, "Python developer")
+        assert "matching_keywords" in result["keywords_analysis"]
+        assert result["skills_analysis"]["extraction_method"] == "local"
+        assert result["analysis_details"]["word_count"] > 0
+    
+    def test_qualitative_fields_are_merged_into_analysis_details(self, service):
+        """Test that the model's content fields join the locally computed text statistics"""
+        result = service.analyze_resume(RESUME, "Python developer")
+        details = result["analysis_details"]
+        
+        assert details["content_quality"] == "strong"
+        assert details["key_observations"] == ["Clear headings"]
+        assert details["word_count"] == len(RESUME.split())
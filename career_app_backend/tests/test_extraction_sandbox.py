@@ -0,0 +1,50 @@
+import time
+import pytest
+from src.utils.extraction_sandbox import ExtractionMemoryLimit, ExtractionSandbox, ExtractionTimeout
+
+
+def hold_memory(megabytes, seconds):
+    """Keep `megabytes` resident for `seconds` (runs in a sandbox worker)"""
+    block = bytearray(megabytes * 1024 * 1024)
+    time.sleep(seconds)
+    return len(block)
+
+
+class TestExtractionSandbox:
+    """Test cases for the sandboxed PDF extraction worker pool"""
+
+    @pytest.fixture
+    def sandbox(self):
+        sandbox = ExtractionSandbox(processes=1, timeout_seconds=2, max_rss_bytes=200 * 1024 * 1024,
+                                    max_tasks_per_worker=3)
+        yield sandbox
+        sandbox.shutdown()
+
+    def test_overrunning_workers_are_killed_and_replaced(self, sandbox):
+        """Test that timeouts and memory overruns raise clean errors and restart the worker"""
+        with pytest.raises(ExtractionTimeout):
+            sandbox.run(time.sleep, 5, deadline=time.monotonic() + 0.5)
+        with pytest.raises(ExtractionMemoryLimit):
+            sandbox.run(hold_memory, 300, 5)
+        assert sandbox.run(hold_memory, 1, 0) == 1024 * 1024
+
+        stats = sandbox.stats()
+        assert stats["timeouts"] == 1 and stats["memory_kills"] == 1 and stats["restarts"] == 2
+        assert stats["live_workers"] == 1
+
+    def test_errors_are_returned_and_workers_recycled(self, sandbox):
+        """Test that task exceptions reach the caller and workers are replaced after max tasks"""
+        with pytest.raises(ValueError):
+            sandbox.run(int, "not a number")
+        assert [sandbox.run(len, "abc") for _ in range(5)] == [3] * 5
+        assert sandbox.stats()["recycles"] == 2 and sandbox.stats()["tasks"] == 6
+
+    def test_fan_out_starts_a_fresh_or_shut_down_pool(self):
+        """Test that run_all works before any run() and after shutdown()"""
+        sandbox = ExtractionSandbox(processes=2)
+        try:
+            assert sandbox.run_all([(len, ("ab",)), (len, ("abc",))]) == [2, 3]
+            sandbox.shutdown()
+            assert sandbox.run_all([(len, ("a",)), (len, ("",))]) == [1, 0]
+        finally:
+            sandbox.shutdown()
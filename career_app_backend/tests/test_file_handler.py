@@ -0,0 +1,95 @@
+import io
+import os
+import pytest
+from benchmarks.samples import SAMPLE_RESUME, build_pdf
+from src.utils.extraction_cache import ExtractionCache
+from src.utils.extraction_sandbox import ExtractionError, ExtractionSandbox
+from src.utils.file_handler import FileHandler
+from src.utils.page_quality import score_page
+from src.utils.pdf_pages import page_ranges
+from src.utils.text_normalizer import TextNormalizer
+
+PDF = build_pdf(["Jane Doe", "Python developer"])
+
+class TestFileHandler:
+    """Test cases for in-memory PDF ingestion and the extracted text cache"""
+
+    def test_small_uploads_stay_in_memory(self):
+        """Test that uploads under the threshold are parsed without a temp file"""
+        file_handler = FileHandler(spill_threshold=len(PDF))
+        upload = io.BytesIO(PDF)
+
+        with file_handler.open_upload(upload) as source:
+            assert source is upload
+            text = file_handler.extract_text_from_pdf(source)
+        assert "Jane Doe" in text and "Python developer" in text
+        assert file_handler.extract_text_from_pdf(PDF) == text
+
+    def test_large_uploads_spill_to_unique_temp_files(self):
+        """Test that uploads over the threshold use a unique temp file that is removed afterwards"""
+        file_handler = FileHandler(spill_threshold=len(PDF) - 1)
+
+        with file_handler.open_upload(PDF, "resume.pdf") as first, \
+                file_handler.open_upload(io.BytesIO(PDF), "resume.pdf") as second:
+            assert isinstance(first, str) and first != second
+            assert "Jane Doe" in file_handler.extract_text_from_pdf(second)
+        assert not os.path.exists(first) and not os.path.exists(second)
+
+    def test_long_documents_are_extracted_by_page_ranges_in_order(self):
+        """Test that sandbox workers return the same text as in-process extraction"""
+        pdf = build_pdf([f"Page {index}\nExperience line {index}" for index in range(7)] + [""])
+        in_process = FileHandler(sandbox=ExtractionSandbox(processes=0), strategy="pdfplumber")
+        parallel = FileHandler(sandbox=ExtractionSandbox(processes=3), parallel_min_pages=2, strategy="pdfplumber")
+        try:
+            assert parallel.extract_text_from_pdf(pdf) == in_process.extract_text_from_pdf(pdf)
+            assert parallel.sandbox.stats()["tasks"] == 4
+        finally:
+            parallel.shutdown()
+        assert page_ranges(8, 3) == [(0, 3), (3, 6), (6, 8)]
+        assert page_ranges(2, 4) == [(0, 1), (1, 2)]
+
+    def test_adaptive_strategy_reextracts_only_poor_pages(self):
+        """Test that pages PyPDF2 reads well are kept and only poor pages go to pdfplumber"""
+        pdf = build_pdf([SAMPLE_RESUME, "J o h n   D o e   E n g i n e e r", SAMPLE_RESUME])
+        adaptive = FileHandler(sandbox=ExtractionSandbox(processes=0), strategy="adaptive")
+        layout = FileHandler(sandbox=ExtractionSandbox(processes=0), strategy="pdfplumber")
+
+        document = adaptive.extract_document(pdf)
+        assert document["reextracted_pages"] == [1] and document["extraction_method"] == "adaptive"
+        assert document["text"] == layout.extract_text_from_pdf(pdf)
+        assert score_page(SAMPLE_RESUME)["good"]
+        assert not score_page("(cid:3)(cid:4) " * 20)["good"] and not score_page("x" * 200)["good"]
+
+    def test_documents_over_the_page_ceiling_are_refused(self):
+        """Test that too many pages give a clean error instead of a PyPDF2 fallback"""
+        file_handler = FileHandler(sandbox=ExtractionSandbox(processes=0), max_pages=1)
+        with pytest.raises(ExtractionError, match="at most 1 pages"):
+            file_handler.extract_text_from_pdf(PDF)
+
+    def test_repeat_uploads_are_served_from_the_content_hash_cache(self, tmp_path):
+        """Test that the memory tier, then the disk tier shared by workers, answer repeat uploads"""
+        db_path = str(tmp_path / "pdf_text.db")
+        worker = FileHandler(cache=ExtractionCache(db_path=db_path), normalizer=TextNormalizer())
+        other_worker = FileHandler(cache=ExtractionCache(db_path=db_path), normalizer=TextNormalizer())
+
+        first = worker.extract_document(PDF)
+        assert first["cache"] == "miss" and first["page_count"] == 2
+        assert first["text"] == "Jane Doe\nPython developer" and "tokens_after" in first["text_normalization"]
+        assert worker.extract_document(io.BytesIO(PDF))["cache"] == "memory"
+        assert other_worker.extract_document(PDF) == dict(first, cache="disk")
+        assert other_worker.extract_document(PDF)["cache"] == "memory"
+        assert worker.cache.stats()["hit_rate"] == 0.5
+
+    def test_cache_tiers_evict_least_recently_used(self, tmp_path):
+        """Test that both tiers stay within their bounds"""
+        cache = ExtractionCache(max_entries=1, db_path=str(tmp_path / "pdf_text.db"), max_disk_entries=2)
+        file_handler = FileHandler(cache=cache)
+        pdfs = [build_pdf([f"Resume {index}"]) for index in range(3)]
+        for pdf in pdfs:
+            file_handler.extract_document(pdf)
+
+        stats = cache.stats()
+        assert stats["memory_entries"] == 1 and stats["memory_evictions"] == 2
+        assert stats["disk_entries"] == 2 and stats["disk_evictions"] == 1
+        assert file_handler.extract_document(pdfs[0])["cache"] == "miss"
+        assert file_handler.extract_document(pdfs[2])["cache"] == "disk"
@@ -0,0 +1,104 @@
+import pytest
+import json
+import re
+from collections import Counter
+from src.services.analysis_history import AnalysisHistory
+from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+from src.services.llm_transport import LLMResponse
+from src.utils.resume_sections import split_sections
+from tests.llm_stubs import valid_response
+
+RESUME = """Jane Doe
+jane@example.com | 555-0100
+Professional Summary
+Backend engineer with six years of Python experience
+Work Experience
+Developed Python services and managed a team of 4
+Education
+BS Computer Science
+Technical Skills:
+Python, Flask, SQL"""
+
+class CountingTransport:
+    """LLM transport that answers every agent with valid JSON and counts calls per agent"""
+    
+    def __init__(self):
+        self.calls = Counter()
+    
+    def complete(self, model, messages, temperature, max_tokens, timeout=None, **options):
+        kind = options["response_format"]["json_schema"]["name"]
+        self.calls[re.match(r"You are (.+?),", messages[0]["content"]).group(1)] += 1
+        return LLMResponse(json.dumps(valid_response(kind, overall_score=80, content_quality="good")
+                                      if kind == "ats_score" else valid_response(kind)))
+
+class TestIncrementalAnalysis:
+    """Test cases for incremental re-analysis of a document"""
+    
+    @pytest.fixture
+    def service(self, tmp_path):
+        service = AutoGenResumeAnalysisService(transport=CountingTransport(),
+                                               history=AnalysisHistory(str(tmp_path / "history.db")))
+        service.cache.clear()
+        return service
+    
+    def rerun(self, service, resume_text, job_description):
+        """Analyze again with an empty cache, so only the history can avoid agent calls"""
+        service.cache.clear()
+        service.transport.calls.clear()
+        return service.analyze_resume(resume_text, job_description, document_id="doc-1")
+    
+    def test_split_sections(self):
+        """Test that heading lines split the resume into named sections"""
+        sections = split_sections(RESUME)
+        
+        assert list(sections) == ["header", "introduction", "summary", "experience", "education", "skills"]
+        assert sections["header"] == "jane@example.com | 555-0100"
+        assert sections["introduction"] == "Jane Doe"
+        assert sections["skills"] == "Python, Flask, SQL"
+    
+    def test_job_description_change_skips_skills_agent(self, service):
+        """Test that a new job description re-runs only the agents that read it"""
+        first = self.rerun(service, RESUME, "Python developer")
+        assert len(service.transport.calls) == 3 and not first["incremental"]["previous_analysis"]
+        
+        result = self.rerun(service, RESUME, "Senior Flask engineer")
+        
+        assert service.transport.calls == Counter({"ATS Specialist": 1, "Career Counselor": 1,
+                                                   "Keyword Optimization Agent": 1})
+        assert result["incremental"]["reused_sections"] == ["skills_analysis"]
+        assert result["incremental"]["rerun_sections"] == ["ats_score", "suggestions", "keywords_analysis"]
+        assert result["incremental"]["job_description_changed"]
+        assert result["skills_analysis"] == first["skills_analysis"]
+        assert result["analysis_details"]["content_quality"] == "good"
+    
+    def test_header_edit_reuses_agents_that_skip_contact_details(self, service):
+        """Test that editing contact details reuses only the skills analysis"""
+        self.rerun(service, RESUME, "Python developer")
+        
+        result = self.rerun(service, RESUME.replace("555-0100", "555-0199"), "Python developer")
+        
+        assert set(service.transport.calls) == {"ATS Specialist", "Career Counselor", "Keyword Optimization Agent"}
+        assert result["incremental"]["changed_resume_sections"] == ["header"]
+        assert result["incremental"]["reused_sections"] == ["skills_analysis"]
+        
+        # Whitespace-only changes reuse every section
+        result = self.rerun(service, RESUME.replace("555-0100", "555-0199").replace("\n", "\n\n"), "Python developer")
+        assert not service.transport.calls
+        assert result["incremental"]["rerun_sections"] == []
+    
+    def test_text_above_first_heading_reruns_every_section(self, service):
+        """Test that an unheaded title or summary line is an input of the keyword and skills analysis"""
+        first = self.rerun(service, RESUME, "Kubernetes platform engineer")
+        
+        edited = RESUME.replace("Jane Doe\n", "Jane Doe\nKubernetes and Terraform platform engineer\n")
+        result = self.rerun(service, edited, "Kubernetes platform engineer")
+        fresh = AutoGenResumeAnalysisService(transport=CountingTransport())
+        fresh.cache.clear()
+        expected = fresh.analyze_resume(edited, "Kubernetes platform engineer")
+        
+        assert result["incremental"]["changed_resume_sections"] == ["introduction"]
+        assert result["incremental"]["reused_sections"] == []
+        assert "Kubernetes" in [skill["name"] for skill in result["skills_analysis"]["technical_skills"]]
+        assert result["skills_analysis"] == expected["skills_analysis"]
+        assert result["keywords_analysis"]["match_percentage"] == expected["keywords_analysis"]["match_percentage"]
+        assert result["keywords_analysis"]["match_percentage"] != first["keywords_analysis"]["match_percentage"]
@@ -0,0 +1,112 @@
+import pytest
+import time
+from src.services.job_queue import AnalysisJobQueue
+from src.utils.sqlite import connect
+
+class TestAnalysisJobQueue:
+    """Test cases for the background analysis job queue"""
+    
+    def _wait_for(self, queue, job_id, timeout=5):
+        """Poll until the job has finished"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = queue.get(job_id)
+            if job["status"] in ("completed", "failed"):
+                return job
+            time.sleep(0.02)
+        raise AssertionError("job did not finish in time")
+    
+    def test_job_completes_with_result(self, tmp_path):
+        """Test that a submitted job runs in the background and stores its result"""
+        queue = AnalysisJobQueue(
+            db_path=str(tmp_path / "jobs.db"),
+            processor=lambda pdf, name, jd: {"bytes": len(pdf), "jd": jd}
+        )
+        job = queue.submit(b"%PDF-1.4", "resume.pdf", "Python developer")
+        assert job["status"] in ("queued", "running", "completed")
+        
+        job = self._wait_for(queue, job["job_id"])
+        assert job["status"] == "completed"
+        assert job["result"] == {"bytes": 8, "jd": "Python developer"}
+        assert job["run_time"] is not None
+        assert queue.stats()["completed"] == 1
+    
+    def test_failed_job_reports_error(self, tmp_path):
+        """Test that processor exceptions mark the job as failed"""
+        def processor(pdf, name, jd):
+            raise ValueError("Could not extract text from PDF file")
+        
+        queue = AnalysisJobQueue(db_path=str(tmp_path / "jobs.db"), processor=processor)
+        job = self._wait_for(queue, queue.submit(b"bad", "resume.pdf")["job_id"])
+        assert job["status"] == "failed"
+        assert "Could not extract text" in job["error"]
+    
+    def test_orphaned_jobs_are_recovered(self, tmp_path):
+        """Test that jobs owned by a dead worker are re-run after a restart"""
+        db_path = str(tmp_path / "jobs.db")
+        queue = AnalysisJobQueue(db_path=db_path, processor=lambda pdf, name, jd: {"ok": True})
+        with connect(queue.db_path) as conn:
+            conn.execute(
+                """INSERT INTO analysis_jobs (id, status, filename, pdf_data, job_description, owner_id,
+                                              lease_expires_at, created_at)
+                   VALUES ('orphan', 'running', 'resume.pdf', x'00', '', 'dead-worker', ?, ?)""",
+                (time.time() - 1, time.time())
+            )
+        
+        restarted = AnalysisJobQueue(db_path=db_path, processor=lambda pdf, name, jd: {"ok": True})
+        assert self._wait_for(restarted, "orphan")["result"] == {"ok": True}
+    
+    def test_idle_worker_recovers_orphans(self, tmp_path):
+        """Test that the heartbeat re-queues orphans without waiting for a new submission"""
+        queue = AnalysisJobQueue(db_path=str(tmp_path / "jobs.db"), processor=lambda pdf, name, jd: {"ok": True},
+                                 lease_seconds=0.15)
+        with connect(queue.db_path) as conn:
+            conn.execute(
+                """INSERT INTO analysis_jobs (id, status, filename, pdf_data, job_description, owner_id,
+                                              lease_expires_at, created_at)
+                   VALUES ('orphan', 'running', 'resume.pdf', x'00', '', 'dead-worker', ?, ?)""",
+                (time.time() - 1, time.time())
+            )
+        
+        assert self._wait_for(queue, "orphan")["result"] == {"ok": True}
+    
+    def test_stale_owner_cannot_overwrite_result(self, tmp_path):
+        """Test that a worker whose job was taken over mid-run discards its own result"""
+        db_path = str(tmp_path / "jobs.db")
+        def processor(pdf, name, jd):
+            # Another worker claims the job after this one's lease expired and finishes first
+            with connect(db_path) as conn:
+                conn.execute(
+                    """UPDATE analysis_jobs SET status = 'completed', owner_id = 'new-owner',
+                              result = '{"owner": "new"}', finished_at = ?""",
+                    (time.time(),)
+                )
+            return {"owner": "stale"}
+        
+        queue = AnalysisJobQueue(db_path=db_path, processor=processor)
+        job_id = queue.submit(b"%PDF-1.4", "resume.pdf")["job_id"]
+        queue._get_executor().shutdown(wait=True)
+        
+        assert queue.get(job_id)["result"] == {"owner": "new"}
+    
+    def test_leased_jobs_are_not_taken_over(self, tmp_path):
+        """Test that a running job whose owner keeps renewing its lease is left to that owner"""
+        db_path = str(tmp_path / "jobs.db")
+        runs = []
+        def processor(pdf, name, jd):
+            runs.append(name)
+            time.sleep(0.5)
+            return {"ok": True}
+        
+        queue = AnalysisJobQueue(db_path=db_path, processor=processor, lease_seconds=0.15)
+        job_id = queue.submit(b"%PDF-1.4", "resume.pdf")["job_id"]
+        time.sleep(0.3)
+        AnalysisJobQueue(db_path=db_path, processor=processor, lease_seconds=0.15)
+        
+        assert self._wait_for(queue, job_id)["status"] == "completed"
+        assert runs == ["resume.pdf"]
+    
+    def test_unknown_job(self, tmp_path):
+        """Test that unknown job ids return None"""
+        queue = AnalysisJobQueue(db_path=str(tmp_path / "jobs.db"), processor=lambda *args: {})
+        assert queue.get("missing") is None
@@ -0,0 +1,73 @@
+import pytest
+from src.services.job_registry import JobDescriptionRegistry
+
+POSTING = """Senior Backend Engineer
+We are a fast-growing fintech company looking for a senior backend engineer to join our
+payments platform team. You will design and build REST APIs in Python and Flask, own our
+PostgreSQL data model, and deploy services to AWS. Experience with Kafka and Kubernetes is
+a plus. You have at least five years of backend experience and enjoy mentoring engineers."""
+
+def keywords(text):
+    return sorted(set(word.lower().strip(".,") for word in text.split() if len(word) > 4))
+
+def requirements(text):
+    return {"title": "Senior Backend Engineer", "required_skills": ["python", "flask", "postgresql", "aws"],
+            "preferred_skills": ["kafka", "kubernetes"], "experience": "5+ years backend"}
+
+class TestJobDescriptionRegistry:
+    """Test cases for the job description registry"""
+    
+    def test_register_is_content_addressed(self, tmp_path):
+        """Test that the same posting always maps to the same id"""
+        registry = JobDescriptionRegistry(str(tmp_path / "jobs.db"), keyword_extractor=keywords)
+        first = registry.register(POSTING)
+        second = registry.register("  " + POSTING.replace("\n", "\n\n"))
+        
+        assert first["created"] and not second["created"]
+        assert first["job_id"] == second["job_id"]
+        assert first["prompt_text"] == first["description"]
+        assert "postgresql" in first["keywords"]
+    
+    def test_requirements_shrink_the_prompt(self, tmp_path):
+        """Test that extracted requirements replace the posting in prompts"""
+        registry = JobDescriptionRegistry(str(tmp_path / "jobs.db"), keyword_extractor=keywords,
+                                          requirement_extractor=requirements)
+        job = registry.register(POSTING)
+        
+        assert job["title"] == "Senior Backend Engineer"
+        assert job["prompt_text"].startswith("Title: Senior Backend Engineer")
+        assert job["prompt_tokens"] < job["description_tokens"]
+    
+    def test_lookups_are_counted(self, tmp_path):
+        """Test that resume requests using a job id are counted"""
+        registry = JobDescriptionRegistry(str(tmp_path / "jobs.db"), keyword_extractor=keywords)
+        job_id = registry.register(POSTING)["job_id"]
+        registry.get(job_id)
+        registry.get(job_id)
+        
+        assert registry.get(job_id, count_use=False)["use_count"] == 2
+        assert registry.get("missing") is None
+    
+    def test_prompt_text_is_only_used_for_agent_prompts(self, tmp_path):
+        """Test that rule-based scoring reads the stored posting and keywords, agents the prompt text"""
+        from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+        
+        class PromptRecorder:
+            prompts = []
+            def complete(self, model, messages, temperature, max_tokens, timeout=None, **options):
+                self.prompts.append(messages[1]["content"])
+                raise RuntimeError("not answering")
+        
+        transport = PromptRecorder()
+        service = AutoGenResumeAnalysisService(transport=transport)
+        service.cache.clear()
+        registry = JobDescriptionRegistry(str(tmp_path / "jobs.db"), keyword_extractor=keywords,
+                                          requirement_extractor=requirements)
+        service.use_job_registry(registry)
+        job = registry.register(POSTING)
+        
+        result = service.extract_keywords(job["description"], "Python and Flask developer")
+        assert result["job_description_keywords"] == job["keywords"][:20]
+        assert result["similarity"] == service.rule_based_service.extract_keywords(POSTING, "Python and Flask developer")["similarity"]
+        assert transport.prompts and all(job["prompt_text"] in prompt and "fintech" not in prompt
+                                         for prompt in transport.prompts)
@@ -0,0 +1,46 @@
+import pytest
+from src.services.keyword_similarity import KeywordSimilarity
+from src.services.resume_service import ResumeAnalysisService
+
+CORPUS = [
+    "Python developer experience required",
+    "Java developer experience required",
+    "Frontend developer with React experience",
+    "Data engineer with Python and Spark experience"
+]
+RESUME = "Python developer with Flask and Spark experience"
+
+class TestKeywordSimilarity:
+    """Test cases for the TF-IDF keyword similarity engine"""
+
+    def test_rare_terms_weigh_more(self):
+        """Test that matching a rare job description term scores higher than a common one"""
+        engine = KeywordSimilarity.fit(CORPUS)
+        assert engine.idf("spark") > engine.idf("developer")
+
+        rare = engine.score(RESUME, "Spark Java")
+        common = engine.score(RESUME, "Developer Java")
+        assert rare["weighted_overlap"] > common["weighted_overlap"]
+        assert engine.score(RESUME, RESUME)["match_percentage"] == 100
+        assert engine.score(RESUME, "")["match_percentage"] == 0
+
+    def test_matrix_matches_single_pairs(self, tmp_path):
+        """Test that batch scores are identical to per-pair scores and survive a save/load"""
+        path = str(tmp_path / "idf.json")
+        KeywordSimilarity.fit(CORPUS).save(path)
+        engine = KeywordSimilarity.load(path)
+        resumes = [RESUME, "Java backend engineer", ""]
+
+        matrix = engine.score_matrix(resumes, CORPUS)
+        for row, resume in enumerate(resumes):
+            for column, job_description in enumerate(CORPUS):
+                single = engine.score(resume, job_description)
+                assert all(single[name] == matrix[name][row, column] for name in single)
+
+    def test_keywords_analysis_uses_similarity(self):
+        """Test that the rule-based match_percentage is the TF-IDF score, not the keyword set ratio"""
+        service = ResumeAnalysisService()
+        result = service.extract_keywords("Senior Python engineer, Flask, AWS", RESUME)
+
+        assert result["match_percentage"] == service.similarity.score(RESUME, "Senior Python engineer, Flask, AWS")["match_percentage"]
+        assert 0 < result["similarity"]["cosine"] < 1
@@ -0,0 +1,60 @@
+import pytest
+from src.services.llm_transport import (CassetteMissError, CassetteTransport, LLMResponse, OpenAITransport,
+                                       parse_agent_timeouts)
+
+class StubTransport:
+    """Live transport stand-in that counts calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, model, messages, temperature, max_tokens, timeout=None, **options):
+        self.calls += 1
+        return LLMResponse('{"overall_score": 80}', {"prompt_tokens": 12, "completion_tokens": 5, "total_tokens": 17}, model)
+
+class TestCassetteTransport:
+    """Test cases for cassette record/replay"""
+
+    MESSAGES = [{"role": "system", "content": "You are ATS Specialist"}, {"role": "user", "content": "Resume"}]
+
+    def test_record_then_replay(self, tmp_path):
+        """Test that a recorded response replays without the live transport"""
+        live = StubTransport()
+        recorder = CassetteTransport(str(tmp_path), mode="record", inner=live)
+        recorded = recorder.complete("gpt-4o-mini", self.MESSAGES, 0.3, 100, timeout=5)
+
+        replayer = CassetteTransport(str(tmp_path), mode="replay")
+        replayed = replayer.complete("gpt-4o-mini", self.MESSAGES, 0.3, 100, timeout=30)
+
+        assert live.calls == 1
+        assert replayed.content == recorded.content
+        assert replayed.usage["total_tokens"] == 17
+
+    def test_replay_miss(self, tmp_path):
+        """Test that replaying an unrecorded request fails loudly"""
+        replayer = CassetteTransport(str(tmp_path), mode="replay")
+        with pytest.raises(CassetteMissError):
+            replayer.complete("gpt-4o-mini", self.MESSAGES, 0.3, 200)
+
+class TestOpenAITransport:
+    """Test cases for the pooled OpenAI transport"""
+
+    def test_client_is_rebuilt_after_fork(self):
+        """Test that a forked worker builds its own client instead of sharing the parent's"""
+        clients = []
+        transport = OpenAITransport(client_factory=lambda: clients.append(object()) or clients[-1])
+
+        first = transport.client
+        assert transport.client is first and len(clients) == 1
+
+        transport._client_pid = -1  # as seen from a child process after fork
+        assert transport.client is not first and len(clients) == 2
+
+    def test_parse_agent_timeouts(self):
+        """Test per-agent read timeout parsing"""
+        assert parse_agent_timeouts("Combined Resume Analyst=40, Job Match Analyst=30") == {
+            "Combined Resume Analyst": 40.0, "Job Match Analyst": 30.0
+        }
+        assert parse_agent_timeouts("") == {}
+        with pytest.raises(ValueError):
+            parse_agent_timeouts("=10")
@@ -0,0 +1,33 @@
+import pytest
+from app import create_app
+
+pytest.importorskip("prometheus_client")
+
+class TestMetricsEndpoint:
+    """Test cases for the Prometheus metrics endpoint"""
+    
+    @pytest.fixture
+    def client(self):
+        """Create test client"""
+        app = create_app()
+        app.config['TESTING'] = True
+        return app.test_client()
+    
+    def test_metrics_report_route_latency(self, client):
+        """Test that requests are timed by their route template"""
+        client.get('/health')
+        client.get('/api/resume/jobs/does-not-exist')
+        response = client.get('/metrics')
+        body = response.get_data(as_text=True)
+        
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+        assert 'route="/api/resume/jobs/<job_id>",status="404"' in body
+    
+    def test_metrics_include_queue_stats(self, client):
+        """Test that the job queue is reported at scrape time"""
+        body = client.get('/metrics').get_data(as_text=True)
+        
+        assert 'analysis_queue_queue_depth' in body
+        assert 'llm_agent_duration_seconds' in body
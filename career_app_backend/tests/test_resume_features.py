@@ -0,0 +1,47 @@
+import pytest
+from src.services.resume_service import ResumeAnalysisService
+from src.utils.resume_features import ResumeFeatures, extract_features
+
+RESUME = """Jane Doe - jane@example.com - (555) 123-4567
+Summary: engineer who led projects and collaborated across teams
+Experience: developed Python services, improved latency by 40% for 3 teams
+Education: BS Computer Science
+Skills: Python, Python, Flask"""
+
+class TestResumeFeatures:
+    """Test cases for the single-pass feature extraction shared by the rule-based scorers"""
+
+    def test_features_are_extracted_once_and_immutable(self):
+        """Test that features hold every scanned fact and cannot be changed"""
+        features = extract_features(RESUME)
+
+        assert extract_features(RESUME) is features
+        assert features.has_email and features.has_phone and features.has_bullets
+        assert features.quantified_count == 2
+        assert {"summary", "experience", "led", "developed", "collaborated"} <= features.terms_present
+        assert features.keywords[0] == "python" and features.keyword_counts["python"] == 3
+        assert not hasattr(features, "__dict__")
+        with pytest.raises(AttributeError):
+            features.word_count = 0
+
+    def test_scorers_read_shared_features(self):
+        """Test that the scorers give the documented points from the features"""
+        service = ResumeAnalysisService()
+        features = ResumeFeatures(RESUME)
+
+        # 4 headers (contact is missing) x 3 + email + phone + bullets
+        assert service._analyze_format_structure(features) == 27
+        assert service._analyze_sections_completeness(features) == 15
+        assert service._identify_sections(features) == ["Summary", "Experience", "Education", "Skills",
+                                                       "Projects"]
+        assert service.extract_keywords("", RESUME)["resume_keywords"] == list(features.keywords[:20])
+
+    def test_batch_ats_scores_match_scalar(self):
+        """Test that vectorized batch scoring is identical to scoring each resume alone"""
+        service = ResumeAnalysisService()
+        resumes = [RESUME, "", "Skills: Java", RESUME.replace("Python", "Go"), None]
+
+        for job_description in ("", "Python developer with Flask", "the and"):
+            batch = service.calculate_ats_scores(resumes, job_description)
+            assert batch == [service.calculate_ats_score(resume, job_description) for resume in resumes]
+        assert service.calculate_ats_scores([]) == []
@@ -37,6 +37,12 @@ class TestResumeAnalysis:
         response = client.post('/api/resume/analyze', data=data)
         assert response.status_code == 400
     
+    def test_analyze_stream_no_file(self, client):
+        """Test streaming analyze endpoint without file"""
+        response = client.post('/api/resume/analyze/stream')
+        assert response.status_code == 400
+        assert 'error' in response.json
+    
     def test_score_endpoint_no_data(self, client):
         """Test score endpoint without data"""
         response = client.post('/api/resume/score')
@@ -69,6 +75,45 @@ class TestResumeAnalysis:
         response = client.post('/api/resume/keywords', json=data)
         assert response.status_code == 200
         assert 'matching_keywords' in response.json
+    
+    @pytest.mark.parametrize("field", ['["Python developer", ', '[1, 2]', '[{"title": "Engineer"}]'])
+    def test_batch_rejects_malformed_job_descriptions_field(self, client, field):
+        """Test that a form field that is not a JSON array of strings is a client error"""
+        response = client.post('/api/resume/analyze-batch',
+                               data={'resume_text': 'Python developer', 'job_descriptions': field})
+        assert response.status_code == 400
+        assert response.json == {"error": "job_descriptions must be a JSON array of strings"}
+    
+    def test_analyze_stream_releases_unread_upload(self, app, monkeypatch):
+        """Test that a spilled upload is removed when the stream is closed before it starts"""
+        import contextlib
+        import io
+        from api import resume_routes
+        from benchmarks.samples import build_pdf
+        
+        # Keep the uploads referenced so only an explicit close can remove the temp file
+        uploads = []
+        class RecordingExitStack(contextlib.ExitStack):
+            def __init__(self):
+                super().__init__()
+                uploads.append(self)
+        monkeypatch.setattr(resume_routes, "ExitStack", RecordingExitStack)
+        monkeypatch.setattr(resume_routes.file_handler, "spill_threshold", 0)
+        temp_paths = []
+        mkstemp = tempfile.mkstemp
+        def recording_mkstemp(*args, **kwargs):
+            fd, path = mkstemp(*args, **kwargs)
+            temp_paths.append(path)
+            return fd, path
+        monkeypatch.setattr(tempfile, "mkstemp", recording_mkstemp)
+        
+        # The server closes the response without ever iterating it, as on an early disconnect
+        data = {'resume': (io.BytesIO(build_pdf(["Jane Doe"])), 'resume.pdf')}
+        with app.test_request_context('/api/resume/analyze/stream', method='POST', data=data):
+            response = resume_routes.analyze_resume_stream()
+            assert response.status_code == 200 and os.path.exists(temp_paths[0])
+            response.close()
+        assert uploads and not os.path.exists(temp_paths[0])
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -0,0 +1,91 @@
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.single_flight import SingleFlight
+
+class TestSingleFlight:
+    """Test cases for request coalescing"""
+    
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that identical concurrent calls run once and all receive the result"""
+        flight = SingleFlight()
+        executions = []
+        
+        def compute():
+            executions.append(1)
+            time.sleep(0.2)
+            return {"overall_score": 80}
+        
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            outcomes = list(executor.map(lambda _: flight.do("key", compute), range(5)))
+        
+        assert len(executions) == 1
+        assert all(result == {"overall_score": 80} for result, _ in outcomes)
+        assert sum(shared for _, shared in outcomes) == 4
+        assert flight.stats()["coalesced"] == 4
+        assert flight.stats()["in_flight"] == 0
+    
+    def test_followers_get_independent_copies(self):
+        """Test that a follower's result is unaffected by the leader mutating its own"""
+        flight = SingleFlight()
+        started = threading.Event()
+        
+        def compute():
+            started.set()
+            time.sleep(0.1)
+            return {"content_quality": "Good"}
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "key", compute)
+            started.wait()
+            follower = executor.submit(flight.do, "key", compute)
+            leader_result, _ = leader.result()
+            leader_result.pop("content_quality")
+            follower_result, shared = follower.result()
+        
+        assert shared
+        assert follower_result == {"content_quality": "Good"}
+    
+    def test_errors_reach_every_caller(self):
+        """Test that an exception in the shared execution is raised to followers too"""
+        flight = SingleFlight()
+        started = threading.Event()
+        
+        def compute():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("model unavailable")
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "key", compute)
+            started.wait()
+            follower = executor.submit(flight.do, "key", compute)
+            for future in (leader, follower):
+                with pytest.raises(ValueError):
+                    future.result()
+    
+    def test_streamed_analysis_is_coalesced(self):
+        """Test that a streamed and a plain analysis of the same resume run the agents once"""
+        from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+        from tests.test_incremental_analysis import RESUME, CountingTransport
+        
+        class SlowTransport(CountingTransport):
+            def complete(self, *args, **kwargs):
+                time.sleep(0.2)
+                return super().complete(*args, **kwargs)
+        
+        service = AutoGenResumeAnalysisService(transport=SlowTransport())
+        service.cache.clear()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            streamed = executor.submit(lambda: list(service.stream_analysis(RESUME, "Python developer")))
+            time.sleep(0.05)
+            plain = executor.submit(service.analyze_resume, RESUME, "Python developer")
+            events = streamed.result()
+            result = plain.result()
+        
+        assert sum(service.transport.calls.values()) == 3
+        assert events[-1] == ("complete", result)
+        assert {section for section, _ in events[:-1]} == set(service.ANALYSIS_SECTIONS)
+        assert [section for section, _ in list(service.stream_analysis(RESUME, "Python developer"))][-1] == "complete"
+        assert sum(service.transport.calls.values()) == 3
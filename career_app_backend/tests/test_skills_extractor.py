@@ -0,0 +1,84 @@
+import pytest
+import json
+import time
+from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+from src.services.llm_transport import LLMResponse
+from src.services.skills_extractor import SkillsExtractor
+from src.utils.phrase_matcher import PhraseMatcher
+from tests.llm_stubs import valid_response
+
+RESUME = """Jane Doe
+Senior engineer building ReactJS and React Native apps on Amazon Web Services.
+Skills: Python, Node.js, C++, C#, .NET, PostgreSQL, Kubernetes (k8s), scikit-learn
+Strong communication skills, team player, problem-solving
+Certifications: AWS Certified Solutions Architect, PMP"""
+
+class TestSkillsExtractor:
+    """Test cases for local dictionary-based skills extraction"""
+
+    def test_phrase_matcher_prefers_longest_whole_word_match(self):
+        """Test that overlapping phrases resolve to the longest and partial words never match"""
+        matcher = PhraseMatcher()
+        for phrase in ("react", "react native", "native", "java"):
+            matcher.add(phrase, phrase)
+
+        assert [payload for _, _, payload in matcher.find_longest("React Native and React, not JavaScript")] == \
+            ["react native", "react"]
+        assert len(matcher.find_all("react native")) == 3
+
+    def test_phrase_matcher_can_be_rebuilt(self):
+        """Test that building twice, or after adding phrases, does not duplicate matches"""
+        matcher = PhraseMatcher()
+        for phrase in ("machine learning", "learning"):
+            matcher.add(phrase, phrase)
+        matcher.build()
+        matcher.build()
+        assert sorted(payload for _, _, payload in matcher.find_all("machine learning")) == \
+            ["learning", "machine learning"]
+
+        matcher.add("deep learning", "deep learning")
+        matcher.build()
+        assert sorted(payload for _, _, payload in matcher.find_all("deep learning")) == ["deep learning", "learning"]
+
+    def test_aliases_and_buckets(self):
+        """Test that aliases map to canonical names in the response buckets"""
+        result = SkillsExtractor().extract(RESUME)
+        technical = {skill["name"] for skill in result["technical_skills"]}
+
+        assert {"React.js", "React Native", "AWS", "Python", "Node.js", "C++", "C#", ".NET",
+                "PostgreSQL", "Kubernetes", "scikit-learn"} <= technical
+        assert {skill["name"] for skill in result["soft_skills"]} == {"Communication", "Teamwork", "Problem Solving"}
+        assert [skill["name"] for skill in result["certifications"]] == ["AWS Certified Solutions Architect", "PMP"]
+        kubernetes = next(skill for skill in result["technical_skills"] if skill["name"] == "Kubernetes")
+        assert kubernetes["mentions"] == 2 and kubernetes["category"] == "DevOps"
+        assert result["skills_summary"]["total_skills"] == len(result["all_skills"])
+        assert result["skills_summary"]["skill_level_distribution"] == {"Certified": 2}
+
+    def test_extraction_is_fast(self):
+        """Test that a typical resume is scanned in well under a millisecond on average"""
+        extractor = SkillsExtractor()
+        runs = 200
+        started = time.perf_counter()
+        for _ in range(runs):
+            extractor.extract(RESUME)
+        assert (time.perf_counter() - started) / runs < 0.001
+
+    def test_llm_enrichment_adds_proficiency(self, monkeypatch):
+        """Test that enrichment merges model estimates into the locally found skills"""
+        skills = valid_response("skills", technical_skills=[
+            {"name": "python", "level": "Expert", "years": 6, "category": "Programming"},
+            {"name": "Erlang", "level": "Beginner", "years": 1, "category": "Programming"}
+        ])
+
+        class SkillsTransport:
+            def complete(self, model, messages, temperature, max_tokens, timeout=None, **options):
+                return LLMResponse(json.dumps(skills))
+
+        service = AutoGenResumeAnalysisService(transport=SkillsTransport())
+        service.cache.clear()
+        monkeypatch.setattr(service, "skills_llm_enrichment", True)
+        result = service.extract_skills("Python and Flask developer")
+
+        assert result["extraction_method"] == "local+llm"
+        assert [(skill["name"], skill["level"], skill["years"]) for skill in result["technical_skills"]] == \
+            [("Python", "Expert", 6), ("Flask", "Unrated", 0), ("Erlang", "Beginner", 1)]
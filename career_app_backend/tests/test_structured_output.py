@@ -0,0 +1,61 @@
+import pytest
+import json
+from src.services.autogen_resume_service import AutoGenResumeAnalysisService
+from src.services.llm_transport import LLMResponse
+from src.utils.structured_output import VALIDATORS, parse_json, response_format
+from tests.llm_stubs import valid_response
+
+class ScriptedTransport:
+    """LLM transport returning scripted responses in order"""
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+    
+    def complete(self, model, messages, temperature, max_tokens, timeout=None, **options):
+        self.requests.append({"messages": messages, **options})
+        return LLMResponse(self.responses.pop(0))
+
+class TestStructuredOutput:
+    """Test cases for schema-constrained agent output"""
+    
+    def test_repair_near_valid_json(self):
+        """Test that fenced, trailing-comma and truncated JSON is repaired locally"""
+        assert parse_json('```json\n{"a": [1, 2,],}\n```') == ({"a": [1, 2]}, "repaired")
+        assert parse_json('Sure! {"a": "x", "b": ["y", "z') == ({"a": "x", "b": ["y", "z"]}, "repaired")
+        assert parse_json('{"a": 1, "b": ') == ({"a": 1}, "repaired")
+        assert parse_json('no json here') == (None, "unparseable")
+    
+    def test_repair_keeps_curly_quotes_inside_values(self):
+        """Test that curly quotes are only rewritten where they delimit strings"""
+        assert parse_json('```json\n{"summary": "He said “lead”", "a": [1,],}\n```') == \
+            ({"summary": "He said “lead”", "a": [1]}, "repaired")
+        assert parse_json('{“summary”: “Don’t say \"no\"”, "n": 1,}') == \
+            ({"summary": 'Don’t say "no"', "n": 1}, "repaired")
+    
+    def test_validator_reports_paths(self):
+        """Test that the compiled validator reports missing and mistyped fields"""
+        errors = VALIDATORS["keywords"]({"match_percentage": "high", "resume_keywords": [1]})
+        
+        assert "$.match_percentage: expected number" in errors
+        assert "$.resume_keywords[0]: expected string" in errors
+        assert "$.missing_keywords: missing" in errors
+        assert VALIDATORS["keywords"](valid_response("keywords")) == []
+        assert response_format("keywords")["json_schema"]["strict"] is True
+    
+    def test_invalid_output_retries_only_that_agent(self):
+        """Test that a schema violation re-asks the same agent once and is counted"""
+        transport = ScriptedTransport([json.dumps({"priority_improvements": "none"}),
+                                       json.dumps(valid_response("suggestions", strengths=["Clear layout"]))])
+        service = AutoGenResumeAnalysisService(transport=transport)
+        service.cache.clear()
+        
+        result = service.get_improvement_suggestions("Jane Doe\nExperience\nPython developer")
+        stats = service.get_llm_stats()["structured_output"]
+        
+        assert result["strengths"] == ["Clear layout"]
+        assert "degraded_sections" not in result
+        assert len(transport.requests) == 2
+        assert "could not be used" in transport.requests[1]["messages"][1]["content"]
+        assert transport.requests[0]["response_format"]["type"] == "json_schema"
+        assert (stats["invalid"], stats["retries"], stats["retries_recovered"]) == (1, 1, 1)
@@ -0,0 +1,52 @@
+import pytest
+from src.utils.text_normalizer import TextNormalizer
+
+class TestTextNormalizer:
+    """Test cases for resume text normalization"""
+    
+    @pytest.fixture
+    def normalizer(self):
+        """Create a normalizer without a token budget"""
+        return TextNormalizer(max_tokens=0)
+    
+    def test_ligatures_and_hyphenation(self, normalizer):
+        """Test that ligature glyphs and line-break hyphenation are repaired"""
+        result = normalizer.normalize("Ofﬁce manage-\nment and ﬂexible")
+        assert result["text"] == "Office management and flexible"
+    
+    def test_whitespace_and_page_numbers(self, normalizer):
+        """Test that whitespace runs collapse and page numbers are dropped"""
+        result = normalizer.normalize("John   Doe\t\tEngineer\n\n\n\nPage 1 of 2\nSKILLS\n•\nPython")
+        assert result["text"] == "John Doe Engineer\n\nSKILLS\nPython"
+        assert result["removed_lines"] == 2
+    
+    def test_repeated_headers_are_deduplicated(self, normalizer):
+        """Test that running headers keep only their first occurrence"""
+        text = "\n".join(["Jane Smith - Resume", "Experience A", "Jane Smith - Resume",
+                          "Experience B", "Jane Smith - Resume"])
+        assert normalizer.normalize(text)["text"].count("Jane Smith - Resume") == 1
+    
+    def test_section_aware_truncation(self):
+        """Test that low-priority sections are cut first to meet the budget"""
+        text = "\n".join(
+            ["Jane Smith", "jane@example.com", "EXPERIENCE", "- Led platform team of 8 engineers"]
+            + ["INTERESTS"] + [f"Interest number {i} described at length" for i in range(40)]
+        )
+        normalizer = TextNormalizer(max_tokens=60)
+        result = normalizer.normalize(text)
+        
+        assert result["truncated"]
+        assert result["truncated_sections"] == ["interests"]
+        assert "Led platform team" in result["text"]
+        assert result["tokens_after"] <= 60 < result["tokens_before"]
+    
+    def test_only_exact_headings_start_sections(self):
+        """Test that content lines mentioning a section name are not mistaken for headings"""
+        text = "\n".join(
+            ["Jane Smith", "Work Experience:", "Strong communication skills", "- Led platform team of 8 engineers"]
+            + ["Hobbies"] + [f"Interest number {i} described at length" for i in range(40)]
+        )
+        result = TextNormalizer(max_tokens=40).normalize(text)
+        
+        assert result["truncated_sections"] == ["interests"]
+        assert "Strong communication skills\n- Led platform team" in result["text"]
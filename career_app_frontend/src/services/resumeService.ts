@@ -40,13 +40,18 @@ export interface KeywordAnalysis {
   critical_missing_keywords: string[];
   keyword_suggestions: string[];
   industry_keywords: string[];
+  similarity?: {
+    cosine: number;
+    weighted_overlap: number;
+  };
 }
 
 export interface Skill {
   name: string;
-  level: 'Beginner' | 'Intermediate' | 'Advanced' | 'Expert' | 'Certified';
+  level: 'Beginner' | 'Intermediate' | 'Advanced' | 'Expert' | 'Certified' | 'Unrated';
   years: number;
   category: string;
+  mentions?: number;
 }
 
 export interface SkillsAnalysis {
@@ -65,6 +70,8 @@ export interface SkillsAnalysis {
     average_experience_years: number;
     skill_level_distribution: Record<string, number>;
   };
+  extraction_method?: 'local' | 'local+llm';
+  enrichment_error?: string;
 }
 
 export interface AnalysisDetails {
@@ -87,6 +94,16 @@ export interface ResumeAnalysisResponse {
   error?: string;
 }
 
+export type AnalysisStreamEvent =
+  | 'text_extracted'
+  | 'analysis_details'
+  | 'ats_score'
+  | 'suggestions'
+  | 'keywords_analysis'
+  | 'skills_analysis'
+  | 'complete'
+  | 'error';
+
 export interface HealthCheckResponse {
   status: string;
   service: string;
@@ -131,6 +148,64 @@ export const resumeService = {
     return await response.json();
   },
 
+  // Analyze resume, receiving each section as soon as its agent finishes
+  async analyzeResumeStream(
+    request: ResumeAnalysisRequest,
+    onSection: (event: AnalysisStreamEvent, data: any) => void
+  ): Promise<ResumeAnalysisResponse> {
+    const formData = new FormData();
+    formData.append('resume', request.resume);
+
+    if (request.job_description) {
+      formData.append('job_description', request.job_description);
+    }
+
+    const response = await fetch(`${API_BASE_URL}/resume/analyze/stream`, {
+      method: 'POST',
+      body: formData,
+    });
+
+    if (!response.ok || !response.body) {
+      const error = await response.json().catch(() => ({}));
+      throw new Error(error.error || 'Resume analysis failed');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+
+        const eventLine = rawEvent.split('\n').find((line) => line.startsWith('event: '));
+        const dataLine = rawEvent.split('\n').find((line) => line.startsWith('data: '));
+        if (!eventLine || !dataLine) continue;
+
+        const event = eventLine.slice('event: '.length) as AnalysisStreamEvent;
+        const data = JSON.parse(dataLine.slice('data: '.length));
+
+        if (event === 'error') {
+          throw new Error(data.error || 'Resume analysis failed');
+        }
+        onSection(event, data);
+        if (event === 'complete') {
+          return data as ResumeAnalysisResponse;
+        }
+      }
+    }
+
+    throw new Error('Resume analysis stream ended unexpectedly');
+  },
+
   // Get ATS score only
   async getATSScore(resumeText: string, jobDescription?: string): Promise<ATSScore> {
     const response = await fetch(`${API_BASE_URL}/resume/score`, {